@@ -1,6 +1,6 @@
 {
     'name': 'Quiz Engine Pro',
-    'version': '17.0.1.0.3',
+    'version': '17.0.1.0.10',
     'category': 'Education',
     'summary': 'Advanced Quiz Engine with Multiple Question Types',
     'description': """
@@ -16,21 +16,46 @@
     'website': 'https://www.yourcompany.com',
     'license': 'LGPL-3',
     'depends': ['base', 'web', 'website'],
-    'external_dependencies': {'python': []},
+    'external_dependencies': {'python': ['numpy']},
     'data': [
         'security/ir.model.access.csv',
+        'data/quiz_cron.xml',
         'views/quiz_views.xml',
         'views/question_views.xml', 
         'views/session_views.xml',
         'views/website_templates.xml',
+        'wizard/question_import_views.xml',
     ],
     'assets': {
         'web.assets_frontend': [
             'quiz_engine_pro/static/src/css/quiz_styles.css',
+        ],
+        # One bundle per question type, only called by the pages rendering it
+        'quiz_engine_pro.question_matrix': [
+            'quiz_engine_pro/static/src/css/quiz_matrix.css',
+            'quiz_engine_pro/static/src/js/question/matrix.js',
+        ],
+        'quiz_engine_pro.question_drag_order': [
+            'quiz_engine_pro/static/src/css/quiz_sequence.css',
+            'quiz_engine_pro/static/src/js/question/drag_order.js',
+        ],
+        'quiz_engine_pro.question_step_sequence': [
+            'quiz_engine_pro/static/src/css/quiz_sequence.css',
+            'quiz_engine_pro/static/src/js/question/step_sequence.js',
+        ],
+        'quiz_engine_pro.question_drag_drop': [
             'quiz_engine_pro/static/src/css/quiz_drag_drop.css',
+            'quiz_engine_pro/static/src/js/question/drag_drop.js',
+        ],
+        'quiz_engine_pro.question_dropdown_blank': [
             'quiz_engine_pro/static/src/css/quiz_dropdown.css',
-            'quiz_engine_pro/static/src/css/quiz_sequence.css',
-            'quiz_engine_pro/static/src/js/sequence_buttons.js',
+            'quiz_engine_pro/static/src/js/question/dropdown_blank.js',
+        ],
+        'quiz_engine_pro.question_autosave': [
+            'quiz_engine_pro/static/src/js/question/autosave.js',
+        ],
+        'quiz_engine_pro.quiz_single_page': [
+            'quiz_engine_pro/static/src/js/quiz_single_page.js',
         ],
     },
     'images': ['static/description/icon.png'],
@@ -0,0 +1,155 @@
+from odoo import http, _
+from odoo.exceptions import UserError
+from odoo.http import request
+from odoo.tools.misc import xlsxwriter
+import csv
+import io
+import json
+import logging
+import tempfile
+import time
+
+from odoo.addons.quiz_engine_pro.models.answer_data import decode_legacy_answer
+from odoo.addons.quiz_engine_pro.models.item_analysis import _iter_query_chunks
+
+_logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 10000
+XLSX_MAX_ROWS = 1048576
+SESSION_COLUMNS = [
+    'Session', 'Participant', 'Email', 'User', 'State',
+    'Start Time', 'End Time', 'Total Score', 'Percentage', 'Passed',
+]
+EXPORT_QUERY = """
+    SELECT session.id, session.participant_name, session.participant_email, partner.name, session.state,
+           session.start_time, session.end_time, session.total_score, session.percentage, session.passed,
+           response.question_id, response.answer_data, response.score
+      FROM quiz_session session
+ LEFT JOIN res_users users ON users.id = session.user_id
+ LEFT JOIN res_partner partner ON partner.id = users.partner_id
+ LEFT JOIN quiz_response response ON response.session_id = session.id
+     WHERE session.quiz_id = %s
+  ORDER BY session.id, response.id
+"""
+
+
+def _format_answer(raw):
+    """Readable form of a stored answer"""
+    answer = decode_legacy_answer(raw)
+    if answer in (None, {}, [], ''):
+        return ''
+    if isinstance(answer, str):
+        return answer
+    return json.dumps(answer, ensure_ascii=False, separators=(',', ':'))
+
+
+def _iter_export_rows(cr, quiz_id, question_ids, counters):
+    """Yield one flat row per session: session columns, then answer and score per question"""
+    column = {question_id: index for index, question_id in enumerate(question_ids)}
+    current_id = None
+    row = None
+    for rows in _iter_query_chunks(cr, 'quiz_export', EXPORT_QUERY, [quiz_id], EXPORT_CHUNK_SIZE):
+        counters['responses'] += len(rows)
+        for record in rows:
+            if record[0] != current_id:
+                if row is not None:
+                    yield row
+                current_id = record[0]
+                row = [
+                    record[0], record[1] or '', record[2] or '', record[3] or '', record[4] or '',
+                    record[5] or '', record[6] or '', record[7] or 0.0, record[8] or 0.0, bool(record[9]),
+                ] + ['', ''] * len(question_ids)
+            index = column.get(record[10])
+            if index is not None:
+                offset = len(SESSION_COLUMNS) + 2 * index
+                # Responses come in id order: the last answer wins, as in the results snapshot
+                row[offset] = _format_answer(record[11])
+                row[offset + 1] = record[12] or 0.0
+    if row is not None:
+        yield row
+
+
+class QuizExportController(http.Controller):
+
+    @http.route(['/quiz/export/<int:quiz_id>'], type='http', auth='user', methods=['GET'])
+    def quiz_export(self, quiz_id, **kwargs):
+        """Stream every session of a quiz with its answers as CSV or XLSX"""
+        quiz = request.env['quiz.quiz'].browse(quiz_id).exists()
+        if not quiz:
+            return request.not_found()
+        quiz.check_access_rule('read')
+        request.env['quiz.session'].check_access_rights('read')
+        request.env['quiz.response'].check_access_rights('read')
+
+        questions = quiz._get_result_questions()
+        header = list(SESSION_COLUMNS)
+        for number, question in enumerate(questions, 1):
+            header += [f'Q{number} {question.name or ""}'.strip(), f'Q{number} Score']
+        filename = f'{quiz.slug or quiz.id}-results'
+        # The request cursor is closed before the body is sent: the stream
+        # reads through a cursor of its own
+        registry = request.env.registry
+
+        export_format = kwargs.get('format', 'csv')
+        if export_format == 'xlsx':
+            session_count = request.env['quiz.session'].search_count([('quiz_id', '=', quiz.id)])
+            if session_count >= XLSX_MAX_ROWS:
+                raise UserError(_("Too many sessions for a spreadsheet, export as CSV instead."))
+            body = self._stream_xlsx(registry, quiz.id, questions.ids, header)
+            content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        else:
+            export_format = 'csv'
+            body = self._stream_csv(registry, quiz.id, questions.ids, header)
+            content_type = 'text/csv; charset=utf-8'
+
+        return request.make_response(body, headers=[
+            ('Content-Type', content_type),
+            ('Content-Disposition', http.content_disposition(f'{filename}.{export_format}')),
+            ('Cache-Control', 'no-store'),
+        ])
+
+    def _stream_csv(self, registry, quiz_id, question_ids, header):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        start = time.monotonic()
+        counters = {'sessions': 0, 'responses': 0}
+        with registry.cursor() as cr:
+            for row in _iter_export_rows(cr, quiz_id, question_ids, counters):
+                writer.writerow(row)
+                counters['sessions'] += 1
+                if buffer.tell() > 65536:
+                    yield buffer.getvalue().encode()
+                    buffer.seek(0)
+                    buffer.truncate()
+        yield buffer.getvalue().encode()
+        self._log_throughput('CSV', quiz_id, counters, start)
+
+    def _stream_xlsx(self, registry, quiz_id, question_ids, header):
+        # The XLSX zip can only be finished at the end: rows go to a
+        # constant memory workbook on disk which is then sent in blocks
+        start = time.monotonic()
+        counters = {'sessions': 0, 'responses': 0}
+        with tempfile.TemporaryFile() as output:
+            workbook = xlsxwriter.Workbook(output, {'constant_memory': True, 'tmpdir': tempfile.gettempdir()})
+            worksheet = workbook.add_worksheet()
+            worksheet.write_row(0, 0, header)
+            with registry.cursor() as cr:
+                for row in _iter_export_rows(cr, quiz_id, question_ids, counters):
+                    counters['sessions'] += 1
+                    values = [str(value) if hasattr(value, 'isoformat') else value for value in row]
+                    worksheet.write_row(counters['sessions'], 0, values)
+            workbook.close()
+            output.seek(0)
+            while True:
+                block = output.read(65536)
+                if not block:
+                    break
+                yield block
+        self._log_throughput('XLSX', quiz_id, counters, start)
+
+    def _log_throughput(self, kind, quiz_id, counters, start):
+        elapsed = max(time.monotonic() - start, 1e-6)
+        _logger.info("Exported %s sessions (%s responses) of quiz %s as %s in %.2fs (%.0f response rows/s)",
+                     counters['sessions'], counters['responses'], quiz_id, kind, elapsed,
+                     counters['responses'] / elapsed)
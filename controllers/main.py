@@ -1,5 +1,9 @@
 from odoo import http, fields
 from odoo.http import request
+from odoo.addons.quiz_engine_pro.models.quiz_metrics import instrument_route
+from odoo.addons.quiz_engine_pro.models.autosave import AUTOSAVE_MAX_BYTES
+from datetime import timezone
+from werkzeug.http import http_date
 import json
 import uuid
 
@@ -7,32 +11,65 @@ import uuid
 class QuizController(http.Controller):
 
     @http.route(['/quiz'], type='http', auth='public', website=True)
+    @instrument_route('quiz_list')
     def quiz_list(self, **kwargs):
         """List all published quizzes"""
-        quizzes = request.env['quiz.quiz'].sudo().search([('published', '=', True)])
-        
-        values = {
-            'quizzes': quizzes,
-        }
-        return request.render('quiz_engine_pro.quiz_list', values)
+        Quiz = request.env['quiz.quiz'].sudo()
+        quiz_ids = Quiz._get_published_quiz_ids()
+        return self._render_public_page('quiz_engine_pro.quiz_list', quiz_ids, lambda: {
+            'quizzes': Quiz.browse(quiz_ids),
+        })
 
     @http.route(['/quiz/<string:slug>'], type='http', auth='public', website=True)
+    @instrument_route('quiz_detail')
     def quiz_detail(self, slug, **kwargs):
         """Show quiz details and start form"""
-        quiz = request.env['quiz.quiz'].sudo().search([('slug', '=', slug), ('published', '=', True)], limit=1)
-        if not quiz:
+        quiz_info = request.env['quiz.quiz']._get_quiz_info(slug)
+        if not quiz_info or not quiz_info.published:
             return request.not_found()
-        
-        values = {
-            'quiz': quiz,
-        }
-        return request.render('quiz_engine_pro.quiz_detail', values)
+        return self._render_public_page('quiz_engine_pro.quiz_detail', (quiz_info.id,), lambda: {
+            'quiz': request.env['quiz.quiz'].sudo().browse(quiz_info.id),
+        })
+
+    def _render_public_page(self, template, quiz_ids, get_values):
+        """Render a public quiz page, or answer 304 when the visitor has it already
+
+        Validators come from the last change of the quizzes shown. Anonymous
+        pages may be stored by shared caches, which revalidate them on every
+        use; the body of the page is also cached server side with t-cache.
+        """
+        last_modified, version = request.env['quiz.quiz']._get_public_page_version(tuple(quiz_ids))
+        public = request.env.user._is_public()
+        etag = '%s-%s-%s-%s' % (version, request.website.id, request.env.lang or '',
+                                'public' if public else request.env.uid)
+        headers = [
+            ('ETag', '"%s"' % etag),
+            ('Cache-Control', 'public, no-cache' if public else 'private, no-cache'),
+            ('Vary', 'Accept-Language, Cookie'),
+        ]
+        if last_modified:
+            headers.append(('Last-Modified', http_date(last_modified)))
+
+        httprequest = request.httprequest
+        if httprequest.if_none_match:
+            not_modified = httprequest.if_none_match.contains(etag)
+        else:
+            not_modified = bool(last_modified and httprequest.if_modified_since
+                                and httprequest.if_modified_since
+                                >= last_modified.replace(microsecond=0, tzinfo=timezone.utc))
+        if not_modified:
+            return request.make_response('', headers=headers, status=304)
+
+        values = get_values()
+        values['page_cache_key'] = (version, request.website.id, request.env.lang)
+        return request.render(template, values, headers=headers)
 
     @http.route(['/quiz/<string:slug>/start'], type='http', auth='public', methods=['POST'], csrf=False, website=True)
+    @instrument_route('quiz_start')
     def quiz_start(self, slug, **kwargs):
         """Start a quiz session"""
-        quiz = request.env['quiz.quiz'].sudo().search([('slug', '=', slug), ('published', '=', True)], limit=1)
-        if not quiz:
+        quiz_info = request.env['quiz.quiz']._get_quiz_info(slug)
+        if not quiz_info or not quiz_info.published:
             return request.not_found()
         
         participant_name = kwargs.get('participant_name', 'Anonymous')
@@ -43,17 +80,83 @@ class QuizController(http.Controller):
         
         # Create quiz session with token
         session = request.env['quiz.session'].sudo().create({
-            'quiz_id': quiz.id,
+            'quiz_id': quiz_info.id,
             'participant_name': participant_name,
             'participant_email': participant_email,
             'session_token': session_token,
             'state': 'in_progress',
             'start_time': fields.Datetime.now(),
+            'time_limit': quiz_info.time_limit,
         })
         
+        if quiz_info.delivery_mode == 'single_page':
+            return request.redirect(f'/quiz/{slug}/play?session={session.session_token}')
         return request.redirect(f'/quiz/{slug}/question/1?session={session.session_token}')
 
+    @http.route(['/quiz/<string:slug>/play'], type='http', auth='public', website=True)
+    @instrument_route('quiz_play')
+    def quiz_play(self, slug, **kwargs):
+        """Single page quiz shell, questions are rendered in the browser"""
+        session_token = request.params.get('session')
+        session = request.env['quiz.session'].sudo().search([('session_token', '=', session_token)], limit=1)
+        
+        if not session or session.state != 'in_progress':
+            return request.redirect('/quiz')
+        if session.check_expiry():
+            return request.redirect(f'/quiz/{session.quiz_id.slug}')
+        
+        values = {
+            'quiz': session.quiz_id,
+            'session': session,
+        }
+        return request.render('quiz_engine_pro.quiz_single_page', values)
+
+    @http.route(['/quiz/session/<string:token>/payload'], type='http', auth='public', methods=['GET'])
+    @instrument_route('quiz_payload')
+    def quiz_payload(self, token, **kwargs):
+        """Whole quiz as JSON for single page delivery, without answer keys"""
+        session = request.env['quiz.session'].sudo().search([('session_token', '=', token)], limit=1)
+        if not session or session.state != 'in_progress' or session.check_expiry():
+            return request.not_found()
+        
+        payload = session._order_payload(request.env['quiz.quiz']._get_single_page_payload(session.quiz_id.id))
+        return request.make_response(payload, headers=[
+            ('Content-Type', 'application/json'),
+            ('Cache-Control', 'no-store'),
+        ])
+
+    @http.route(['/quiz/session/<string:token>/submit'], type='json', auth='public', methods=['POST'])
+    @instrument_route('quiz_submit')
+    def quiz_submit(self, token, answers=None, **kwargs):
+        """Receive all answers of a single page session in one request"""
+        session = request.env['quiz.session'].sudo().search([('session_token', '=', token)], limit=1)
+        if not session or session.state != 'in_progress':
+            return {'error': 'invalid_session'}
+        if session.check_expiry():
+            return {'error': 'expired'}
+        
+        session.submit_answers(answers if isinstance(answers, dict) else {})
+        return {'redirect': f'/quiz/session/{session.session_token}/results'}
+
+    @http.route(['/quiz/session/<string:token>/autosave'], type='json', auth='public', methods=['POST'])
+    @instrument_route('quiz_autosave')
+    def quiz_autosave(self, token, question_id=None, form_data=None, **kwargs):
+        """Buffer the unsubmitted form state of a question; nothing is scored"""
+        session = request.env['quiz.session'].sudo().search([('session_token', '=', token)], limit=1)
+        if not session or session.state != 'in_progress':
+            return {'error': 'invalid_session'}
+        if session.deadline and session.deadline < fields.Datetime.now():
+            return {'error': 'expired'}
+        if not isinstance(question_id, int) or question_id not in session._get_question_ids():
+            return {'error': 'invalid_question'}
+        if not isinstance(form_data, dict) or len(json.dumps(form_data)) > AUTOSAVE_MAX_BYTES:
+            return {'error': 'invalid_data'}
+        
+        request.env['quiz.autosave']._save(session.id, question_id, form_data)
+        return {'saved': True}
+
     @http.route(['/quiz/<string:slug>/question/<int:question_num>'], type='http', auth='public', methods=['GET', 'POST'], csrf=False, website=True)
+    @instrument_route('quiz_question')
     def quiz_question(self, slug, question_num, **kwargs):
         """Display or process a quiz question"""
         session_token = request.params.get('session')
@@ -61,25 +164,29 @@ class QuizController(http.Controller):
         
         if not session or session.state != 'in_progress':
             return request.redirect('/quiz')
+        if session.check_expiry():
+            return request.redirect(f'/quiz/{session.quiz_id.slug}')
         
         quiz = session.quiz_id
-        question = quiz.question_ids[question_num - 1] if quiz.question_ids and len(quiz.question_ids) >= question_num else None
+        # Only the question of this page is read, in the order of the session
+        question_count = len(session._get_question_ids())
+        question = session._get_question_at(question_num)
         
         if not question:
             return request.redirect('/quiz')
         
         if request.httprequest.method == 'POST':
             # Handle answer submission
-            answer_data = request.params.get('answer_data')
-            request.env['quiz.response'].sudo().create({
-                'session_id': session.id,
-                'question_id': question.id,
-                'answer_data': json.dumps(answer_data) if answer_data else '{}',
-            })
+            if question.type == 'mcq_multiple':
+                answer_data = request.httprequest.form.getlist('answer_data')
+            else:
+                answer_data = request.params.get('answer_data')
+            request.env['quiz.response'].sudo()._upsert_answer(
+                session.id, question.id, question._canonicalize_answer(answer_data))
             
-            if len(quiz.question_ids) == question_num:
+            if question_count == question_num:
                 # Last question, complete the quiz
-                session.write({'state': 'completed', 'end_time': fields.Datetime.now()})
+                session.complete_session()
                 return request.redirect(f'/quiz/session/{session.session_token}/results')
             else:
                 # Next question
@@ -90,6 +197,11 @@ class QuizController(http.Controller):
             'session': session,
             'question': question,
             'question_index': question_num - 1,
+            'question_count': question_count,
+            'choices': session._get_choices(question),
+            'question_fragment': question._get_rendered_fragment(question.id),
+            'autosave_json': json.dumps(
+                request.env['quiz.autosave']._get_form_data(session.id, question.id) or {}),
         }
         
         # Add this code to change the message display
@@ -100,39 +212,41 @@ class QuizController(http.Controller):
         
         return request.render('quiz_engine_pro.quiz_question', values)
 
-    @http.route('/quiz/session/<string:token>/results', type='http', auth='public', website=True)
+    @http.route('/quiz/session/<string:token>/results', type='http', auth='public', methods=['GET'], website=True)
+    @instrument_route('quiz_results')
     def quiz_results(self, token, **kwargs):
-        """View quiz results"""
-        session = request.env['quiz.session'].sudo().search([('session_token', '=', token)], limit=1)
+        """View quiz results, served from the snapshot frozen when scoring completed"""
+        # Old sessions may have been moved to the archive
+        session = request.env['quiz.session.archive'].sudo()._find_session(token)
         if not session:
             return request.redirect('/quiz')
         
-        # Calculate results if not already calculated
-        if session.state == 'completed' and not session.total_score:
-            responses = request.env['quiz.response'].sudo().search([('session_id', '=', session.id)])
-            total_score = 0
-            max_score = sum(session.quiz_id.question_ids.mapped('points'))
-            
-            # Calculate score based on responses
-            for response in responses:
-                # Basic scoring - this would be enhanced based on question type
-                if response.answer_data:
-                    total_score += response.question_id.points
-            
-            percentage = (total_score / max_score * 100) if max_score > 0 else 0
-            
-            session.write({
-                'total_score': total_score,
-                'percentage': percentage,
-                'passed': percentage >= session.quiz_id.passing_score,
-            })
+        if not session.result_snapshot:
+            # Scores are filled in by the scoring cron, never by this page
+            return request.render('quiz_engine_pro.quiz_results', {
+                'session': session,
+                'result': None,
+            }, headers=[('Cache-Control', 'no-store')])
         
-        values = {
+        # The snapshot never changes: the page only varies with the visitor's language and login
+        etag = '%s-%s-%s' % (session.result_etag, request.env.lang or '', request.env.uid)
+        headers = [('ETag', '"%s"' % etag), ('Cache-Control', 'private, no-cache')]
+        if request.httprequest.if_none_match.contains(etag):
+            return request.make_response('', headers=headers, status=304)
+        return request.render('quiz_engine_pro.quiz_results', {
             'session': session,
-            'quiz': session.quiz_id,
-            'max_score': sum(session.quiz_id.question_ids.mapped('points')),
-        }
-        return request.render('quiz_engine_pro.quiz_results', values)
+            'result': json.loads(session.result_snapshot),
+        }, headers=headers)
+
+    @http.route('/quiz_engine_pro/metrics', type='http', auth='user', methods=['GET'])
+    def quiz_metrics(self, **kwargs):
+        """Instrumentation of this worker in Prometheus text format (administrators only)"""
+        if not request.env.user.has_group('base.group_system'):
+            return request.not_found()
+        return request.make_response(request.env['quiz.metrics']._render_prometheus(), headers=[
+            ('Content-Type', 'text/plain; version=0.0.4; charset=utf-8'),
+            ('Cache-Control', 'no-store'),
+        ])
 
     def _evaluate_answer(self, question, answer_data):
         """Evaluate answer based on question type"""
@@ -0,0 +1,38 @@
+import logging
+
+from odoo import api, SUPERUSER_ID
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Requeue unfinished sessions marked as scored, freeze the snapshots dropped before
+
+    Running sessions marked scored by the scoring state migration go back
+    to pending: they are scored, counted and frozen when they complete or
+    expire. Their total is reset to the sum of their responses, as the
+    score deltas expect of pending sessions. Sessions that lost superseded
+    responses in the pre-migration get their snapshot again, and the
+    statistics of their quizzes are rebuilt from the corrected totals.
+    """
+    _logger.info("Running quiz_engine_pro migration to requeue unfinished sessions for scoring")
+    cr.execute("""
+        UPDATE quiz_session session
+           SET scoring_state = 'pending',
+               result_snapshot = NULL,
+               result_etag = NULL,
+               max_score = COALESCE(NULLIF(session.max_score, 0),
+                                    (SELECT SUM(points) FROM quiz_question WHERE quiz_id = session.quiz_id), 0),
+               total_score = COALESCE((SELECT SUM(score) FROM quiz_response WHERE session_id = session.id), 0)
+         WHERE session.scoring_state = 'scored'
+           AND session.state NOT IN ('completed', 'expired')
+    """)
+    _logger.info("Requeued %s unfinished sessions for scoring", cr.rowcount)
+
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    Session = env['quiz.session']
+    sessions = Session.search([('scoring_state', '=', 'scored'), ('result_snapshot', '=', False)])
+    if sessions:
+        sessions._freeze_results()
+        env['quiz.quiz.stats'].rebuild(sessions.quiz_id)
+        _logger.info("Froze again the results of %s sessions", len(sessions))
@@ -0,0 +1,54 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Mark existing sessions as counted and keep one response per question
+
+    Sessions already had their start and completion added to the
+    statistics. Questions answered again in the paged flow kept every
+    response; only the last one is kept, and the totals of the sessions
+    concerned are summed again.
+    """
+    _logger.info("Running quiz_engine_pro migration to mark counted sessions")
+    cr.execute("ALTER TABLE quiz_session ADD COLUMN IF NOT EXISTS counted_as varchar")
+    cr.execute("""
+        UPDATE quiz_session
+           SET counted_as = CASE WHEN state = 'completed' THEN 'completion' ELSE 'attempt' END
+         WHERE counted_as IS NULL
+    """)
+
+    _logger.info("Running quiz_engine_pro migration to drop superseded responses")
+    cr.execute("""
+        WITH superseded AS (
+            DELETE FROM quiz_response response
+             USING quiz_response later
+             WHERE later.session_id = response.session_id
+               AND later.question_id = response.question_id
+               AND later.id > response.id
+         RETURNING response.session_id
+        )
+        SELECT DISTINCT session_id FROM superseded
+    """)
+    session_ids = [row[0] for row in cr.fetchall()]
+    if not session_ids:
+        return
+    # The snapshots are frozen again by the post-migration
+    cr.execute("""
+        UPDATE quiz_session session
+           SET total_score = totals.total,
+               percentage = CASE WHEN session.max_score > 0 THEN totals.total / session.max_score * 100 ELSE 0 END,
+               passed = CASE WHEN session.max_score > 0 THEN totals.total / session.max_score * 100 ELSE 0 END
+                        >= COALESCE(quiz.passing_score, 0),
+               result_snapshot = NULL,
+               result_etag = NULL
+          FROM (SELECT session_id, COALESCE(SUM(score), 0) AS total
+                  FROM quiz_response
+                 WHERE session_id = ANY(%s)
+              GROUP BY session_id) totals,
+               quiz_quiz quiz
+         WHERE session.id = totals.session_id
+           AND quiz.id = session.quiz_id
+    """, [session_ids])
+    _logger.info("Summed again the totals of %s sessions with superseded responses", len(session_ids))
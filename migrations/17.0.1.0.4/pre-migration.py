@@ -0,0 +1,44 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Resolve duplicate slugs and session tokens before unique indexes are created"""
+    _logger.info("Running quiz_engine_pro migration to deduplicate slugs and session tokens")
+
+    # Keep the oldest quiz on its slug, suffix the others with their id,
+    # plus a counter when that suffixed slug is taken as well
+    cr.execute("""
+        SELECT id, slug
+          FROM (SELECT id, slug, ROW_NUMBER() OVER (PARTITION BY slug ORDER BY id) AS rank
+                  FROM quiz_quiz) dup
+         WHERE rank > 1
+      ORDER BY id
+    """)
+    duplicates = cr.fetchall()
+    if duplicates:
+        cr.execute("SELECT slug FROM quiz_quiz")
+        taken = {row[0] for row in cr.fetchall()}
+        for quiz_id, slug in duplicates:
+            candidate = f'{slug}-{quiz_id}'
+            counter = 1
+            while candidate in taken:
+                counter += 1
+                candidate = f'{slug}-{quiz_id}-{counter}'
+            taken.add(candidate)
+            cr.execute("UPDATE quiz_quiz SET slug = %s WHERE id = %s", [candidate, quiz_id])
+        _logger.info("Renamed %s quizzes with a duplicate slug", len(duplicates))
+
+    # Duplicate tokens are unusable anyway: give the newer sessions a fresh one
+    cr.execute("""
+        UPDATE quiz_session s
+           SET session_token = md5(random()::text || clock_timestamp()::text || s.id::text)
+          FROM (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY session_token ORDER BY id) AS rank
+                  FROM quiz_session
+               ) dup
+         WHERE s.id = dup.id AND dup.rank > 1
+    """)
+    if cr.rowcount:
+        _logger.info("Regenerated %s duplicate session tokens", cr.rowcount)
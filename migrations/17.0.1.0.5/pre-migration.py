@@ -0,0 +1,23 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Mark existing responses and sessions as scored before the scoring queue is introduced"""
+    _logger.info("Running quiz_engine_pro migration to initialize scoring states")
+
+    # Historical rows already carry their final scores: do not queue them again
+    cr.execute("ALTER TABLE quiz_response ADD COLUMN IF NOT EXISTS score_state varchar")
+    cr.execute("UPDATE quiz_response SET score_state = 'scored' WHERE score_state IS NULL")
+
+    cr.execute("ALTER TABLE quiz_answer ADD COLUMN IF NOT EXISTS score_state varchar")
+    cr.execute("UPDATE quiz_answer SET score_state = 'scored' WHERE score_state IS NULL")
+
+    # Sessions still running are scored when they complete or expire
+    cr.execute("ALTER TABLE quiz_session ADD COLUMN IF NOT EXISTS scoring_state varchar")
+    cr.execute("""
+        UPDATE quiz_session
+           SET scoring_state = CASE WHEN state IN ('completed', 'expired') THEN 'scored' ELSE 'pending' END
+         WHERE scoring_state IS NULL
+    """)
@@ -0,0 +1,12 @@
+import logging
+
+from odoo import api, SUPERUSER_ID
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Build the statistics of existing quizzes from their stored sessions"""
+    _logger.info("Running quiz_engine_pro migration to build quiz statistics")
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['quiz.quiz.stats'].rebuild()
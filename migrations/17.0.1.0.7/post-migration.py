@@ -0,0 +1,62 @@
+import logging
+
+from psycopg2.extras import Json, execute_values
+
+from odoo import api, SUPERUSER_ID
+
+from odoo.addons.quiz_engine_pro.models.answer_data import canonicalize_legacy_answer
+
+_logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+
+def migrate(cr, version):
+    """Convert the double encoded text answers to canonical JSONB, in batches"""
+    cr.execute("""
+        SELECT 1
+          FROM information_schema.columns
+         WHERE table_name = 'quiz_response' AND column_name = 'answer_data_legacy'
+    """)
+    if not cr.fetchone():
+        return
+
+    _logger.info("Running quiz_engine_pro migration to convert answers to JSONB")
+    last_id = 0
+    converted = 0
+    while True:
+        cr.execute("""
+            SELECT response.id, question.type, response.answer_data_legacy
+              FROM quiz_response response
+              JOIN quiz_question question ON question.id = response.question_id
+             WHERE response.id > %s
+          ORDER BY response.id
+             LIMIT %s
+        """, [last_id, BATCH_SIZE])
+        rows = cr.fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        values = [
+            (response_id, Json(answer))
+            for response_id, question_type, raw in rows
+            for answer in [canonicalize_legacy_answer(question_type, raw)]
+            if answer is not None
+        ]
+        if values:
+            execute_values(cr._obj, """
+                UPDATE quiz_response
+                   SET answer_data = batch.answer_data
+                  FROM (VALUES %s) AS batch(id, answer_data)
+                 WHERE quiz_response.id = batch.id
+            """, values, template='(%s, %s::jsonb)')
+        converted += len(rows)
+        _logger.info("Converted %s quiz responses", converted)
+
+    cr.execute("ALTER TABLE quiz_response DROP COLUMN answer_data_legacy")
+
+    # Upgrading across 17.0.1.0.6 rebuilt the statistics while the answers
+    # were still in the legacy column, counting every choice as never selected
+    _logger.info("Rebuilding quiz statistics from the converted answers")
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env['quiz.quiz.stats'].rebuild()
@@ -0,0 +1,16 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Move the Text answers aside so the JSONB answer_data column can be created"""
+    cr.execute("""
+        SELECT data_type
+          FROM information_schema.columns
+         WHERE table_name = 'quiz_response' AND column_name = 'answer_data'
+    """)
+    row = cr.fetchone()
+    if row and row[0] == 'text':
+        _logger.info("Running quiz_engine_pro migration to move text answers to answer_data_legacy")
+        cr.execute("ALTER TABLE quiz_response RENAME COLUMN answer_data TO answer_data_legacy")
@@ -0,0 +1,26 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Prepare unscored sessions for incremental score totals
+
+    Their maximum score is snapshotted and their total set to the sum of
+    their response scores, the invariant the score deltas rely on.
+    """
+    _logger.info("Running quiz_engine_pro migration to snapshot session maximum scores")
+    cr.execute("""
+        UPDATE quiz_session session
+           SET max_score = quiz_points.total
+          FROM (SELECT quiz_id, SUM(points) AS total FROM quiz_question GROUP BY quiz_id) quiz_points
+         WHERE quiz_points.quiz_id = session.quiz_id
+           AND session.scoring_state = 'pending'
+    """)
+    cr.execute("""
+        UPDATE quiz_session session
+           SET total_score = totals.total
+          FROM (SELECT session_id, SUM(score) AS total FROM quiz_response GROUP BY session_id) totals
+         WHERE totals.session_id = session.id
+           AND session.scoring_state = 'pending'
+    """)
@@ -0,0 +1,43 @@
+import logging
+
+from odoo import api, fields, SUPERUSER_ID
+from odoo.addons.quiz_engine_pro.models.session import build_result_snapshot
+
+_logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+
+
+def migrate(cr, version):
+    """Freeze the results snapshot of sessions scored before snapshots existed"""
+    _logger.info("Running quiz_engine_pro migration to freeze session results")
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    Session = env['quiz.session']
+    session_ids = Session.search([('scoring_state', '=', 'scored'), ('result_snapshot', '=', False)], order='id').ids
+    for start in range(0, len(session_ids), CHUNK_SIZE):
+        Session.browse(session_ids[start:start + CHUNK_SIZE])._freeze_results()
+        env.invalidate_all()
+
+    # Archived sessions keep their responses in the archive document, in answer order
+    archives = env['quiz.session.archive'].search([('result_snapshot', '=', False)])
+    for archive in archives:
+        responses = {response['question_id']: response for response in archive._get_document().get('responses', [])}
+        questions = env['quiz.question'].browse(list(responses)).exists()
+        outcomes = [{
+            'position': position,
+            'name': question.name or '',
+            'score': responses[question.id]['score'] or 0.0,
+            'points': question.points,
+            'correct': bool(responses[question.id]['is_correct']),
+        } for position, question in enumerate(questions, start=1)]
+        snapshot, etag = build_result_snapshot({
+            'quiz_name': archive.quiz_id.name,
+            'participant_name': archive.participant_name or '',
+            'end_time': fields.Datetime.to_string(archive.end_time) or '',
+            'total_score': archive.total_score,
+            'max_score': archive.max_score,
+            'percentage': archive.percentage,
+            'passed': archive.passed,
+        }, outcomes)
+        archive.write({'result_snapshot': snapshot, 'result_etag': etag})
+    _logger.info("Froze the results of %s sessions and %s archived sessions", len(session_ids), len(archives))
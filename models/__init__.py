@@ -4,6 +4,16 @@ from . import session  # Import session first to avoid circular import
 from . import response
 from . import question_extension
 from . import question_evaluation  # Add this new module
+from . import answer_key
+from . import question_batch
+from . import question_render
+from . import quiz_stats
+from . import item_analysis
+from . import question_import
+from . import question_pool
+from . import session_archive
+from . import quiz_metrics
+from . import autosave
 from . import ghost_models
 
 # Ensure that the new model is added to the models initialization if that's not already done
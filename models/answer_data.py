@@ -0,0 +1,106 @@
+"""Canonical shape of ``quiz.response.answer_data``
+
+Answers are stored once, as native JSONB, in the shape the evaluators
+consume. An empty answer is stored as NULL.
+
+================  ==========================================================
+Question type     Canonical value
+================  ==========================================================
+mcq_single        choice id: ``12``
+mcq_multiple      sorted choice ids: ``[12, 14]``
+fill_blank        blank number to text: ``{"1": "Paris"}``
+match             left/right pairs: ``{"left_3": "Paris", "right_3": "France"}``
+drag_zone,        zone to token text: ``{"1": "Token"}``
+drag_text,
+drag_into_text
+matrix            cell to checked: ``{"cell_4_7": true}``
+dropdown_blank    sorted by blank: ``[{"blank_id": 5, "option_id": 9}]``
+step_sequence     ``[{"step_id": 2, "position": 1}]``
+numerical         number: ``3.14``
+text_box          text: ``"answer"``
+================  ==========================================================
+
+Multiple choice answers can be counted inside Postgres with the GIN
+index, e.g. ``answer_data @> to_jsonb(choice.id)`` matches both shapes.
+"""
+import json
+
+KEYED_TYPES = ('fill_blank', 'match', 'drag_zone', 'drag_text', 'drag_into_text', 'matrix')
+
+
+def decode_legacy_answer(raw):
+    """Decode an answer stored in the former Text column
+
+    Paged submissions were JSON encoded twice, so strings are decoded as
+    long as they hold JSON.
+    """
+    answer = raw
+    for _i in range(2):
+        if not isinstance(answer, str):
+            break
+        try:
+            answer = json.loads(answer)
+        except ValueError:
+            break
+    return answer
+
+
+def canonicalize_legacy_answer(question_type, raw):
+    """Canonical form of an answer read from the former Text column"""
+    if question_type == 'text_box' and isinstance(raw, str):
+        # Free text was encoded once by the controller: decode exactly once
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            pass
+    elif question_type != 'text_box':
+        raw = decode_legacy_answer(raw)
+    return canonicalize_answer(question_type, raw)
+
+
+def canonicalize_answer(question_type, value):
+    """Return ``value`` (as submitted or as formerly stored) in its canonical shape, or None"""
+    if question_type != 'text_box':
+        value = decode_legacy_answer(value)
+    if value in (None, '', {}, []):
+        return None
+
+    if question_type == 'mcq_single':
+        if isinstance(value, list):
+            value = value[0] if value else None
+        return _as_int(value)
+    if question_type in ('mcq_multiple', 'mcq_multi'):
+        values = value if isinstance(value, list) else [value]
+        choice_ids = sorted({choice_id for choice_id in map(_as_int, values) if choice_id is not None})
+        return choice_ids or None
+    if question_type in KEYED_TYPES:
+        if not isinstance(value, dict):
+            return None
+        if question_type == 'matrix':
+            return {str(key): bool(checked) for key, checked in value.items()} or None
+        return {str(key): text for key, text in value.items() if text not in (None, '')} or None
+    if question_type in ('dropdown_blank', 'step_sequence'):
+        keys = ('blank_id', 'option_id') if question_type == 'dropdown_blank' else ('step_id', 'position')
+        entries = []
+        for entry in value if isinstance(value, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            first, second = _as_int(entry.get(keys[0])), _as_int(entry.get(keys[1]))
+            if first is not None and second is not None:
+                entries.append({keys[0]: first, keys[1]: second})
+        return sorted(entries, key=lambda entry: entry[keys[0]]) or None
+    if question_type == 'numerical':
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return None
+    if question_type == 'text_box':
+        return value if isinstance(value, str) else json.dumps(value)
+    return value
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
@@ -0,0 +1,91 @@
+from odoo import models, api
+
+
+class AnswerKeyMixin(models.AbstractModel):
+    """Invalidate compiled question caches when answer data changes"""
+    _name = 'quiz.answer.key.mixin'
+    _description = 'Answer Key Invalidation Mixin'
+
+    def _get_cached_question_ids(self):
+        """Questions whose cached data depends on these records, or None when quiz level caches do"""
+        return set(self.sudo().question_id.ids)
+
+    def _invalidate_cached_questions(self, question_ids):
+        if question_ids is None:
+            self.env['quiz.question']._invalidate_question_caches()
+        else:
+            self.env['quiz.question']._bump_cache_version(question_ids)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._invalidate_cached_questions(records._get_cached_question_ids())
+        return records
+
+    def write(self, vals):
+        question_ids = self._get_cached_question_ids()
+        result = super().write(vals)
+        if question_ids is not None:
+            # Records may have moved to another question
+            question_ids |= self._get_cached_question_ids()
+        self._invalidate_cached_questions(question_ids)
+        return result
+
+    def unlink(self):
+        question_ids = self._get_cached_question_ids()
+        result = super().unlink()
+        self._invalidate_cached_questions(question_ids)
+        return result
+
+
+class Choice(models.Model):
+    _name = 'quiz.choice'
+    _inherit = ['quiz.choice', 'quiz.answer.key.mixin']
+
+
+class MatchPair(models.Model):
+    _name = 'quiz.match.pair'
+    _inherit = ['quiz.match.pair', 'quiz.answer.key.mixin']
+
+
+class DragToken(models.Model):
+    _name = 'quiz.drag.token'
+    _inherit = ['quiz.drag.token', 'quiz.answer.key.mixin']
+
+
+class FillBlankAnswer(models.Model):
+    _name = 'quiz.fill.blank.answer'
+    _inherit = ['quiz.fill.blank.answer', 'quiz.answer.key.mixin']
+
+
+class QuizBlank(models.Model):
+    _name = 'quiz.blank'
+    _inherit = ['quiz.blank', 'quiz.answer.key.mixin']
+
+
+class QuizOption(models.Model):
+    _name = 'quiz.option'
+    _inherit = ['quiz.option', 'quiz.answer.key.mixin']
+
+    def _get_cached_question_ids(self):
+        return set(self.sudo().blank_id.question_id.ids)
+
+
+class SequenceItem(models.Model):
+    _name = 'quiz.sequence.item'
+    _inherit = ['quiz.sequence.item', 'quiz.answer.key.mixin']
+
+
+class QuizMatrixRow(models.Model):
+    _name = 'quiz.matrix.row'
+    _inherit = ['quiz.matrix.row', 'quiz.answer.key.mixin']
+
+
+class QuizMatrixColumn(models.Model):
+    _name = 'quiz.matrix.column'
+    _inherit = ['quiz.matrix.column', 'quiz.answer.key.mixin']
+
+
+class QuizMatrixCell(models.Model):
+    _name = 'quiz.matrix.cell'
+    _inherit = ['quiz.matrix.cell', 'quiz.answer.key.mixin']
@@ -0,0 +1,141 @@
+from odoo import models, fields, api
+from odoo.modules.registry import Registry
+from psycopg2.extras import execute_values
+from .quiz_metrics import METRICS
+import json
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+# A buffer is written at most this long after its oldest save, or as soon
+# as it holds this many (session, question) pairs
+AUTOSAVE_FLUSH_INTERVAL = 2.0
+AUTOSAVE_MAX_ENTRIES = 5000
+# Largest form state accepted from the browser, in bytes of JSON
+AUTOSAVE_MAX_BYTES = 16384
+
+
+class AutosaveBuffer:
+    """Latest autosave of every (session, question), per database, waiting to be written
+
+    Saves of the same question replace each other in the buffer, so a
+    student typing only costs one row write per flush. Each worker has its
+    own buffer; a worker stopping loses at most one flush interval.
+    """
+
+    def __init__(self, interval, max_entries):
+        self.interval = interval
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.since = {}
+        self.timers = {}
+
+    def put(self, dbname, session_id, question_id, form_data):
+        """Buffer a save; return ``(entries, since)`` when the buffer must be flushed now"""
+        with self.lock:
+            entries = self.entries.setdefault(dbname, {})
+            if not entries:
+                self.since[dbname] = time.monotonic()
+                # Written even if no other save arrives in this worker
+                timer = threading.Timer(self.interval, flush_autosave_buffer, args=(dbname, 'timer'))
+                timer.daemon = True
+                self.timers[dbname] = timer
+                timer.start()
+            entries[(session_id, question_id)] = form_data
+            if len(entries) >= self.max_entries or time.monotonic() - self.since[dbname] >= self.interval:
+                return self._take(dbname)
+        return None
+
+    def get(self, dbname, session_id, question_id):
+        with self.lock:
+            return self.entries.get(dbname, {}).get((session_id, question_id))
+
+    def take(self, dbname):
+        with self.lock:
+            return self._take(dbname)
+
+    def _take(self, dbname):
+        timer = self.timers.pop(dbname, None)
+        if timer:
+            timer.cancel()
+        return self.entries.pop(dbname, {}), self.since.pop(dbname, None)
+
+
+AUTOSAVE_BUFFER = AutosaveBuffer(AUTOSAVE_FLUSH_INTERVAL, AUTOSAVE_MAX_ENTRIES)
+
+
+def flush_autosave_buffer(dbname, trigger, entries=None, since=None):
+    """Upsert buffered autosaves in one statement, on a cursor of their own
+
+    Saves of sessions no longer in progress are dropped.
+    """
+    if entries is None:
+        entries, since = AUTOSAVE_BUFFER.take(dbname)
+    if not entries:
+        return 0
+    start = time.perf_counter()
+    rows = [(session_id, question_id, form_data) for (session_id, question_id), form_data in entries.items()]
+    try:
+        with Registry(dbname).cursor() as cr:
+            execute_values(cr._obj, """
+                INSERT INTO quiz_autosave (session_id, question_id, form_data, create_date, write_date)
+                SELECT autosave.session_id, autosave.question_id, autosave.form_data::jsonb,
+                       now() at time zone 'UTC', now() at time zone 'UTC'
+                  FROM (VALUES %s) AS autosave(session_id, question_id, form_data)
+                  JOIN quiz_session session ON session.id = autosave.session_id
+                   AND session.state = 'in_progress'
+                  JOIN quiz_question question ON question.id = autosave.question_id
+                ON CONFLICT (session_id, question_id)
+                DO UPDATE SET form_data = EXCLUDED.form_data, write_date = EXCLUDED.write_date
+            """, rows, page_size=len(rows))
+    except Exception:
+        _logger.exception("Could not write %s autosaved answers", len(rows))
+        return 0
+    METRICS.observe({
+        'autosave_flush_interval': (trigger, time.monotonic() - since if since else 0.0),
+        'autosave_flush_rows': (trigger, len(rows)),
+        'autosave_flush_seconds': (trigger, time.perf_counter() - start),
+    })
+    METRICS.increment({'autosave_rows': (dbname, len(rows))})
+    return len(rows)
+
+
+class QuizAutosave(models.Model):
+    """Form state of a question not submitted yet, restored when the page is reopened
+
+    Rows are only written by the autosave buffer and never scored.
+    """
+    _name = 'quiz.autosave'
+    _description = 'Autosaved Answer'
+
+    session_id = fields.Many2one('quiz.session', string='Session', required=True, ondelete='cascade')
+    question_id = fields.Many2one('quiz.question', string='Question', required=True, ondelete='cascade')
+    form_data = fields.Json(string='Form Data')
+
+    _sql_constraints = [
+        ('session_question_unique', 'UNIQUE(session_id, question_id)',
+         'A question is autosaved once per session.'),
+    ]
+
+    @api.model
+    def _save(self, session_id, question_id, form_data):
+        """Buffer the form state of a question; written by the next flush"""
+        dbname = self.env.cr.dbname
+        METRICS.increment({'autosave_saves': (dbname, 1)})
+        flush = AUTOSAVE_BUFFER.put(dbname, session_id, question_id, json.dumps(form_data))
+        if flush:
+            flush_autosave_buffer(dbname, 'request', *flush)
+
+    @api.model
+    def _get_form_data(self, session_id, question_id):
+        """Last autosaved form state of a question, buffered or written"""
+        buffered = AUTOSAVE_BUFFER.get(self.env.cr.dbname, session_id, question_id)
+        if buffered is not None:
+            return json.loads(buffered)
+        autosave = self.sudo().search_fetch([
+            ('session_id', '=', session_id), ('question_id', '=', question_id),
+        ], ['form_data'], limit=1)
+        return autosave.form_data if autosave else None
@@ -0,0 +1,276 @@
+from odoo import models, fields, api, _
+import logging
+import math
+import numpy as np
+
+from .quiz_stats import _selected_choice_ids
+
+_logger = logging.getLogger(__name__)
+
+ANALYSIS_CHUNK_SIZE = 20000
+
+
+def _iter_query_chunks(cr, name, query, params, chunk_size):
+    """Run a query through a server-side (named) cursor and yield row chunks
+
+    Rows are fetched ``chunk_size`` at a time inside the current
+    transaction, so arbitrarily large result sets never sit in memory.
+    """
+    with cr._cnx.cursor(name=name) as cursor:
+        cursor.itersize = chunk_size
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+
+
+class ItemAnalysisAccumulator:
+    """Classical test theory statistics accumulated over chunks of sessions
+
+    Each chunk is a float32 ``sessions x questions`` score matrix and an
+    optional boolean ``sessions x choices`` selection matrix. Only float64
+    sums are kept between chunks, so memory use depends on the chunk size,
+    not on the number of sessions.
+    """
+
+    def __init__(self, question_count, choice_count=0):
+        self.count = 0
+        self.sum_x = np.zeros(question_count, dtype=np.float64)
+        self.sum_xx = np.zeros(question_count, dtype=np.float64)
+        self.sum_xt = np.zeros(question_count, dtype=np.float64)
+        self.sum_t = 0.0
+        self.sum_tt = 0.0
+        self.choice_count = np.zeros(choice_count, dtype=np.float64)
+        self.choice_sum_t = np.zeros(choice_count, dtype=np.float64)
+
+    def add(self, scores, selections=None):
+        totals = scores.sum(axis=1, dtype=np.float64)
+        wide = scores.astype(np.float64)
+        self.count += scores.shape[0]
+        self.sum_x += wide.sum(axis=0)
+        self.sum_xx += np.square(wide).sum(axis=0)
+        self.sum_xt += totals @ wide
+        self.sum_t += totals.sum()
+        self.sum_tt += totals @ totals
+        if selections is not None and selections.shape[1]:
+            self.choice_count += selections.sum(axis=0, dtype=np.float64)
+            self.choice_sum_t += totals @ selections
+
+    def result(self, points):
+        """Return ``(difficulty, discrimination, alpha, choice_rate, choice_discrimination)``
+
+        Difficulty is the mean score over the points of each question,
+        discrimination the point-biserial correlation between the question
+        and the rest of the test, and the choice discrimination the
+        point-biserial correlation between selecting a choice and the total.
+        """
+        question_count = len(self.sum_x)
+        n = self.count
+        if not n:
+            zeros = np.zeros(question_count)
+            return zeros, zeros, 0.0, np.zeros(len(self.choice_count)), np.zeros(len(self.choice_count))
+
+        mean_x = self.sum_x / n
+        var_x = np.maximum(self.sum_xx / n - mean_x * mean_x, 0.0)
+        mean_t = self.sum_t / n
+        var_t = max(self.sum_tt / n - mean_t * mean_t, 0.0)
+        cov_xt = self.sum_xt / n - mean_x * mean_t
+
+        points = np.asarray(points, dtype=np.float64)
+        difficulty = np.divide(mean_x, points, out=np.zeros(question_count), where=points > 0)
+
+        # Correlate each question with the total of the other questions
+        cov_rest = cov_xt - var_x
+        var_rest = np.maximum(var_t - 2 * cov_xt + var_x, 0.0)
+        denominator = np.sqrt(var_x * var_rest)
+        discrimination = np.divide(cov_rest, denominator, out=np.zeros(question_count), where=denominator > 0)
+
+        alpha = 0.0
+        if question_count > 1 and var_t > 0:
+            alpha = question_count / (question_count - 1) * (1 - var_x.sum() / var_t)
+
+        choice_rate = self.choice_count / n
+        choice_discrimination = np.zeros(len(self.choice_count))
+        chosen = (self.choice_count > 0) & (self.choice_count < n)
+        if var_t > 0 and chosen.any():
+            count = self.choice_count[chosen]
+            mean_chosen = self.choice_sum_t[chosen] / count
+            mean_other = (self.sum_t - self.choice_sum_t[chosen]) / (n - count)
+            rate = count / n
+            choice_discrimination[chosen] = (mean_chosen - mean_other) / math.sqrt(var_t) * np.sqrt(rate * (1 - rate))
+        return difficulty, discrimination, alpha, choice_rate, choice_discrimination
+
+
+def reference_item_analysis(score_rows, points, selection_rows=None):
+    """Straightforward pure Python version of ItemAnalysisAccumulator
+
+    Takes complete rows (one list of scores, and of 0/1 selections, per
+    session) and returns the same tuple as ``ItemAnalysisAccumulator.result``
+    as plain lists; used to check the vectorized engine.
+    """
+    n = len(score_rows)
+    question_count = len(points)
+    selection_rows = selection_rows or [[] for _row in score_rows]
+    choice_count = len(selection_rows[0]) if selection_rows else 0
+    if not n:
+        return [0.0] * question_count, [0.0] * question_count, 0.0, [0.0] * choice_count, [0.0] * choice_count
+
+    def mean(values):
+        return sum(values) / len(values)
+
+    def variance(values):
+        m = mean(values)
+        return sum((value - m) ** 2 for value in values) / len(values)
+
+    def correlation(xs, ys):
+        mx, my = mean(xs), mean(ys)
+        cov = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / len(xs)
+        denominator = math.sqrt(variance(xs) * variance(ys))
+        return cov / denominator if denominator > 0 else 0.0
+
+    totals = [sum(row) for row in score_rows]
+    columns = [[row[j] for row in score_rows] for j in range(question_count)]
+
+    difficulty = [mean(columns[j]) / points[j] if points[j] > 0 else 0.0 for j in range(question_count)]
+    discrimination = [
+        correlation(columns[j], [total - score for total, score in zip(totals, columns[j])])
+        for j in range(question_count)
+    ]
+    alpha = 0.0
+    if question_count > 1 and variance(totals) > 0:
+        alpha = question_count / (question_count - 1) * (1 - sum(variance(c) for c in columns) / variance(totals))
+
+    choice_rate = []
+    choice_discrimination = []
+    for c in range(choice_count):
+        selected = [row[c] for row in selection_rows]
+        choice_rate.append(mean(selected))
+        choice_discrimination.append(correlation(selected, totals))
+    return difficulty, discrimination, alpha, choice_rate, choice_discrimination
+
+
+class QuizItemAnalysis(models.Model):
+    _inherit = 'quiz.quiz'
+
+    cronbach_alpha = fields.Float(string="Cronbach's Alpha", readonly=True, digits=(16, 3))
+    item_analysis_count = fields.Integer(string='Analysed Sessions', readonly=True)
+    item_analysis_date = fields.Datetime(string='Item Analysis Date', readonly=True)
+
+    def action_compute_item_analysis(self):
+        for quiz in self:
+            quiz._compute_item_analysis()
+        return True
+
+    def _compute_item_analysis(self, chunk_size=ANALYSIS_CHUNK_SIZE):
+        """Compute and store difficulty, discrimination and distractor statistics
+
+        Scored sessions are streamed ordered by session, so every chunk
+        holds complete sessions (a session cut by the chunk boundary is
+        carried over to the next chunk).
+        """
+        self.ensure_one()
+        questions = self.question_ids
+        if not questions:
+            return
+        question_index = {question_id: index for index, question_id in enumerate(questions.ids)}
+        mcq_ids = set(questions.filtered(lambda q: q.type in ('mcq_single', 'mcq_multiple')).ids)
+        choices = questions.filtered(lambda q: q.id in mcq_ids).choice_ids
+        choice_index = {choice.id: index for index, choice in enumerate(choices)}
+        choice_question = {choice.id: choice.question_id.id for choice in choices}
+        accumulator = ItemAnalysisAccumulator(len(questions), len(choices))
+
+        def add_sessions(rows):
+            session_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            _unique, session_rows = np.unique(session_ids, return_inverse=True)
+            scores = np.zeros((len(_unique), len(questions)), dtype=np.float32)
+            selections = np.zeros((len(_unique), len(choices)), dtype=np.float32)
+            for row_index, (_session_id, question_id, score, answer_data) in zip(session_rows, rows):
+                column = question_index.get(question_id)
+                if column is None:
+                    continue
+                scores[row_index, column] = score or 0.0
+                if question_id in mcq_ids:
+                    for choice_id in _selected_choice_ids(answer_data):
+                        if choice_question.get(choice_id) == question_id:
+                            selections[row_index, choice_index[choice_id]] = 1.0
+            accumulator.add(scores, selections)
+
+        self.env['quiz.response'].flush_model()
+        self.env['quiz.session'].flush_model()
+        query = """
+            SELECT session.id, response.question_id, response.score,
+                   CASE WHEN question.type IN ('mcq_single', 'mcq_multiple') THEN response.answer_data END
+              FROM quiz_session session
+         LEFT JOIN quiz_response response ON response.session_id = session.id
+         LEFT JOIN quiz_question question ON question.id = response.question_id
+             WHERE session.quiz_id = %s
+               AND session.state = 'completed'
+               AND session.scoring_state = 'scored'
+          ORDER BY session.id
+        """
+        carry = []
+        for rows in _iter_query_chunks(self.env.cr, 'quiz_item_analysis', query, [self.id], chunk_size):
+            rows = carry + rows
+            last_session = rows[-1][0]
+            split = len(rows)
+            while split and rows[split - 1][0] == last_session:
+                split -= 1
+            if split:
+                add_sessions(rows[:split])
+            carry = rows[split:]
+        if carry:
+            add_sessions(carry)
+
+        difficulty, discrimination, alpha, choice_rate, choice_discrimination = accumulator.result(
+            questions.mapped('points'))
+        self._store_item_analysis(questions, difficulty, discrimination, alpha, accumulator.count,
+                                  choices, choice_rate, choice_discrimination)
+        _logger.info("Item analysis of quiz %s over %s sessions", self.id, accumulator.count)
+
+    def _store_item_analysis(self, questions, difficulty, discrimination, alpha, count,
+                             choices, choice_rate, choice_discrimination):
+        # Bulk UPDATEs: going through write() would drop the compiled answer keys
+        cr = self.env.cr
+        cr.execute("""
+            UPDATE quiz_question
+               SET item_difficulty = result.difficulty,
+                   item_discrimination = result.discrimination
+              FROM unnest(%s::int[], %s::float8[], %s::float8[]) AS result(id, difficulty, discrimination)
+             WHERE quiz_question.id = result.id
+        """, [questions.ids, difficulty.tolist(), discrimination.tolist()])
+        if choices:
+            cr.execute("""
+                UPDATE quiz_choice
+                   SET selection_rate = result.rate,
+                       distractor_discrimination = result.discrimination
+                  FROM unnest(%s::int[], %s::float8[], %s::float8[]) AS result(id, rate, discrimination)
+                 WHERE quiz_choice.id = result.id
+            """, [choices.ids, choice_rate.tolist(), choice_discrimination.tolist()])
+        cr.execute("""
+            UPDATE quiz_quiz
+               SET cronbach_alpha = %s, item_analysis_count = %s, item_analysis_date = now() at time zone 'UTC'
+             WHERE id = %s
+        """, [float(alpha), count, self.id])
+        questions.invalidate_recordset(['item_difficulty', 'item_discrimination'])
+        choices.invalidate_recordset(['selection_rate', 'distractor_discrimination'])
+        self.invalidate_recordset(['cronbach_alpha', 'item_analysis_count', 'item_analysis_date'])
+
+
+class QuestionItemAnalysis(models.Model):
+    _inherit = 'quiz.question'
+
+    item_difficulty = fields.Float(string='Difficulty (p-value)', readonly=True, digits=(16, 3),
+                                   help='Average share of the points obtained, from the last item analysis')
+    item_discrimination = fields.Float(string='Discrimination', readonly=True, digits=(16, 3),
+                                       help='Point-biserial correlation with the rest of the quiz')
+
+
+class ChoiceItemAnalysis(models.Model):
+    _inherit = 'quiz.choice'
+
+    selection_rate = fields.Float(string='Selection Rate', readonly=True, digits=(16, 3))
+    distractor_discrimination = fields.Float(string='Choice Discrimination', readonly=True, digits=(16, 3),
+                                             help='Point-biserial correlation between selecting the choice '
+                                                  'and the total score')
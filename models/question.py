@@ -1,4 +1,4 @@
-from odoo import models, fields, api, _
+from odoo import models, fields, api, _, _lt
 from odoo.exceptions import ValidationError
 import re
 import logging
@@ -6,6 +6,18 @@ import json
 
 _logger = logging.getLogger(__name__)
 
+HTML_TAG_RE = re.compile(r'<.*?>')
+
+# Child records a question must have, per type: (model, question types, error)
+REQUIRED_CHILDREN = [
+    ('quiz.choice', ('mcq_single', 'mcq_multiple'), _lt('Multiple choice questions must have choices defined.')),
+    ('quiz.fill.blank.answer', ('fill_blank',), _lt('Fill in the blanks questions must have blank answers defined.')),
+    ('quiz.match.pair', ('match',), _lt('Match questions must have match pairs defined.')),
+    ('quiz.drag.token', ('drag_text', 'drag_zone'), _lt('Drag and drop questions must have tokens defined.')),
+    ('quiz.blank', ('dropdown_blank',), _lt('Dropdown in Text questions must have blanks with options defined.')),
+    ('quiz.sequence.item', ('step_sequence',), _lt('Step Sequencing questions must have sequence steps defined.')),
+]
+
 
 class Question(models.Model):
     _name = 'quiz.question'
@@ -51,11 +63,11 @@ class Question(models.Model):
             if question.type == 'dropdown_blank' and question.text_template:
                 text = question.text_template or ''
                 # Strip tags to get plain text
-                text = re.sub(r'<.*?>', '', text)
+                text = HTML_TAG_RE.sub('', text)
             else:
                 text = question.question_html or ''
                 # Strip tags to get plain text
-                text = re.sub(r'<.*?>', '', text)
+                text = HTML_TAG_RE.sub('', text)
                 
             # Limit length for display
             if len(text) > 50:
@@ -65,27 +77,18 @@ class Question(models.Model):
     @api.constrains('type')
     def _check_required_fields(self):
         for question in self:
-            if question.type == 'mcq_single' or question.type == 'mcq_multiple':
-                if not question.choice_ids:
-                    raise ValidationError(_('Multiple choice questions must have choices defined.'))
-            elif question.type == 'fill_blank':
-                if not question.fill_blank_answer_ids:
-                    raise ValidationError(_('Fill in the blanks questions must have blank answers defined.'))
-            elif question.type == 'match':
-                if not question.match_pair_ids:
-                    raise ValidationError(_('Match questions must have match pairs defined.'))
-            elif question.type == 'drag_text' or question.type == 'drag_zone':
-                if not question.drag_token_ids:
-                    raise ValidationError(_('Drag and drop questions must have tokens defined.'))
-            elif question.type == 'dropdown_blank':
-                if not question.text_template:
-                    raise ValidationError(_('Dropdown in Text questions must have a text template defined.'))
-                if not question.blank_ids:
-                    raise ValidationError(_('Dropdown in Text questions must have blanks with options defined.'))
-            elif question.type == 'step_sequence':
-                if not question.sequence_item_ids:
-                    raise ValidationError(_('Step Sequencing questions must have sequence steps defined.'))
-    
+            if question.type == 'dropdown_blank' and not question.text_template:
+                raise ValidationError(_('Dropdown in Text questions must have a text template defined.'))
+        # One grouped query per child model, whatever the number of questions
+        for model_name, question_types, message in REQUIRED_CHILDREN:
+            questions = self.filtered(lambda q: q.type in question_types)
+            if not questions:
+                continue
+            groups = self.env[model_name]._read_group([('question_id', 'in', questions.ids)], ['question_id'])
+            present = {question.id for question, in groups}
+            if any(question_id not in present for question_id in questions.ids):
+                raise ValidationError(str(message))
+
     # This method will auto-fill question_html from text_template for dropdown_blank questions
     @api.onchange('text_template', 'type')
     def _onchange_text_template(self):
@@ -184,9 +187,12 @@ class QuizBlank(models.Model):
     
     @api.constrains('input_type', 'option_ids')
     def _check_dropdown_options(self):
-        for blank in self:
-            if blank.input_type == 'dropdown' and not blank.option_ids:
-                raise ValidationError(_("Dropdown blanks must have at least one option defined"))
+        dropdowns = self.filtered(lambda blank: blank.input_type == 'dropdown')
+        if not dropdowns:
+            return
+        groups = self.env['quiz.option']._read_group([('blank_id', 'in', dropdowns.ids)], ['blank_id'])
+        if len(groups) < len(dropdowns):
+            raise ValidationError(_("Dropdown blanks must have at least one option defined"))
 
 
 class QuizOption(models.Model):
@@ -201,15 +207,15 @@ class QuizOption(models.Model):
     
     @api.constrains('blank_id', 'is_correct')
     def _check_one_correct_answer(self):
-        for option in self:
-            if option.is_correct:
-                correct_count = self.search_count([
-                    ('blank_id', '=', option.blank_id.id),
-                    ('is_correct', '=', True),
-                    ('id', '!=', option.id)
-                ])
-                if correct_count > 0:
-                    raise ValidationError(_("Each dropdown blank can have only one correct answer"))
+        blanks = self.filtered('is_correct').blank_id
+        if not blanks:
+            return
+        # A single grouped query for the whole recordset
+        groups = self._read_group(
+            [('blank_id', 'in', blanks.ids), ('is_correct', '=', True)],
+            ['blank_id'], ['__count'], having=[('__count', '>', 1)], limit=1)
+        if groups:
+            raise ValidationError(_("Each dropdown blank can have only one correct answer"))
 
 
 class SequenceItem(models.Model):
@@ -272,23 +278,6 @@ class SequenceItem(models.Model):
         ], limit=1)
         
         return cell.is_correct if cell else False
-    @api.model_create_multi
-    def create(self, vals_list):
-        for vals in vals_list:
-            # Process each vals individually
-            res = super().create([vals])
-            
-            # Handle individual records after creation
-            for record in res:
-                if record._name == 'quiz.question':  # Only apply to question records
-                    if record.type == 'matrix' and not record.matrix_row_ids and not record.matrix_column_ids:
-                        # Add default rows and columns for new matrix questions
-                        self.env['quiz.matrix.row'].create({'question_id': record.id, 'name': 'Row 1'})
-                        self.env['quiz.matrix.row'].create({'question_id': record.id, 'name': 'Row 2'})
-                        self.env['quiz.matrix.column'].create({'question_id': record.id, 'name': 'Column 1'})
-                        self.env['quiz.matrix.column'].create({'question_id': record.id, 'name': 'Column 2'})
-        
-        return res
     
     def action_open_matrix_cells(self):
         """Open a view to edit matrix cells"""
@@ -0,0 +1,226 @@
+from odoo import models, api
+import json
+import logging
+import time
+import numpy as np
+
+_logger = logging.getLogger(__name__)
+
+
+class QuestionBatchScoring(models.Model):
+    _inherit = 'quiz.question'
+
+    def score_responses(self):
+        """Rescore every response to these questions in one pass per question
+
+        Answers are decoded into arrays and scored with array operations
+        against the compiled answer key; all scores are then written back
+        with a single bulk UPDATE.
+        """
+        if not self:
+            return 0
+
+        self.env['quiz.response'].flush_model(['answer_data', 'question_id'])
+        self.env.cr.execute("""
+            SELECT question_id, id, answer_data, session_id
+              FROM quiz_response
+             WHERE question_id IN %s
+          ORDER BY question_id, id
+        """, [tuple(self.ids)])
+        grouped = {}
+        session_ids = set()
+        for question_id, response_id, answer_data, session_id in self.env.cr.fetchall():
+            ids, answers = grouped.setdefault(question_id, ([], []))
+            ids.append(response_id)
+            answers.append(answer_data)
+            session_ids.add(session_id)
+
+        all_ids = []
+        all_scores = []
+        for question in self:
+            if question.id not in grouped:
+                continue
+            ids, raw_answers = grouped[question.id]
+            scores = question._score_answers_batch(raw_answers)
+            all_ids.extend(ids)
+            all_scores.extend(scores.tolist())
+
+        if all_ids:
+            Session = self.env['quiz.session']
+            Session._apply_score_deltas(self.env['quiz.response']._write_scores(all_ids, all_scores))
+            Session.browse(session_ids)._mark_scored()
+
+        _logger.info("Rescored %s responses for %s questions", len(all_ids), len(self))
+        return len(all_ids)
+
+    def _score_answers_batch(self, answers):
+        """Return a float array with the score of each decoded answer"""
+        self.ensure_one()
+        key = self._get_answer_key(self.id)
+        if not self.env['quiz.metrics']._is_enabled():
+            return self._score_answers_batch_by_type(key, answers)
+        # One observation per batch, whatever its size
+        start = time.perf_counter()
+        scores = self._score_answers_batch_by_type(key, answers)
+        self.env['quiz.metrics']._observe_evaluation(key.type, time.perf_counter() - start, batch=True)
+        return scores
+
+    def _score_answers_batch_by_type(self, key, answers):
+        if not answers:
+            return np.zeros(0, dtype=np.float64)
+        if key.type == 'mcq_single':
+            hits = self._batch_mcq_single(key, answers)
+        elif key.type in ('mcq_multi', 'mcq_multiple'):
+            hits = self._batch_mcq_multi(key, answers)
+        elif key.type == 'fill_blank':
+            hits = self._batch_fill_blank(key, answers)
+        elif key.type == 'matrix':
+            hits = self._batch_matrix(key, answers)
+        elif key.type == 'dropdown_blank':
+            hits = self._batch_dropdown_blank(key, answers)
+        elif key.type == 'numerical':
+            hits = self._batch_numerical(key, answers)
+        else:
+            # Free-form types (match, drag and drop, text box) are scored
+            # per answer, still without queries thanks to the answer key
+            return np.array([self._safe_evaluate(answer) for answer in answers], dtype=np.float64)
+        return hits.astype(np.float64) * key.points
+
+    def _safe_evaluate(self, answer_data):
+        try:
+            return self.evaluate_answer(answer_data)
+        except (ValueError, TypeError, AttributeError):
+            return 0.0
+
+    @api.model
+    def _choice_one_hot(self, choice_ids, answers, multiple):
+        """Encode MCQ selections as a one-hot matrix over the question choices
+
+        Returns the matrix and a mask of answers that selected an id which is
+        not one of the choices (those can never be fully correct).
+        """
+        column = {choice_id: index for index, choice_id in enumerate(choice_ids)}
+        one_hot = np.zeros((len(answers), len(choice_ids)), dtype=bool)
+        foreign = np.zeros(len(answers), dtype=bool)
+        for row, answer in enumerate(answers):
+            if not answer:
+                continue
+            try:
+                selected = [int(x) for x in answer if x] if multiple else [int(answer)]
+            except (ValueError, TypeError):
+                foreign[row] = True
+                continue
+            for choice_id in selected:
+                if choice_id in column:
+                    one_hot[row, column[choice_id]] = True
+                else:
+                    foreign[row] = True
+        return one_hot, foreign
+
+    def _correct_choice_mask(self, key, correct_ids):
+        choice_ids = key.choice_ids
+        correct_mask = np.array([choice_id in correct_ids for choice_id in choice_ids], dtype=bool)
+        return choice_ids, correct_mask
+
+    def _batch_mcq_single(self, key, answers):
+        # Like _evaluate_mcq_single, only the first correct choice scores
+        choice_ids, correct_mask = self._correct_choice_mask(key, {key.single_choice_id})
+        one_hot, _foreign = self._choice_one_hot(choice_ids, answers, multiple=False)
+        return (one_hot & correct_mask).any(axis=1)
+
+    def _batch_mcq_multi(self, key, answers):
+        choice_ids, correct_mask = self._correct_choice_mask(key, key.correct_choice_ids)
+        one_hot, foreign = self._choice_one_hot(choice_ids, answers, multiple=True)
+        answered = np.array([bool(answer) for answer in answers], dtype=bool)
+        return answered & ~foreign & (one_hot == correct_mask).all(axis=1)
+
+    def _batch_fill_blank(self, key, answers):
+        blank_keys = list(key.blank_answers)
+        if not blank_keys:
+            return np.zeros(len(answers), dtype=bool)
+        answers = [_as_mapping(answer) for answer in answers]
+        correct = np.array([key.blank_answers[blank_key] for blank_key in blank_keys], dtype=str)
+        # One categorical column per blank plus a mask of the blanks answered
+        present = np.array([
+            [bool(answer) and isinstance(answer.get(blank_key), str) for blank_key in blank_keys]
+            for answer in answers
+        ], dtype=bool)
+        given = np.array([
+            [answer[blank_key] if is_present else '' for blank_key, is_present in zip(blank_keys, row)]
+            for answer, row in zip(answers, present)
+        ], dtype=str)
+        given = np.char.lower(np.char.strip(given))
+        return (present & (given == correct)).sum(axis=1) / len(blank_keys)
+
+    def _batch_matrix(self, key, answers):
+        cell_keys = list(key.matrix_cells)
+        if not cell_keys:
+            return np.zeros(len(answers), dtype=bool)
+        answers = [_as_mapping(answer) for answer in answers]
+        expected = np.array([key.matrix_cells[cell_key] for cell_key in cell_keys], dtype=np.int8)
+        # Tri-state grid: 1 checked, 0 unchecked, -1 missing or unexpected value
+        grid = np.full((len(answers), len(cell_keys)), -1, dtype=np.int8)
+        for row, answer in enumerate(answers):
+            if not answer:
+                continue
+            for col, cell_key in enumerate(cell_keys):
+                value = answer.get(cell_key)
+                if value is True or value == 1:
+                    grid[row, col] = 1
+                elif value is False or value == 0:
+                    grid[row, col] = 0
+        return (grid == expected).sum(axis=1) / len(cell_keys)
+
+    def _batch_dropdown_blank(self, key, answers):
+        if not key.blank_count:
+            return np.zeros(len(answers), dtype=bool)
+        blank_ids = key.blank_ids
+        column = {blank_id: index for index, blank_id in enumerate(blank_ids)}
+        correct = np.full(len(blank_ids), -1, dtype=np.int64)
+        for option_id, blank_id in key.correct_options.items():
+            correct[column[blank_id]] = option_id
+        # One categorical column per blank holding the selected option id
+        selected = np.full((len(answers), len(blank_ids)), -2, dtype=np.int64)
+        for row, answer in enumerate(answers):
+            if isinstance(answer, str):
+                try:
+                    answer = json.loads(answer)
+                except ValueError:
+                    continue
+            if not isinstance(answer, list):
+                continue
+            for entry in answer:
+                try:
+                    col = column.get(int(entry['blank_id']))
+                    if col is not None:
+                        selected[row, col] = int(entry['option_id'])
+                except (KeyError, ValueError, TypeError):
+                    continue
+        return (selected == correct).sum(axis=1) / key.blank_count
+
+    def _batch_numerical(self, key, answers):
+        values = np.full(len(answers), np.nan)
+        for row, answer in enumerate(answers):
+            if not answer:
+                continue
+            try:
+                values[row] = float(answer)
+            except (ValueError, TypeError):
+                continue
+        valid = ~np.isnan(values)
+        hits = np.zeros(len(answers), dtype=bool)
+        if key.numerical_exact_value is not False:
+            hits |= valid & (np.abs(values - key.numerical_exact_value) <= key.numerical_tolerance)
+        if key.numerical_min_value is not False and key.numerical_max_value is not False:
+            hits |= valid & (values >= key.numerical_min_value) & (values <= key.numerical_max_value)
+        return hits
+
+
+def _as_mapping(answer):
+    """Return the dict form of a keyed answer, or None"""
+    if isinstance(answer, str):
+        try:
+            answer = json.loads(answer)
+        except ValueError:
+            return None
+    return answer if isinstance(answer, dict) else None
@@ -1,239 +1,414 @@
-from odoo import models
+from odoo import models, fields, api, tools
+from collections import namedtuple
+from types import MappingProxyType
+import itertools
 import json
+import time
+
+from .answer_data import canonicalize_answer, decode_legacy_answer
+
+# Single evaluations timed when instrumentation is on: one in this many
+EVALUATION_SAMPLE_RATE = 64
+_evaluation_counter = itertools.count()
+
+# Immutable, pre-compiled answer key of a question. Built once per question
+# by ``_get_answer_key`` and kept in the registry's ormcache under the
+# question's cache version, so scoring a response does not load answer data.
+AnswerKey = namedtuple('AnswerKey', [
+    'type',
+    'points',
+    'choice_ids',            # sorted tuple of every quiz.choice id
+    'correct_choice_ids',    # frozenset of correct quiz.choice ids
+    'single_choice_id',      # first correct quiz.choice id, the only one mcq_single accepts
+    'blank_answers',         # {'<blank_number>': normalized answer text}
+    'match_pair_ids',        # tuple of quiz.match.pair ids
+    'match_right_texts',     # {quiz.match.pair id: right text}
+    'drag_positions',        # tuple of ('<correct_position>', token text)
+    'matrix_cells',          # {'cell_<row>_<col>': is_correct} over the full grid
+    'blank_ids',             # sorted tuple of quiz.blank ids
+    'blank_count',           # number of dropdown blanks
+    'correct_options',       # {quiz.option id: quiz.blank id} of correct options
+    'text_answer',           # normalized correct text answer
+    'case_sensitive',
+    'allow_partial_match',
+    'keywords',              # tuple of normalized keywords
+    'numerical_exact_value',
+    'numerical_tolerance',
+    'numerical_min_value',
+    'numerical_max_value',
+])
+
+# Question fields the quiz level caches (layout, quiz infos, pool members)
+# depend on; other fields only change the cached data of the question itself
+STRUCTURAL_FIELDS = {'quiz_id', 'sequence', 'points', 'tag_ids', 'difficulty'}
+
 
 class QuestionEvaluation(models.Model):
     _inherit = 'quiz.question'
-    
+
+    cache_version = fields.Integer(string='Cache Version', default=0, readonly=True, copy=False,
+                                   help='Increased when the question or its answer data changes; '
+                                        'part of the key of every per-question cache')
+
+    def _get_cache_version(self, question_id):
+        """Current cache version of a question, read from the env cache when already loaded"""
+        question = self if len(self) == 1 and self.id == question_id else self.browse(question_id)
+        return question.sudo().cache_version
+
+    def _bump_cache_version(self, question_ids):
+        """Stale the cached answer keys, fragments and payloads of ``question_ids``
+
+        Entries under the previous version are never read again and age out
+        of the LRU, so nothing is cleared and other workers need no signal.
+        """
+        if not question_ids:
+            return
+        self.env.cr.execute(
+            "UPDATE quiz_question SET cache_version = cache_version + 1 WHERE id = ANY(%s)",
+            [list(question_ids)],
+        )
+        self.browse(question_ids).invalidate_recordset(['cache_version'])
+
+    @tools.ormcache('question_id', 'self._get_cache_version(question_id)')
+    def _get_answer_key(self, question_id):
+        """Compile the answer key of a question (cached per worker)"""
+        question = self.sudo().browse(question_id)
+
+        blank_answers = {
+            str(blank.blank_number): blank.answer_text.strip().lower()
+            for blank in question.fill_blank_answer_ids
+        }
+
+        # Matrix truth table, read in a single query instead of one per cell
+        rows = question.matrix_row_ids
+        columns = question.matrix_column_ids
+        cell_values = {}
+        if rows and columns:
+            cells = self.env['quiz.matrix.cell'].sudo().search(
+                [('row_id', 'in', rows.ids), ('column_id', 'in', columns.ids)], order='id')
+            for cell in cells:
+                cell_values.setdefault((cell.row_id.id, cell.column_id.id), cell.is_correct)
+        matrix_cells = {
+            f"cell_{row.id}_{col.id}": cell_values.get((row.id, col.id), False)
+            for row in rows
+            for col in columns
+        }
+
+        correct_options = {
+            option.id: blank.id
+            for blank in question.blank_ids
+            for option in blank.option_ids
+            if option.is_correct
+        }
+
+        text_answer = (question.correct_text_answer or '').strip()
+        keywords = tuple(k.strip() for k in question.keywords.split(',')) if question.keywords else ()
+        if not question.case_sensitive:
+            text_answer = text_answer.lower()
+            keywords = tuple(k.lower() for k in keywords)
+
+        return AnswerKey(
+            type=question.type,
+            points=question.points,
+            choice_ids=tuple(sorted(question.choice_ids.ids)),
+            correct_choice_ids=frozenset(question.choice_ids.filtered('is_correct').ids),
+            single_choice_id=question.choice_ids.filtered('is_correct')[:1].id or None,
+            blank_answers=MappingProxyType(blank_answers),
+            match_pair_ids=tuple(question.match_pair_ids.ids),
+            match_right_texts=MappingProxyType({pair.id: pair.right_text for pair in question.match_pair_ids}),
+            drag_positions=tuple(
+                (str(token.correct_position), token.text) for token in question.drag_token_ids
+            ),
+            matrix_cells=MappingProxyType(matrix_cells),
+            blank_ids=tuple(sorted(question.blank_ids.ids)),
+            blank_count=len(question.blank_ids),
+            correct_options=MappingProxyType(correct_options),
+            text_answer=text_answer,
+            case_sensitive=question.case_sensitive,
+            allow_partial_match=question.allow_partial_match,
+            keywords=keywords,
+            numerical_exact_value=question.numerical_exact_value,
+            numerical_tolerance=question.numerical_tolerance,
+            numerical_min_value=question.numerical_min_value,
+            numerical_max_value=question.numerical_max_value,
+        )
+
+    def _invalidate_question_caches(self):
+        """Drop the quiz level caches (layouts, quiz infos, pool members) in every worker"""
+        self.env.registry.clear_cache()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        # Question counts of the cached quiz infos changed
+        self._invalidate_question_caches()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        if STRUCTURAL_FIELDS.intersection(vals):
+            self._invalidate_question_caches()
+        self._bump_cache_version(self.ids)
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self._invalidate_question_caches()
+        return result
+
     def evaluate_answer(self, answer_data):
-        """Evaluate answer based on question type"""
-        if self.type == 'mcq_single':
-            return self._evaluate_mcq_single(answer_data)
-        elif self.type == 'mcq_multi':
-            return self._evaluate_mcq_multi(answer_data)
-        elif self.type == 'fill_blank':
-            return self._evaluate_fill_blank(answer_data)
-        elif self.type == 'match':
-            return self._evaluate_match(answer_data)
-        elif self.type in ['drag_zone', 'drag_into_text']:
-            return self._evaluate_drag_drop(answer_data)
-        elif self.type == 'text_box':
-            return self._evaluate_text_box(answer_data)
-        elif self.type == 'numerical':
-            return self._evaluate_numerical(answer_data)
-        elif self.type == 'matrix':
-            return self._evaluate_matrix(answer_data)
-        elif self.type == 'dropdown_blank':
-            return self._evaluate_dropdown_blank(answer_data)
+        """Evaluate answer based on question type
+
+        With instrumentation on, one evaluation in EVALUATION_SAMPLE_RATE is
+        timed, so the cheapest evaluators do not pay for a histogram update
+        on every answer.
+        """
+        key = self._get_answer_key(self.id)
+        if next(_evaluation_counter) % EVALUATION_SAMPLE_RATE or not self.env['quiz.metrics']._is_enabled():
+            return self._evaluate_answer_by_type(key, answer_data)
+        start = time.perf_counter()
+        score = self._evaluate_answer_by_type(key, answer_data)
+        self.env['quiz.metrics']._observe_evaluation(key.type, time.perf_counter() - start)
+        return score
+
+    def _evaluate_answer_by_type(self, key, answer_data):
+        if key.type == 'mcq_single':
+            return self._evaluate_mcq_single(key, answer_data)
+        elif key.type in ['mcq_multi', 'mcq_multiple']:
+            return self._evaluate_mcq_multi(key, answer_data)
+        elif key.type == 'fill_blank':
+            return self._evaluate_fill_blank(key, answer_data)
+        elif key.type == 'match':
+            return self._evaluate_match(key, answer_data)
+        elif key.type in ['drag_zone', 'drag_text', 'drag_into_text']:
+            return self._evaluate_drag_drop(key, answer_data)
+        elif key.type == 'text_box':
+            return self._evaluate_text_box(key, answer_data)
+        elif key.type == 'numerical':
+            return self._evaluate_numerical(key, answer_data)
+        elif key.type == 'matrix':
+            return self._evaluate_matrix(key, answer_data)
+        elif key.type == 'dropdown_blank':
+            return self._evaluate_dropdown_blank(key, answer_data)
         return 0.0
 
-    def _evaluate_mcq_single(self, answer_data):
+    def _evaluate_mcq_single(self, key, answer_data):
         """Evaluate single choice MCQ"""
         if not answer_data:
             return 0.0
-        
+
         selected_choice_id = int(answer_data)
-        correct_choice = self.choice_ids.filtered('is_correct')
-        
-        if correct_choice and selected_choice_id == correct_choice[0].id:
-            return self.points
+
+        if key.single_choice_id and selected_choice_id == key.single_choice_id:
+            return key.points
         return 0.0
 
-    def _evaluate_mcq_multi(self, answer_data):
+    def _evaluate_mcq_multi(self, key, answer_data):
         """Evaluate multiple choice MCQ"""
         if not answer_data:
             return 0.0
-        
+
         selected_ids = [int(x) for x in answer_data if x]
-        correct_ids = self.choice_ids.filtered('is_correct').ids
-        
-        if set(selected_ids) == set(correct_ids):
-            return self.points
+
+        if set(selected_ids) == key.correct_choice_ids:
+            return key.points
         return 0.0
 
-    def _evaluate_fill_blank(self, answer_data):
+    def _evaluate_fill_blank(self, key, answer_data):
         """Evaluate fill in the blanks"""
         if not answer_data:
             return 0.0
-        
+
         try:
             answers = json.loads(answer_data) if isinstance(answer_data, str) else answer_data
         except:
             return 0.0
-        
-        total_blanks = len(self.fill_blank_answer_ids)
+
+        total_blanks = len(key.blank_answers)
         if total_blanks == 0:
             return 0.0
-        
+
         correct_count = 0
-        for blank_answer in self.fill_blank_answer_ids:
-            blank_key = str(blank_answer.blank_number)
+        for blank_key, correct_answer in key.blank_answers.items():
             if blank_key in answers:
                 user_answer = answers[blank_key].strip().lower()
-                correct_answer = blank_answer.answer_text.strip().lower()
                 if user_answer == correct_answer:
                     correct_count += 1
-        
-        return (correct_count / total_blanks) * self.points
 
-    def _evaluate_match(self, answer_data):
+        return (correct_count / total_blanks) * key.points
+
+    def _evaluate_match(self, key, answer_data):
         """Evaluate matching questions"""
         if not answer_data:
             return 0.0
-        
+
         try:
             matches = json.loads(answer_data) if isinstance(answer_data, str) else answer_data
         except:
             return 0.0
-        
-        total_pairs = len(self.match_pair_ids)
+
+        total_pairs = len(key.match_pair_ids)
         if total_pairs == 0:
             return 0.0
-        
+
         correct_count = 0
-        for pair in self.match_pair_ids:
-            left_key = f"left_{pair.id}"
-            right_key = f"right_{pair.id}"
+        for pair_id in key.match_pair_ids:
+            left_key = f"left_{pair_id}"
+            right_key = f"right_{pair_id}"
             if left_key in matches and right_key in matches:
                 if matches[left_key] == matches[right_key]:
                     correct_count += 1
-        
-        return (correct_count / total_pairs) * self.points
 
-    def _evaluate_drag_drop(self, answer_data):
+        return (correct_count / total_pairs) * key.points
+
+    def _expand_match_answer(self, answer_data):
+        """Turn a {pair_id: right text} answer into the left/right form evaluated below"""
+        key = self._get_answer_key(self.id)
+        if not isinstance(answer_data, dict):
+            return {}
+        matches = {}
+        for pair_id, right_text in key.match_right_texts.items():
+            if str(pair_id) in answer_data:
+                matches[f"left_{pair_id}"] = answer_data[str(pair_id)]
+                matches[f"right_{pair_id}"] = right_text
+        return matches
+
+    def _canonicalize_answer(self, value):
+        """Return a submitted answer in the canonical stored shape (see answer_data.py)"""
+        self.ensure_one()
+        key = self._get_answer_key(self.id)
+        if key.type == 'match':
+            value = decode_legacy_answer(value)
+            if isinstance(value, dict) and not any(str(name).startswith('left_') for name in value):
+                value = self._expand_match_answer(value)
+        return canonicalize_answer(key.type, value)
+
+    def _evaluate_drag_drop(self, key, answer_data):
         """Evaluate drag and drop questions"""
         if not answer_data:
             return 0.0
-        
+
         try:
             placements = json.loads(answer_data) if isinstance(answer_data, str) else answer_data
         except:
             return 0.0
-        
-        total_tokens = len(self.drag_token_ids)
+
+        total_tokens = len(key.drag_positions)
         if total_tokens == 0:
             return 0.0
-        
+
         correct_count = 0
-        for token in self.drag_token_ids:
-            blank_key = str(token.correct_position)
+        for blank_key, token_text in key.drag_positions:
             if blank_key in placements:
-                if placements[blank_key] == token.text:
+                if placements[blank_key] == token_text:
                     correct_count += 1
-        
-        return (correct_count / total_tokens) * self.points
 
-    def _evaluate_text_box(self, answer_data):
+        return (correct_count / total_tokens) * key.points
+
+    def _evaluate_text_box(self, key, answer_data):
         """Evaluate text box answers"""
-        if not answer_data or not self.correct_text_answer:
+        if not answer_data or not key.text_answer:
             return 0.0
-        
+
         user_answer = answer_data.strip()
-        correct_answer = self.correct_text_answer.strip()
-        
+        correct_answer = key.text_answer
+
         # Apply case sensitivity
-        if not self.case_sensitive:
+        if not key.case_sensitive:
             user_answer = user_answer.lower()
-            correct_answer = correct_answer.lower()
-        
+
         # Exact match
         if user_answer == correct_answer:
-            return self.points
-        
+            return key.points
+
         # Partial match if allowed
-        if self.allow_partial_match:
-            if self.keywords:
-                keywords = [k.strip() for k in self.keywords.split(',')]
-                # Convert to lowercase if not case sensitive
-                if not self.case_sensitive:
-                    keywords = [k.lower() for k in keywords]
-                
+        if key.allow_partial_match:
+            if key.keywords:
                 # Check if all keywords are present
-                keywords_found = sum(1 for k in keywords if k in user_answer)
+                keywords_found = sum(1 for k in key.keywords if k in user_answer)
                 if keywords_found > 0:
-                    return (keywords_found / len(keywords)) * self.points
+                    return (keywords_found / len(key.keywords)) * key.points
             else:
                 # Simple partial match calculation if no specific keywords
                 ratio = len(set(user_answer.split()) & set(correct_answer.split())) / len(set(correct_answer.split()))
                 if ratio > 0.5:  # More than half the words match
-                    return ratio * self.points
-        
+                    return ratio * key.points
+
         return 0.0
 
-    def _evaluate_numerical(self, answer_data):
+    def _evaluate_numerical(self, key, answer_data):
         """Evaluate numerical answers"""
         if not answer_data:
             return 0.0
-        
+
         try:
             user_value = float(answer_data)
         except (ValueError, TypeError):
             return 0.0
-        
+
         # Exact value with tolerance
-        if self.numerical_exact_value is not False:
-            if abs(user_value - self.numerical_exact_value) <= self.numerical_tolerance:
-                return self.points
-        
+        if key.numerical_exact_value is not False:
+            if abs(user_value - key.numerical_exact_value) <= key.numerical_tolerance:
+                return key.points
+
         # Range check
-        if self.numerical_min_value is not False and self.numerical_max_value is not False:
-            if self.numerical_min_value <= user_value <= self.numerical_max_value:
-                return self.points
-        
+        if key.numerical_min_value is not False and key.numerical_max_value is not False:
+            if key.numerical_min_value <= user_value <= key.numerical_max_value:
+                return key.points
+
         return 0.0
 
-    def _evaluate_matrix(self, answer_data):
+    def _evaluate_matrix(self, key, answer_data):
         """Evaluate matrix questions"""
         if not answer_data:
             return 0.0
-        
+
         try:
             answers = json.loads(answer_data) if isinstance(answer_data, str) else answer_data
         except:
             return 0.0
-        
-        total_cells = len(self.matrix_row_ids) * len(self.matrix_column_ids)
+
+        total_cells = len(key.matrix_cells)
         if total_cells == 0:
             return 0.0
-        
+
         correct_count = 0
-        
-        for row in self.matrix_row_ids:
-            for col in self.matrix_column_ids:
-                cell_key = f"cell_{row.id}_{col.id}"
-                expected_value = self._get_matrix_correct_value(row, col)
-                
-                if cell_key in answers and answers[cell_key] == expected_value:
-                    correct_count += 1
-        
-        return (correct_count / total_cells) * self.points
-    
-    def _evaluate_dropdown_blank(self, answer_data):
+
+        for cell_key, expected_value in key.matrix_cells.items():
+            if cell_key in answers and answers[cell_key] == expected_value:
+                correct_count += 1
+
+        return (correct_count / total_cells) * key.points
+
+    def _evaluate_dropdown_blank(self, key, answer_data):
         """Evaluate dropdown in text questions"""
         if not answer_data:
             return 0.0
-        
+
         try:
             answers = json.loads(answer_data) if isinstance(answer_data, str) else answer_data
         except:
             return 0.0
-        
-        total_blanks = len(self.blank_ids)
+
+        total_blanks = key.blank_count
         if total_blanks == 0:
             return 0.0
-        
+
         correct_count = 0
-        
+
         # Process each answer
         for entry in answers:
             if 'blank_id' not in entry or 'option_id' not in entry:
                 continue
-                
-            blank_id = entry['blank_id']
-            option_id = entry['option_id']
-            
-            # Check if the selected option is correct
-            option = self.env['quiz.option'].sudo().browse(option_id)
-            if option and option.is_correct and option.blank_id.id == blank_id:
+
+            try:
+                blank_id = int(entry['blank_id'])
+                option_id = int(entry['option_id'])
+            except (ValueError, TypeError):
+                continue
+
+            # Check if the selected option is a correct one of that blank
+            if key.correct_options.get(option_id) == blank_id:
                 correct_count += 1
-        
-        return (correct_count / total_blanks) * self.points
+
+        return (correct_count / total_blanks) * key.points
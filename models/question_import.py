@@ -0,0 +1,305 @@
+"""Question bank import
+
+A bank is a list of questions, as JSON::
+
+    [{"type": "mcq_single", "question": "<p>Capital of France?</p>", "points": 1,
+      "choices": [{"text": "Paris", "correct": true}, {"text": "Rome"}]},
+     {"type": "fill_blank", "question": "<p>{{1}} is in France</p>",
+      "blanks": [{"number": 1, "answer": "Paris"}]},
+     {"type": "match", "question": "<p>Match</p>", "pairs": [{"left": "France", "right": "Paris"}]},
+     {"type": "drag_zone", "question": "<p>Drag</p>", "tokens": [{"text": "Paris", "position": 1}]},
+     {"type": "dropdown_blank", "template": "<p>{{1}} is in France</p>",
+      "dropdowns": [{"number": 1, "options": [{"label": "Paris", "correct": true}, {"label": "Rome"}]}]},
+     {"type": "step_sequence", "question": "<p>Order</p>", "steps": [{"label": "First", "position": 0}]}]
+
+Every question may also carry a ``difficulty`` (easy, medium, hard) and
+``tags``, a list of tag names created as needed.
+
+The CSV columns are ``type, question, points, explanation, template,
+answers``, plus optionally ``difficulty`` and ``tags`` (comma separated).
+``answers`` holds the items separated by ``|``, in order; a leading
+``*`` marks a correct choice or option:
+
+================  ==============================
+mcq_*             ``*Paris|Rome|Berlin``
+fill_blank        ``Paris|Rome`` (blanks 1, 2)
+match             ``France=Paris|Italy=Rome``
+drag_text/zone    ``Paris|Rome`` (positions 1, 2)
+dropdown_blank    ``*Paris;Rome|*Rome;Milan``
+step_sequence     ``First|Second`` (positions 0, 1)
+================  ==============================
+"""
+from odoo import models, api, _
+from odoo.exceptions import UserError
+from .question_pool import DIFFICULTIES
+import csv
+import io
+import json
+import logging
+import time
+
+_logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 20
+
+
+def parse_question_bank(content, file_format):
+    """Return the questions of a JSON or CSV bank (bytes or str) as dicts"""
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    if file_format == 'json':
+        try:
+            bank = json.loads(content)
+        except ValueError as error:
+            raise UserError(_("The question bank is not valid JSON: %s", error))
+        if isinstance(bank, dict):
+            bank = bank.get('questions')
+        if not isinstance(bank, list):
+            raise UserError(_("A JSON question bank must be a list of questions."))
+        return bank
+    if file_format == 'csv':
+        return [_parse_csv_row(row) for row in csv.DictReader(io.StringIO(content))]
+    raise UserError(_("Unsupported question bank format: %s", file_format))
+
+
+def _parse_csv_row(row):
+    row = {(key or '').strip().lower(): (value or '').strip() for key, value in row.items()}
+    question = {
+        'type': row.get('type'),
+        'question': row.get('question'),
+        'explanation': row.get('explanation'),
+        'template': row.get('template'),
+    }
+    if row.get('points'):
+        question['points'] = row['points']
+    if row.get('difficulty'):
+        question['difficulty'] = row['difficulty']
+    if row.get('tags'):
+        question['tags'] = [tag.strip() for tag in row['tags'].split(',') if tag.strip()]
+    items = [item.strip() for item in row.get('answers', '').split('|') if item.strip()]
+    question_type = question['type']
+    if question_type in ('mcq_single', 'mcq_multiple'):
+        question['choices'] = [_marked(item, 'text') for item in items]
+    elif question_type == 'fill_blank':
+        question['blanks'] = [{'number': number, 'answer': item} for number, item in enumerate(items, 1)]
+    elif question_type == 'match':
+        question['pairs'] = [dict(zip(('left', 'right'), (side.strip() for side in item.split('=', 1))))
+                             for item in items]
+    elif question_type in ('drag_text', 'drag_zone'):
+        question['tokens'] = [{'text': item, 'position': position} for position, item in enumerate(items, 1)]
+    elif question_type == 'dropdown_blank':
+        question['dropdowns'] = [{
+            'number': number,
+            'options': [_marked(option.strip(), 'label') for option in item.split(';') if option.strip()],
+        } for number, item in enumerate(items, 1)]
+    elif question_type == 'step_sequence':
+        question['steps'] = [{'label': item, 'position': position} for position, item in enumerate(items)]
+    return question
+
+
+def _marked(item, name):
+    return {name: item.lstrip('*').strip(), 'correct': item.startswith('*')}
+
+
+def _unique(values):
+    """Whether ``values`` are distinct integers"""
+    try:
+        numbers = [int(value) for value in values]
+    except (ValueError, TypeError):
+        return False
+    return len(set(numbers)) == len(numbers)
+
+
+def validate_question(question, question_types):
+    """Return the problems of one question dict (empty when it can be imported)"""
+    if not isinstance(question, dict):
+        return [_("not an object")]
+    question_type = question.get('type')
+    if question_type not in question_types:
+        return [_("unknown type %r", question_type)]
+    errors = []
+    try:
+        float(question.get('points') or 0.0)
+    except (ValueError, TypeError):
+        errors.append(_("points must be a number"))
+    if question.get('difficulty') and question['difficulty'] not in dict(DIFFICULTIES):
+        errors.append(_("unknown difficulty %r", question['difficulty']))
+    tags = question.get('tags') or []
+    if not isinstance(tags, list) or not all(isinstance(tag, str) and tag.strip() for tag in tags):
+        errors.append(_("tags must be a list of names"))
+
+    if question_type == 'dropdown_blank':
+        if not question.get('template'):
+            errors.append(_("a template is required"))
+    elif question_type != 'step_sequence' and not question.get('question'):
+        errors.append(_("the question text is required"))
+
+    if question_type in ('mcq_single', 'mcq_multiple'):
+        choices = question.get('choices') or []
+        if not choices:
+            errors.append(_("choices are required"))
+        elif not all(isinstance(choice, dict) and choice.get('text') for choice in choices):
+            errors.append(_("every choice needs a text"))
+        elif question_type == 'mcq_single' and sum(bool(choice.get('correct')) for choice in choices) != 1:
+            errors.append(_("exactly one choice must be correct"))
+        elif not any(choice.get('correct') for choice in choices):
+            errors.append(_("at least one choice must be correct"))
+    elif question_type == 'fill_blank':
+        blanks = question.get('blanks') or []
+        if not blanks:
+            errors.append(_("blank answers are required"))
+        elif not all(isinstance(blank, dict) and blank.get('number') and blank.get('answer') for blank in blanks):
+            errors.append(_("every blank needs a number and an answer"))
+        elif not _unique([blank['number'] for blank in blanks]):
+            errors.append(_("blank numbers must be unique integers"))
+    elif question_type == 'match':
+        pairs = question.get('pairs') or []
+        if not pairs:
+            errors.append(_("match pairs are required"))
+        elif not all(isinstance(pair, dict) and pair.get('left') and pair.get('right') for pair in pairs):
+            errors.append(_("every pair needs a left and a right item"))
+    elif question_type in ('drag_text', 'drag_zone'):
+        tokens = question.get('tokens') or []
+        if not tokens:
+            errors.append(_("tokens are required"))
+        elif not all(isinstance(token, dict) and token.get('text') for token in tokens):
+            errors.append(_("every token needs a text"))
+        elif not _unique([token.get('position') or 0 for token in tokens]):
+            errors.append(_("token positions must be unique integers"))
+    elif question_type == 'dropdown_blank':
+        dropdowns = question.get('dropdowns') or []
+        if not dropdowns:
+            errors.append(_("dropdown blanks are required"))
+        elif not all(isinstance(dropdown, dict) and dropdown.get('number') and dropdown.get('options')
+                     for dropdown in dropdowns):
+            errors.append(_("every dropdown blank needs a number and options"))
+        elif not _unique([dropdown['number'] for dropdown in dropdowns]):
+            errors.append(_("dropdown blank numbers must be unique integers"))
+        elif not all(isinstance(option, dict) and option.get('label')
+                     for dropdown in dropdowns for option in dropdown['options']):
+            errors.append(_("every option needs a label"))
+        elif any(sum(1 for option in dropdown['options'] if option.get('correct')) > 1 for dropdown in dropdowns):
+            errors.append(_("a dropdown blank can have only one correct option"))
+    elif question_type == 'step_sequence':
+        steps = question.get('steps') or []
+        if not steps:
+            errors.append(_("sequence steps are required"))
+        elif not all(isinstance(step, dict) and step.get('label') for step in steps):
+            errors.append(_("every step needs a label"))
+        elif not _unique([step.get('position', index) for index, step in enumerate(steps)]):
+            errors.append(_("step positions must be unique integers"))
+    return errors
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    def action_open_question_import(self):
+        self.ensure_one()
+        action = self.env['ir.actions.act_window']._for_xml_id('quiz_engine_pro.action_question_import')
+        action['context'] = {'default_quiz_id': self.id}
+        return action
+
+    def _question_vals(self, question, sequence, tag_ids):
+        """Translate a validated bank question into quiz.question create values"""
+        question_type = question['type']
+        vals = {
+            'quiz_id': self.id,
+            'sequence': question.get('sequence', sequence),
+            'type': question_type,
+            'question_html': question.get('question') or question.get('template'),
+            'explanation': question.get('explanation') or False,
+            'points': float(question.get('points') or 1.0),
+            'difficulty': question.get('difficulty') or False,
+        }
+        if question.get('tags'):
+            vals['tag_ids'] = [(6, 0, [tag_ids[tag.strip()] for tag in question['tags']])]
+        if question_type in ('mcq_single', 'mcq_multiple'):
+            vals['choice_ids'] = [(0, 0, {
+                'sequence': index, 'text': choice['text'], 'is_correct': bool(choice.get('correct')),
+            }) for index, choice in enumerate(question['choices'])]
+        elif question_type == 'fill_blank':
+            vals['fill_blank_answer_ids'] = [(0, 0, {
+                'sequence': index, 'blank_number': int(blank['number']), 'answer_text': blank['answer'],
+            }) for index, blank in enumerate(question['blanks'])]
+        elif question_type == 'match':
+            vals['match_pair_ids'] = [(0, 0, {
+                'sequence': index, 'left_text': pair['left'], 'right_text': pair['right'],
+            }) for index, pair in enumerate(question['pairs'])]
+        elif question_type in ('drag_text', 'drag_zone'):
+            vals['drag_token_ids'] = [(0, 0, {
+                'sequence': index, 'text': token['text'], 'is_correct': True,
+                'correct_position': int(token.get('position') or 0),
+            }) for index, token in enumerate(question['tokens'])]
+        elif question_type == 'dropdown_blank':
+            vals['text_template'] = question['template']
+            vals['blank_ids'] = [(0, 0, {
+                'blank_number': int(dropdown['number']),
+                'option_ids': [(0, 0, {
+                    'sequence': index, 'label': option['label'], 'is_correct': bool(option.get('correct')),
+                }) for index, option in enumerate(dropdown['options'])],
+            }) for dropdown in question['dropdowns']]
+        elif question_type == 'step_sequence':
+            vals['sequence_item_ids'] = [(0, 0, {
+                'sequence': index, 'label': step['label'], 'content': step.get('content') or False,
+                'correct_position': int(step.get('position', index)),
+            }) for index, step in enumerate(question['steps'])]
+        return vals
+
+    def _import_question_bank(self, questions, chunk_size=IMPORT_CHUNK_SIZE, progress=None):
+        """Append the questions of a parsed bank to this quiz
+
+        Every question is validated before anything is written; then they
+        are created ``chunk_size`` at a time. Within a chunk the ORM
+        creates the choices, blanks, options, pairs, tokens and steps of
+        all its questions with one batched ``create`` per model.
+        ``progress(done, total)`` is called after each chunk.
+        """
+        self.ensure_one()
+        question_types = dict(self.env['quiz.question']._fields['type'].selection)
+        errors = []
+        for number, question in enumerate(questions, 1):
+            errors.extend(_("Question %(number)s: %(error)s", number=number, error=error)
+                          for error in validate_question(question, question_types))
+        if errors:
+            more = len(errors) - MAX_REPORTED_ERRORS
+            raise UserError('\n'.join(errors[:MAX_REPORTED_ERRORS]
+                                      + ([_("... and %s more", more)] if more > 0 else [])))
+
+        start = time.perf_counter()
+        tag_ids = self._get_import_tag_ids(
+            {tag.strip() for question in questions for tag in question.get('tags') or []})
+        Question = self.env['quiz.question']
+        sequence = max(self.question_ids.mapped('sequence'), default=0) + 1
+        created = Question
+        for offset in range(0, len(questions), chunk_size):
+            chunk = questions[offset:offset + chunk_size]
+            created |= Question.create([
+                self._question_vals(question, sequence + offset + index, tag_ids)
+                for index, question in enumerate(chunk)
+            ])
+            done = offset + len(chunk)
+            _logger.info("Imported %s/%s questions into quiz %s", done, len(questions), self.id)
+            if progress:
+                progress(done, len(questions))
+        _logger.info("Imported %s questions into quiz %s in %.1fs",
+                     len(questions), self.id, time.perf_counter() - start)
+        return created
+
+    @api.model
+    def _get_import_tag_ids(self, names):
+        """Map tag names to ids, creating the missing tags in one batch"""
+        if not names:
+            return {}
+        Tag = self.env['quiz.question.tag']
+        tag_ids = {tag.name: tag.id for tag in Tag.search([('name', 'in', list(names))])}
+        missing = sorted(names - set(tag_ids))
+        tag_ids.update({tag.name: tag.id for tag in Tag.create([{'name': name} for name in missing])})
+        return tag_ids
+
+    @api.model
+    def _import_question_bank_file(self, quiz_id, content, file_format, chunk_size=IMPORT_CHUNK_SIZE):
+        """Python API: import a JSON or CSV bank (bytes or str) into a quiz"""
+        return self.browse(quiz_id)._import_question_bank(
+            parse_question_bank(content, file_format), chunk_size=chunk_size)
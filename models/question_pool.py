@@ -0,0 +1,116 @@
+from odoo import models, fields, api, tools
+from collections import namedtuple
+from types import MappingProxyType
+
+DIFFICULTIES = [
+    ('easy', 'Easy'),
+    ('medium', 'Medium'),
+    ('hard', 'Hard'),
+]
+
+# Questions a pool rule draws from: ids sorted, and the points of each
+PoolMembers = namedtuple('PoolMembers', ['question_ids', 'points'])
+
+
+class QuestionTag(models.Model):
+    _name = 'quiz.question.tag'
+    _inherit = ['quiz.answer.key.mixin']
+    _description = 'Question Tag'
+    _order = 'name'
+
+    name = fields.Char(string='Name', required=True)
+    color = fields.Integer(string='Color')
+
+    _sql_constraints = [
+        ('name_unique', 'UNIQUE(name)', 'Tag names must be unique.'),
+    ]
+
+    def _get_cached_question_ids(self):
+        # Tags select the members of pool rules
+        return None
+
+
+class QuizQuestion(models.Model):
+    _inherit = 'quiz.question'
+
+    tag_ids = fields.Many2many('quiz.question.tag', 'quiz_question_tag_rel', 'question_id', 'tag_id',
+                               string='Tags')
+    difficulty = fields.Selection(DIFFICULTIES, string='Difficulty', index=True)
+
+
+class QuizPoolRule(models.Model):
+    """Draw ``question_count`` questions of a pool for every session
+
+    The pool is every question having one of the tags (all questions
+    without tags) and the difficulty (any without one), optionally only
+    from the questions of a question bank quiz.
+    """
+    _name = 'quiz.pool.rule'
+    _inherit = ['quiz.answer.key.mixin']
+    _description = 'Quiz Question Pool Rule'
+    _order = 'sequence, id'
+
+    sequence = fields.Integer(string='Sequence', default=10)
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', required=True, ondelete='cascade', index=True)
+    bank_quiz_id = fields.Many2one('quiz.quiz', string='Question Bank', ondelete='cascade',
+                                   help='Only draw questions of this quiz; empty draws from every quiz')
+    tag_ids = fields.Many2many('quiz.question.tag', 'quiz_pool_rule_tag_rel', 'rule_id', 'tag_id',
+                               string='Tags')
+    difficulty = fields.Selection(DIFFICULTIES, string='Difficulty')
+    question_count = fields.Integer(string='Questions to Draw', default=1, required=True)
+    available_count = fields.Integer(string='Questions in Pool', compute='_compute_available_count')
+
+    _sql_constraints = [
+        ('question_count_positive', 'CHECK(question_count > 0)', 'A rule must draw at least one question.'),
+    ]
+
+    def _get_cached_question_ids(self):
+        return None
+
+    def _compute_available_count(self):
+        for rule in self:
+            rule.available_count = len(self._get_members(rule.id).question_ids) if rule.id else 0
+
+    @api.model
+    @tools.ormcache('rule_id')
+    def _get_members(self, rule_id):
+        """Return the PoolMembers of a rule (cached per worker)
+
+        This is the sampling index: built with one query, then every draw
+        only picks positions in it.
+        """
+        rule = self.sudo().browse(rule_id)
+        domain = []
+        if rule.bank_quiz_id:
+            domain.append(('quiz_id', '=', rule.bank_quiz_id.id))
+        if rule.difficulty:
+            domain.append(('difficulty', '=', rule.difficulty))
+        if rule.tag_ids:
+            domain.append(('tag_ids', 'in', rule.tag_ids.ids))
+        questions = self.env['quiz.question'].sudo().search_fetch(domain, ['points'], order='id')
+        return PoolMembers(
+            question_ids=tuple(questions.ids),
+            points=MappingProxyType({question.id: question.points for question in questions}),
+        )
+
+    @api.model
+    def _draw(self, rules, rng):
+        """Draw the questions of ``rules`` (``(rule id, count)`` pairs)
+
+        Returns the drawn question ids, in rule order, and their total
+        points. Sampling is O(drawn questions) whatever the pool sizes; a
+        question matching several rules is drawn at most once.
+        """
+        drawn = []
+        seen = set()
+        total_points = 0.0
+        for rule_id, count in rules:
+            members = self._get_members(rule_id)
+            # Over-draw by the questions already taken, then skip those
+            sample_size = min(len(members.question_ids), count + len(seen))
+            picked = [question_id for question_id in rng.sample(members.question_ids, sample_size)
+                      if question_id not in seen][:count]
+            seen.update(picked)
+            drawn.extend(picked)
+            total_points += sum(members.points[question_id] for question_id in picked)
+        return drawn, total_points
@@ -0,0 +1,99 @@
+from odoo import models, tools
+
+# Question types whose answer area is pre-rendered once per question and
+# language; everything session specific stays in quiz_question.
+FRAGMENT_TEMPLATES = {
+    'drag_zone': 'quiz_engine_pro.question_fragment_drag_zone',
+    'drag_into_text': 'quiz_engine_pro.question_fragment_drag_into_text',
+    'match': 'quiz_engine_pro.question_fragment_match',
+    'dropdown_blank': 'quiz_engine_pro.question_fragment_dropdown_blank',
+}
+
+
+class QuestionRender(models.Model):
+    _inherit = 'quiz.question'
+
+    @tools.ormcache('question_id', 'self._get_cache_version(question_id)')
+    def _get_render_segments(self, question_id):
+        """Compile the text template of a dropdown question into segments
+
+        Segments are ``('text', text)``, ``('blank', number, blank_id, options)``
+        with options as ``(option_id, label)`` pairs, or ``('missing', number)``
+        for placeholders without a matching blank.
+        """
+        question = self.sudo().browse(question_id)
+        blanks = {blank.blank_number: blank for blank in question.blank_ids}
+
+        template_text = (question.text_template or '').replace('<p>', '').replace('</p>', '')
+        parts = template_text.split('{{')
+        segments = [('text', parts[0])]
+        for part in parts[1:]:
+            blank_parts = part.split('}}', 1)
+            if len(blank_parts) != 2:
+                continue
+            try:
+                blank_number = int(blank_parts[0])
+            except ValueError:
+                segments.append(('text', '{{' + part))
+                continue
+            blank = blanks.get(blank_number)
+            if blank:
+                options = tuple((option.id, option.label) for option in blank.option_ids)
+                segments.append(('blank', blank_number, blank.id, options))
+            else:
+                segments.append(('missing', blank_number))
+            segments.append(('text', blank_parts[1]))
+        return tuple(segments)
+
+    @tools.ormcache('question_id', 'self._get_cache_version(question_id)', 'self.env.lang', cache='templates')
+    def _get_rendered_fragment(self, question_id):
+        """Render the static answer area of a question (cached per language)"""
+        question = self.sudo().browse(question_id)
+        template = FRAGMENT_TEMPLATES.get(question.type)
+        if not template:
+            return None
+
+        values = {'question': question}
+        if question.type == 'dropdown_blank':
+            values['segments'] = self._get_render_segments(question_id)
+        elif question.type == 'drag_into_text':
+            positions = set(question.drag_token_ids.mapped('correct_position'))
+            values['drop_zone_numbers'] = sorted(number for number in positions if number > 0)
+        return self.env['ir.qweb']._render(template, values)
+
+    def _get_payload_data(self):
+        """Single page payload entry of a question, without its answer key"""
+        self.ensure_one()
+        question = self
+        data = {
+            'id': question.id,
+            'type': question.type,
+            'question_html': str(question.question_html or ''),
+            'points': question.points,
+        }
+        if question.type in ('mcq_single', 'mcq_multiple'):
+            data['choices'] = [{'id': choice.id, 'text': choice.text} for choice in question.choice_ids]
+        elif question.type == 'fill_blank':
+            data['blanks'] = question.fill_blank_answer_ids.mapped('blank_number')
+        elif question.type == 'match':
+            data['left_items'] = [{'id': pair.id, 'text': pair.left_text} for pair in question.match_pair_ids]
+            data['right_items'] = sorted(question.match_pair_ids.mapped('right_text'))
+        elif question.type in ('drag_zone', 'drag_text', 'drag_into_text'):
+            data['tokens'] = sorted(question.drag_token_ids.mapped('text'))
+            data['zones'] = sorted(set(question.drag_token_ids.mapped('correct_position')))
+        elif question.type == 'dropdown_blank':
+            data['segments'] = question._get_render_segments(question.id)
+        elif question.type == 'matrix':
+            data['rows'] = [{'id': row.id, 'name': row.name} for row in question.matrix_row_ids]
+            data['columns'] = [{'id': col.id, 'name': col.name} for col in question.matrix_column_ids]
+        elif question.type == 'step_sequence':
+            data['steps'] = [
+                {'id': step.id, 'label': step.label, 'content': step.content or ''}
+                for step in question.sequence_item_ids.sorted('id')
+            ]
+        return data
+
+    @tools.ormcache('question_id', 'self._get_cache_version(question_id)')
+    def _get_cached_payload_data(self, question_id):
+        """Payload entry of a pool question (cached per worker, do not modify)"""
+        return self.sudo().browse(question_id)._get_payload_data()
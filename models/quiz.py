@@ -1,5 +1,19 @@
-from odoo import models, fields, api, _
-from odoo.exceptions import ValidationError
+from odoo import models, fields, api, tools, _
+from odoo.tools.sql import create_index
+from collections import namedtuple
+from types import MappingProxyType
+import hashlib
+import json
+
+# What the public routes need to know about a quiz, cached per worker
+QuizInfo = namedtuple('QuizInfo', [
+    'id', 'slug', 'published', 'question_count', 'time_limit', 'passing_score', 'delivery_mode',
+])
+# Questions and shuffling options of a quiz, cached per worker. With pool
+# rules, ``(rule id, count)`` pairs, sessions draw their questions instead.
+QuestionLayout = namedtuple('QuestionLayout', [
+    'question_ids', 'randomize_questions', 'randomize_choices', 'pool_rules', 'total_points',
+])
 
 
 class Quiz(models.Model):
@@ -11,41 +25,169 @@ class Quiz(models.Model):
     description = fields.Html(string='Description')
     slug = fields.Char(string='URL Slug', required=True, help="Used in public URL")
     published = fields.Boolean(string='Published', default=False)
-    randomize_questions = fields.Boolean(string='Randomize Questions', default=False)
+    randomize_questions = fields.Boolean(string='Randomize Questions', default=False,
+                                         help='Every session gets its own question order')
+    randomize_choices = fields.Boolean(string='Randomize Choices', default=False,
+                                       help='Every session gets its own order of multiple choice options')
     time_limit = fields.Integer(string='Time Limit (minutes)', default=0, help='0 = No time limit')
     max_attempts = fields.Integer(string='Maximum Attempts', default=1)
     show_results = fields.Boolean(string='Show Results After Completion', default=True)
     passing_score = fields.Float(string='Passing Score (%)', default=60.0)
+    delivery_mode = fields.Selection([
+        ('paged', 'One Question per Page'),
+        ('single_page', 'Single Page'),
+    ], string='Delivery Mode', default='paged', required=True,
+       help="Single Page sends the whole quiz to the browser at once and submits all answers in one request")
+    archive_after_days = fields.Integer(string='Archive Sessions After (days)', default=0,
+                                        help='Completed sessions older than this are moved to the session '
+                                             'archive. 0 = never archive')
     
     # Relationships
     question_ids = fields.One2many('quiz.question', 'quiz_id', string='Questions')
+    pool_rule_ids = fields.One2many('quiz.pool.rule', 'quiz_id', string='Question Pools',
+                                    help='When set, every session draws its questions from these pools')
     session_ids = fields.One2many('quiz.session', 'quiz_id', string='Quiz Sessions')
     
     # Computed fields
     total_questions = fields.Integer(string='Total Questions', compute='_compute_total_questions')
     total_points = fields.Float(string='Total Points', compute='_compute_total_points')
+
+    # Statistics, maintained incrementally by quiz.quiz.stats
+    stats_id = fields.Many2one('quiz.quiz.stats', string='Statistics', compute='_compute_stats_id')
+    stats_attempt_count = fields.Integer(related='stats_id.attempt_count')
+    stats_completion_count = fields.Integer(related='stats_id.completion_count')
+    stats_scored_count = fields.Integer(related='stats_id.scored_count')
+    stats_pass_count = fields.Integer(related='stats_id.pass_count')
+    stats_pass_rate = fields.Float(related='stats_id.pass_rate')
+    stats_average_score = fields.Float(related='stats_id.average_score')
+    stats_score_stddev = fields.Float(related='stats_id.score_stddev')
+    stats_bucket_ids = fields.One2many(related='stats_id.bucket_ids')
+    stats_question_ids = fields.One2many(related='stats_id.question_stat_ids')
+    stats_choice_ids = fields.One2many(related='stats_id.choice_stat_ids')
+
+    _sql_constraints = [
+        ('slug_unique', 'UNIQUE(slug)', 'URL Slug must be unique.'),
+    ]
+
+    def init(self):
+        # Public routes resolve quizzes by slug among published ones only
+        create_index(self._cr, 'quiz_quiz_published_slug_index', self._table, ['slug'], where='published')
     
-    @api.depends('question_ids')
+    @api.depends('question_ids', 'pool_rule_ids.question_count')
     def _compute_total_questions(self):
         for quiz in self:
-            quiz.total_questions = len(quiz.question_ids)
+            if quiz.pool_rule_ids:
+                quiz.total_questions = sum(quiz.pool_rule_ids.mapped('question_count'))
+            else:
+                quiz.total_questions = len(quiz.question_ids)
     
     @api.depends('question_ids.points')
     def _compute_total_points(self):
         for quiz in self:
             quiz.total_points = sum(quiz.question_ids.mapped('points'))
     
-    @api.constrains('slug')
-    def _check_slug_unique(self):
+    def _compute_stats_id(self):
+        stats = self.env['quiz.quiz.stats'].search([('quiz_id', 'in', self.ids)])
+        stats_by_quiz = {record.quiz_id.id: record for record in stats}
         for quiz in self:
-            if self.search([('slug', '=', quiz.slug), ('id', '!=', quiz.id)]):
-                raise ValidationError(_('URL Slug must be unique.'))
-    
+            quiz.stats_id = stats_by_quiz.get(quiz.id, False)
+
     @api.model
     def create(self, vals):
         if not vals.get('slug'):
             vals['slug'] = self._generate_slug(vals.get('name', ''))
-        return super().create(vals)
+        quiz = super().create(vals)
+        self.env.registry.clear_cache()
+        return quiz
+
+    def write(self, vals):
+        result = super().write(vals)
+        self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
+
+    @api.model
+    @tools.ormcache()
+    def _get_slug_ids(self):
+        """Map every quiz slug to its id (cached per worker)"""
+        return MappingProxyType({quiz.slug: quiz.id for quiz in self.sudo().search_fetch([], ['slug'])})
+
+    @api.model
+    def _get_quiz_info(self, slug):
+        """Resolve a slug to a QuizInfo, or None
+
+        Unknown slugs are answered from the slug map, so requests for random
+        slugs neither query the database nor take room in the cache.
+        """
+        quiz_id = self._get_slug_ids().get(slug)
+        return self._get_quiz_info_by_id(quiz_id) if quiz_id else None
+
+    @api.model
+    @tools.ormcache('quiz_id')
+    def _get_quiz_info_by_id(self, quiz_id):
+        """Return the QuizInfo of an existing quiz (cached per worker)"""
+        quiz = self.sudo().browse(quiz_id)
+        return QuizInfo(
+            id=quiz.id,
+            slug=quiz.slug,
+            published=quiz.published,
+            question_count=quiz.total_questions,
+            time_limit=quiz.time_limit,
+            passing_score=quiz.passing_score,
+            delivery_mode=quiz.delivery_mode,
+        )
+
+    @api.model
+    @tools.ormcache('quiz_id')
+    def _get_question_layout(self, quiz_id):
+        """Return the QuestionLayout of a quiz (cached per worker)"""
+        quiz = self.sudo().browse(quiz_id)
+        return QuestionLayout(
+            question_ids=tuple(quiz.question_ids.ids),
+            randomize_questions=quiz.randomize_questions,
+            randomize_choices=quiz.randomize_choices,
+            pool_rules=tuple((rule.id, rule.question_count) for rule in quiz.pool_rule_ids),
+            total_points=quiz.total_points,
+        )
+
+    @api.model
+    @tools.ormcache()
+    def _get_published_quiz_ids(self):
+        """Ids of the published quizzes, in list order (cached per worker)"""
+        return tuple(self.sudo().search([('published', '=', True)]).ids)
+
+    @api.model
+    @tools.ormcache('quiz_ids')
+    def _get_public_page_version(self, quiz_ids):
+        """Return ``(last modified, version)`` of a public page showing ``quiz_ids`` (cached per worker)
+
+        The last modification is the latest write on the quizzes, their
+        questions and pool rules. The version also changes when one of them
+        is deleted, so it is the validator of the page.
+
+        Of the questions, these pages only show how many there are and their
+        points, so the cached value is only dropped by changes of the quizzes
+        and pool rules and by structural question changes (see
+        STRUCTURAL_FIELDS in question_evaluation.py). Editing the text or
+        answers of a question leaves the validator unchanged.
+        """
+        self.env['quiz.quiz'].flush_model(['write_date'])
+        self.env['quiz.question'].flush_model(['quiz_id', 'write_date'])
+        self.env['quiz.pool.rule'].flush_model(['quiz_id', 'write_date'])
+        self.env.cr.execute("""
+            SELECT GREATEST((SELECT MAX(write_date) FROM quiz_quiz WHERE id = ANY(%(ids)s)),
+                            (SELECT MAX(write_date) FROM quiz_question WHERE quiz_id = ANY(%(ids)s)),
+                            (SELECT MAX(write_date) FROM quiz_pool_rule WHERE quiz_id = ANY(%(ids)s))),
+                   (SELECT COUNT(*) FROM quiz_question WHERE quiz_id = ANY(%(ids)s)),
+                   (SELECT COUNT(*) FROM quiz_pool_rule WHERE quiz_id = ANY(%(ids)s))
+        """, {'ids': list(quiz_ids)})
+        last_modified, question_count, rule_count = self.env.cr.fetchone()
+        version = hashlib.sha1(repr((quiz_ids, last_modified, question_count, rule_count)).encode()).hexdigest()[:20]
+        return last_modified, version
     
     def _generate_slug(self, name):
         """Generate URL-friendly slug from name"""
@@ -54,6 +196,74 @@ class Quiz(models.Model):
         slug = re.sub(r'[-\s]+', '-', slug)
         return slug.strip('-')
 
+    @api.model
+    def _get_content_versions(self, quiz_id):
+        """Cache versions of the questions of a quiz, in order"""
+        question_ids = self._get_question_layout(quiz_id).question_ids
+        return tuple(self.env['quiz.question'].sudo().browse(question_ids).mapped('cache_version'))
+
+    @api.model
+    @tools.ormcache('quiz_id', 'self._get_content_versions(quiz_id)')
+    def _get_single_page_payload(self, quiz_id):
+        """JSON payload of a whole quiz for single page delivery (cached per worker)
+
+        Holds everything needed to render the questions in the browser but
+        none of the answer keys.
+        """
+        quiz = self.sudo().browse(quiz_id)
+        questions = [question._get_payload_data() for question in quiz.question_ids]
+
+        return json.dumps({
+            'quiz': {
+                'id': quiz.id,
+                'name': quiz.name,
+                'time_limit': quiz.time_limit,
+            },
+            'questions': questions,
+        })
+
+    def _get_result_questions(self):
+        """Questions answered in the sessions of the quiz
+
+        The questions of the quiz itself or, for quizzes drawing from pools,
+        every question drawn for one of its sessions.
+        """
+        self.ensure_one()
+        if not self.pool_rule_ids:
+            return self.question_ids
+        self.env['quiz.response'].flush_model(['session_id', 'question_id'])
+        self.env.cr.execute("""
+            SELECT DISTINCT response.question_id
+              FROM quiz_response response
+              JOIN quiz_session session ON session.id = response.session_id
+             WHERE session.quiz_id = %s
+        """, [self.id])
+        return self.env['quiz.question'].search([('id', 'in', [row[0] for row in self.env.cr.fetchall()])])
+
+    def action_rescore_responses(self):
+        """Rescore all responses of the quiz in one batch per question"""
+        for quiz in self:
+            quiz._get_result_questions().score_responses()
+        self.env['quiz.quiz.stats'].rebuild(self)
+        return True
+
+    def action_rebuild_stats(self):
+        """Recompute the quiz statistics from the stored sessions"""
+        self.env['quiz.quiz.stats'].rebuild(self)
+        return True
+
+    def action_export_results(self, export_format='csv'):
+        """Download every session of the quiz through the streaming export"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/quiz/export/{self.id}?format={export_format}',
+            'target': 'self',
+        }
+
+    def action_export_results_xlsx(self):
+        return self.action_export_results('xlsx')
+
     def action_view_public_url(self):
         """Open the public quiz URL in a new tab"""
         base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
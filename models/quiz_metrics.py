@@ -0,0 +1,195 @@
+from odoo import models, api, tools
+from odoo.http import request
+import functools
+import os
+import threading
+import time
+
+# Latency, query and size buckets shared by every histogram of a kind
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+ROWS_BUCKETS = (1, 10, 50, 100, 500, 1000, 5000, 10000)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a label value"""
+
+    def __init__(self, name, help_text, label, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, label_value, value):
+        series = self.series.get(label_value)
+        if series is None:
+            series = self.series.setdefault(label_value, [[0] * len(self.buckets), 0.0, 0])
+        counts = series[0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        series[1] += value
+        series[2] += 1
+
+    def render(self, worker_label):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for label_value, (counts, total, count) in sorted(self.series.items()):
+            label = f'{worker_label},{self.label}="{label_value}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{label}}} {total}')
+            lines.append(f'{self.name}_count{{{label}}} {count}')
+        return lines
+
+
+class Counter:
+    """Monotonic counter keyed by a label value"""
+
+    def __init__(self, name, help_text, label):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.series = {}
+
+    def increment(self, label_value, value):
+        self.series[label_value] = self.series.get(label_value, 0) + value
+
+    def render(self, worker_label):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for label_value, total in sorted(self.series.items()):
+            lines.append(f'{self.name}{{{worker_label},{self.label}="{label_value}"}} {total}')
+        return lines
+
+
+class MetricsRegistry:
+    """In-process metrics of this worker (each worker reports its own)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {
+            'route_seconds': Histogram('quiz_route_duration_seconds', 'Wall time of quiz routes',
+                                       'route', SECONDS_BUCKETS),
+            'route_queries': Histogram('quiz_route_sql_queries', 'SQL queries per quiz route request',
+                                       'route', QUERY_BUCKETS),
+            'route_sql_seconds': Histogram('quiz_route_sql_duration_seconds', 'SQL time per quiz route request',
+                                           'route', SECONDS_BUCKETS),
+            'route_render_seconds': Histogram('quiz_route_render_duration_seconds', 'QWeb render time of quiz routes',
+                                              'route', SECONDS_BUCKETS),
+            'route_bytes': Histogram('quiz_route_response_bytes', 'Response payload size of quiz routes',
+                                     'route', BYTES_BUCKETS),
+            'evaluator_seconds': Histogram('quiz_evaluator_duration_seconds', 'Time spent scoring one answer (one in EVALUATION_SAMPLE_RATE is timed)',
+                                           'question_type', SECONDS_BUCKETS),
+            'evaluator_batch_seconds': Histogram('quiz_evaluator_batch_duration_seconds',
+                                                 'Time spent scoring a batch of answers to one question',
+                                                 'question_type', SECONDS_BUCKETS),
+            'autosave_flush_interval': Histogram('quiz_autosave_flush_interval_seconds',
+                                                 'Age of the oldest buffered autosave when its buffer is flushed',
+                                                 'trigger', SECONDS_BUCKETS),
+            'autosave_flush_rows': Histogram('quiz_autosave_flush_rows', 'Rows upserted per autosave flush',
+                                             'trigger', ROWS_BUCKETS),
+            'autosave_flush_seconds': Histogram('quiz_autosave_flush_duration_seconds',
+                                                'Time spent writing one autosave flush', 'trigger', SECONDS_BUCKETS),
+        }
+        self.counters = {
+            'autosave_saves': Counter('quiz_autosave_saves_total', 'Autosave requests buffered', 'db'),
+            'autosave_rows': Counter('quiz_autosave_rows_written_total', 'Autosave rows written to the database',
+                                     'db'),
+        }
+
+    def observe(self, values):
+        """Record ``{histogram key: (label value, value)}`` at once"""
+        with self.lock:
+            for key, (label_value, value) in values.items():
+                self.histograms[key].observe(label_value, value)
+
+    def increment(self, values):
+        """Add ``{counter key: (label value, value)}`` at once"""
+        with self.lock:
+            for key, (label_value, value) in values.items():
+                self.counters[key].increment(label_value, value)
+
+    def render(self):
+        """Prometheus text of this worker, every series labelled with its pid
+
+        In prefork mode each scrape reaches one worker; the label keeps the
+        series of the workers apart, so none appears to go backwards.
+        """
+        worker_label = f'worker="{os.getpid()}"'
+        with self.lock:
+            lines = []
+            for metric in list(self.histograms.values()) + list(self.counters.values()):
+                lines.extend(metric.render(worker_label))
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = MetricsRegistry()
+
+
+def _thread_sql_counters():
+    # Odoo's cursors add up the queries of the current request on its thread
+    thread = threading.current_thread()
+    return getattr(thread, 'query_count', 0), getattr(thread, 'query_time', 0.0)
+
+
+def instrument_route(name):
+    """Record wall time, SQL, render time and payload size of a controller route
+
+    Lazy QWeb responses are rendered inside the measurement so the render
+    time is known; Odoo does not render them a second time.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not request.env['quiz.metrics']._is_enabled():
+                return method(self, *args, **kwargs)
+
+            query_count, query_time = _thread_sql_counters()
+            start = time.perf_counter()
+            response = method(self, *args, **kwargs)
+            render_seconds = 0.0
+            if getattr(response, 'is_qweb', False):
+                render_start = time.perf_counter()
+                response.flatten()
+                render_seconds = time.perf_counter() - render_start
+            elapsed = time.perf_counter() - start
+            end_count, end_time = _thread_sql_counters()
+
+            values = {
+                'route_seconds': (name, elapsed),
+                'route_queries': (name, end_count - query_count),
+                'route_sql_seconds': (name, end_time - query_time),
+                'route_render_seconds': (name, render_seconds),
+            }
+            # Only buffered bodies: measuring a stream would consume it
+            if getattr(response, 'is_sequence', False):
+                values['route_bytes'] = (name, response.calculate_content_length() or 0)
+            METRICS.observe(values)
+            return response
+        return wrapper
+    return decorator
+
+
+class QuizMetrics(models.AbstractModel):
+    _name = 'quiz.metrics'
+    _description = 'Quiz Instrumentation'
+
+    @api.model
+    @tools.ormcache()
+    def _is_enabled(self):
+        """Whether instrumentation is on (system parameter quiz_engine_pro.metrics_enabled)"""
+        value = self.env['ir.config_parameter'].sudo().get_param('quiz_engine_pro.metrics_enabled', 'False')
+        return value.lower() in ('1', 'true', 'yes')
+
+    @api.model
+    def _observe_evaluation(self, question_type, seconds, batch=False):
+        METRICS.observe({'evaluator_batch_seconds' if batch else 'evaluator_seconds': (question_type, seconds)})
+
+    @api.model
+    def _render_prometheus(self):
+        return METRICS.render()
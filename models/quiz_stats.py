@@ -0,0 +1,402 @@
+from odoo import models, fields, api, _
+from collections import Counter, defaultdict
+import logging
+import math
+
+from .answer_data import decode_legacy_answer
+
+_logger = logging.getLogger(__name__)
+
+# Score histogram over the session percentage, in fixed 10% wide buckets
+HISTOGRAM_BUCKETS = 10
+
+
+class QuizStats(models.Model):
+    """Running counters of a quiz, updated incrementally as sessions finish"""
+    _name = 'quiz.quiz.stats'
+    _description = 'Quiz Statistics'
+
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', required=True, ondelete='cascade')
+    attempt_count = fields.Integer(string='Attempts', readonly=True)
+    completion_count = fields.Integer(string='Completions', readonly=True)
+    scored_count = fields.Integer(string='Scored Sessions', readonly=True)
+    pass_count = fields.Integer(string='Passed', readonly=True)
+    score_sum = fields.Float(string='Sum of Scores', readonly=True)
+    score_sq_sum = fields.Float(string='Sum of Squared Scores', readonly=True)
+
+    average_score = fields.Float(string='Average Score', compute='_compute_aggregates')
+    score_stddev = fields.Float(string='Score Std. Deviation', compute='_compute_aggregates')
+    pass_rate = fields.Float(string='Pass Rate (%)', compute='_compute_aggregates')
+
+    bucket_ids = fields.One2many('quiz.quiz.stats.bucket', 'stats_id', string='Score Histogram')
+    question_stat_ids = fields.One2many('quiz.quiz.stats.question', 'stats_id', string='Question Statistics')
+    choice_stat_ids = fields.One2many('quiz.quiz.stats.choice', 'stats_id', string='Choice Statistics')
+
+    _sql_constraints = [
+        ('quiz_unique', 'UNIQUE(quiz_id)', 'A quiz has a single statistics record.'),
+    ]
+
+    @api.depends('scored_count', 'pass_count', 'score_sum', 'score_sq_sum')
+    def _compute_aggregates(self):
+        for stats in self:
+            count = stats.scored_count
+            if not count:
+                stats.average_score = stats.score_stddev = stats.pass_rate = 0.0
+                continue
+            mean = stats.score_sum / count
+            stats.average_score = mean
+            stats.score_stddev = math.sqrt(max(stats.score_sq_sum / count - mean * mean, 0.0))
+            stats.pass_rate = stats.pass_count / count * 100
+
+    @api.model
+    def _get_stats_ids(self, quiz_ids):
+        """Return {quiz_id: stats_id}, creating missing statistics rows"""
+        self.env.cr.execute("""
+            INSERT INTO quiz_quiz_stats (quiz_id, attempt_count, completion_count, scored_count,
+                                         pass_count, score_sum, score_sq_sum, create_date, write_date)
+                 SELECT quiz_id, 0, 0, 0, 0, 0, 0, now() at time zone 'UTC', now() at time zone 'UTC'
+                   FROM unnest(%s::int[]) AS quiz_id
+            ON CONFLICT (quiz_id) DO NOTHING
+        """, [list(quiz_ids)])
+        self.env.cr.execute("SELECT quiz_id, id FROM quiz_quiz_stats WHERE quiz_id = ANY(%s)", [list(quiz_ids)])
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _increment(self, field_name, quiz_counts):
+        """Atomically add {quiz_id: count} to a counter column"""
+        assert field_name in ('attempt_count', 'completion_count')
+        if not quiz_counts:
+            return
+        self._get_stats_ids(quiz_counts)
+        self.env.cr.execute(f"""
+            UPDATE quiz_quiz_stats
+               SET {field_name} = {field_name} + delta.count,
+                   write_date = now() at time zone 'UTC'
+              FROM unnest(%s::int[], %s::int[]) AS delta(quiz_id, count)
+             WHERE quiz_quiz_stats.quiz_id = delta.quiz_id
+        """, [list(quiz_counts), list(quiz_counts.values())])
+        self.invalidate_model([field_name])
+
+    @api.model
+    def _record_session_counts(self, limit=10000):
+        """Count new sessions as attempts and newly completed ones as completions
+
+        Runs in the scoring cron, so the start and finish requests of
+        students never wait on the statistics row of their quiz. Sessions
+        locked by a request are left for the next run.
+        """
+        self.env['quiz.session'].flush_model(['state', 'counted_as'])
+        self.env.cr.execute("""
+            WITH uncounted AS (
+                SELECT id, quiz_id, counted_as
+                  FROM quiz_session
+                 WHERE counted_as IS NULL
+                    OR (counted_as = 'attempt' AND state = 'completed')
+                 LIMIT %s
+                   FOR NO KEY UPDATE SKIP LOCKED
+            )
+            UPDATE quiz_session session
+               SET counted_as = CASE WHEN session.state = 'completed' THEN 'completion' ELSE 'attempt' END
+              FROM uncounted
+             WHERE session.id = uncounted.id
+         RETURNING uncounted.quiz_id, uncounted.counted_as IS NULL, session.state = 'completed'
+        """, [limit])
+        attempts = Counter()
+        completions = Counter()
+        for quiz_id, is_new, is_completed in self.env.cr.fetchall():
+            attempts[quiz_id] += is_new
+            completions[quiz_id] += is_completed
+        self.env['quiz.session'].invalidate_model(['counted_as'])
+        self._increment('attempt_count', +attempts)
+        self._increment('completion_count', +completions)
+        return sum(attempts.values()) + sum(completions.values())
+
+    @api.model
+    def _record_scored_sessions(self, sessions):
+        """Fold newly scored sessions into the counters of their quizzes"""
+        if not sessions:
+            return
+        sessions.flush_recordset(['quiz_id', 'total_score', 'percentage', 'passed'])
+        stats_ids = self._get_stats_ids(set(sessions.quiz_id.ids))
+        self._add_session_totals(stats_ids, [
+            (session.quiz_id.id, session.total_score, session.percentage, session.passed) for session in sessions
+        ])
+
+        self.env['quiz.response'].flush_model(['session_id', 'question_id', 'is_correct', 'answer_data'])
+        self.env.cr.execute("""
+            INSERT INTO quiz_quiz_stats_question (stats_id, question_id, answer_count, correct_count,
+                                                  create_date, write_date)
+                 SELECT stats.id, response.question_id, COUNT(*), COUNT(*) FILTER (WHERE response.is_correct),
+                        now() at time zone 'UTC', now() at time zone 'UTC'
+                   FROM quiz_response response
+                   JOIN quiz_session session ON session.id = response.session_id
+                   JOIN quiz_quiz_stats stats ON stats.quiz_id = session.quiz_id
+                  WHERE response.session_id IN %s
+               GROUP BY stats.id, response.question_id
+            ON CONFLICT (stats_id, question_id)
+              DO UPDATE SET answer_count = quiz_quiz_stats_question.answer_count + EXCLUDED.answer_count,
+                            correct_count = quiz_quiz_stats_question.correct_count + EXCLUDED.correct_count
+        """, [tuple(sessions.ids)])
+
+        # Canonical MCQ answers are a choice id or a list of them: both
+        # contain to_jsonb(choice.id), so the counting stays in Postgres
+        self.env.cr.execute("""
+            INSERT INTO quiz_quiz_stats_choice (stats_id, question_id, choice_id, selection_count,
+                                                create_date, write_date)
+                 SELECT stats.id, choice.question_id, choice.id, COUNT(*),
+                        now() at time zone 'UTC', now() at time zone 'UTC'
+                   FROM quiz_response response
+                   JOIN quiz_session session ON session.id = response.session_id
+                   JOIN quiz_quiz_stats stats ON stats.quiz_id = session.quiz_id
+                   JOIN quiz_question question ON question.id = response.question_id
+                   JOIN quiz_choice choice ON choice.question_id = response.question_id
+                                          AND response.answer_data @> to_jsonb(choice.id)
+                  WHERE response.session_id IN %s
+                    AND question.type IN ('mcq_single', 'mcq_multiple')
+               GROUP BY stats.id, choice.question_id, choice.id
+            ON CONFLICT (stats_id, choice_id)
+              DO UPDATE SET selection_count = quiz_quiz_stats_choice.selection_count + EXCLUDED.selection_count
+        """, [tuple(sessions.ids)])
+        self._invalidate_stats()
+
+    @api.model
+    def _record_archived_sessions(self, archives):
+        """Fold archived sessions into the counters, reading their archive documents"""
+        if not archives:
+            return
+        stats_ids = self._get_stats_ids(set(archives.quiz_id.ids))
+        self._add_session_totals(stats_ids, [
+            (archive.quiz_id.id, archive.total_score, archive.percentage, archive.passed) for archive in archives
+        ])
+
+        mcq_question_ids = set(self.env['quiz.question'].search([
+            ('quiz_id', 'in', archives.quiz_id.ids),
+            ('type', 'in', ('mcq_single', 'mcq_multiple')),
+        ]).ids)
+        question_counts = Counter()
+        correct_counts = Counter()
+        choice_rows = []
+        for archive in archives:
+            quiz_id = archive.quiz_id.id
+            for response in archive._get_document().get('responses', []):
+                key = (stats_ids[quiz_id], response['question_id'])
+                question_counts[key] += 1
+                correct_counts[key] += 1 if response['is_correct'] else 0
+                if response['question_id'] in mcq_question_ids:
+                    choice_rows.append((quiz_id, response['question_id'], response['answer_data']))
+
+        # Questions deleted since the session was archived are left out
+        existing = set(self.env['quiz.question'].browse({key[1] for key in question_counts}).exists().ids)
+        keys = [key for key in question_counts if key[1] in existing]
+        if keys:
+            self.env.cr.execute("""
+                INSERT INTO quiz_quiz_stats_question (stats_id, question_id, answer_count, correct_count,
+                                                      create_date, write_date)
+                     SELECT stats_id, question_id, answer_count, correct_count,
+                            now() at time zone 'UTC', now() at time zone 'UTC'
+                       FROM unnest(%s::int[], %s::int[], %s::int[], %s::int[])
+                            AS delta(stats_id, question_id, answer_count, correct_count)
+                ON CONFLICT (stats_id, question_id)
+                  DO UPDATE SET answer_count = quiz_quiz_stats_question.answer_count + EXCLUDED.answer_count,
+                                correct_count = quiz_quiz_stats_question.correct_count + EXCLUDED.correct_count
+            """, [[key[0] for key in keys], [key[1] for key in keys],
+                  [question_counts[key] for key in keys], [correct_counts[key] for key in keys]])
+        self._add_choice_selections(stats_ids, choice_rows)
+        self._invalidate_stats()
+
+    @api.model
+    def _add_session_totals(self, stats_ids, sessions):
+        """Add ``(quiz_id, total_score, percentage, passed)`` tuples to the totals and histogram"""
+        totals = defaultdict(lambda: [0, 0, 0.0, 0.0])
+        buckets = Counter()
+        for quiz_id, total_score, percentage, passed in sessions:
+            total = totals[quiz_id]
+            total[0] += 1
+            total[1] += 1 if passed else 0
+            total[2] += total_score
+            total[3] += total_score * total_score
+            bucket = min(max(int(percentage // (100 / HISTOGRAM_BUCKETS)), 0), HISTOGRAM_BUCKETS - 1)
+            buckets[stats_ids[quiz_id], bucket] += 1
+        if not totals:
+            return
+
+        cr = self.env.cr
+        cr.execute("""
+            UPDATE quiz_quiz_stats
+               SET scored_count = scored_count + delta.scored,
+                   pass_count = pass_count + delta.passed,
+                   score_sum = score_sum + delta.score_sum,
+                   score_sq_sum = score_sq_sum + delta.score_sq_sum,
+                   write_date = now() at time zone 'UTC'
+              FROM unnest(%s::int[], %s::int[], %s::int[], %s::float8[], %s::float8[])
+                   AS delta(quiz_id, scored, passed, score_sum, score_sq_sum)
+             WHERE quiz_quiz_stats.quiz_id = delta.quiz_id
+        """, [list(totals)] + [[total[i] for total in totals.values()] for i in range(4)])
+
+        cr.execute("""
+            INSERT INTO quiz_quiz_stats_bucket (stats_id, bucket, count, create_date, write_date)
+                 SELECT stats_id, bucket, count, now() at time zone 'UTC', now() at time zone 'UTC'
+                   FROM unnest(%s::int[], %s::int[], %s::int[]) AS delta(stats_id, bucket, count)
+            ON CONFLICT (stats_id, bucket)
+              DO UPDATE SET count = quiz_quiz_stats_bucket.count + EXCLUDED.count
+        """, [[key[0] for key in buckets], [key[1] for key in buckets], list(buckets.values())])
+
+    @api.model
+    def _add_choice_selections(self, stats_ids, rows):
+        """Count the choices selected in ``(quiz_id, question_id, answer_data)`` multiple choice answers"""
+        if not rows:
+            return
+        cr = self.env.cr
+        question_ids = {question_id for _quiz_id, question_id, _answer in rows}
+        cr.execute("SELECT id, question_id FROM quiz_choice WHERE question_id IN %s", [tuple(question_ids)])
+        choice_question = dict(cr.fetchall())
+
+        selections = Counter()
+        for quiz_id, question_id, answer_data in rows:
+            for choice_id in _selected_choice_ids(answer_data):
+                if choice_question.get(choice_id) == question_id:
+                    selections[stats_ids[quiz_id], question_id, choice_id] += 1
+        if not selections:
+            return
+
+        keys = list(selections)
+        cr.execute("""
+            INSERT INTO quiz_quiz_stats_choice (stats_id, question_id, choice_id, selection_count,
+                                                create_date, write_date)
+                 SELECT stats_id, question_id, choice_id, count, now() at time zone 'UTC', now() at time zone 'UTC'
+                   FROM unnest(%s::int[], %s::int[], %s::int[], %s::int[])
+                        AS delta(stats_id, question_id, choice_id, count)
+            ON CONFLICT (stats_id, choice_id)
+              DO UPDATE SET selection_count = quiz_quiz_stats_choice.selection_count + EXCLUDED.selection_count
+        """, [[key[0] for key in keys], [key[1] for key in keys], [key[2] for key in keys], list(selections.values())])
+
+    def _invalidate_stats(self):
+        self.invalidate_model()
+        self.env['quiz.quiz.stats.bucket'].invalidate_model()
+        self.env['quiz.quiz.stats.question'].invalidate_model()
+        self.env['quiz.quiz.stats.choice'].invalidate_model()
+
+    @api.model
+    def rebuild(self, quizzes=None, chunk_size=1000):
+        """Recompute the statistics of the quizzes (all by default) from scratch
+
+        Meant to verify or repair the incremental counters, e.g. from a shell:
+        ``env['quiz.quiz.stats'].rebuild()``. Archived sessions are included.
+        """
+        quizzes = quizzes if quizzes is not None else self.env['quiz.quiz'].search([])
+        if not quizzes:
+            return
+        self.sudo().search([('quiz_id', 'in', quizzes.ids)]).unlink()
+
+        Session = self.env['quiz.session']
+        Session.flush_model()
+        # Sessions not counted yet are added by the next _record_session_counts
+        self.env.cr.execute("""
+            SELECT quiz_id, COUNT(*), COUNT(*) FILTER (WHERE counted_as = 'completion')
+              FROM quiz_session
+             WHERE quiz_id IN %s
+               AND counted_as IS NOT NULL
+          GROUP BY quiz_id
+        """, [tuple(quizzes.ids)])
+        attempts = Counter()
+        completions = Counter()
+        for quiz_id, attempt_count, completion_count in self.env.cr.fetchall():
+            attempts[quiz_id] += attempt_count
+            completions[quiz_id] += completion_count
+        # Only completed sessions are ever archived
+        Archive = self.env['quiz.session.archive'].sudo()
+        for group in Archive.read_group([('quiz_id', 'in', quizzes.ids)], ['quiz_id'], ['quiz_id']):
+            attempts[group['quiz_id'][0]] += group['quiz_id_count']
+            completions[group['quiz_id'][0]] += group['quiz_id_count']
+        self._increment('attempt_count', +attempts)
+        self._increment('completion_count', +completions)
+
+        session_ids = Session.search([
+            ('quiz_id', 'in', quizzes.ids),
+            ('state', 'in', ('completed', 'expired')),
+            ('scoring_state', '=', 'scored'),
+        ]).ids
+        for start in range(0, len(session_ids), chunk_size):
+            self._record_scored_sessions(Session.browse(session_ids[start:start + chunk_size]))
+
+        archive_ids = Archive.search([('quiz_id', 'in', quizzes.ids)]).ids
+        for start in range(0, len(archive_ids), chunk_size):
+            archives = Archive.browse(archive_ids[start:start + chunk_size])
+            self._record_archived_sessions(archives)
+            archives.invalidate_recordset(['payload'])
+        _logger.info("Rebuilt statistics of %s quizzes from %s scored and %s archived sessions",
+                     len(quizzes), len(session_ids), len(archive_ids))
+
+
+class QuizStatsBucket(models.Model):
+    _name = 'quiz.quiz.stats.bucket'
+    _description = 'Quiz Score Histogram Bucket'
+    _order = 'bucket'
+
+    stats_id = fields.Many2one('quiz.quiz.stats', string='Statistics', required=True, ondelete='cascade')
+    bucket = fields.Integer(string='Bucket', required=True)
+    name = fields.Char(string='Score Range', compute='_compute_name')
+    count = fields.Integer(string='Sessions', readonly=True)
+
+    _sql_constraints = [
+        ('bucket_unique', 'UNIQUE(stats_id, bucket)', 'Each histogram bucket must be unique.'),
+    ]
+
+    @api.depends('bucket')
+    def _compute_name(self):
+        width = 100 // HISTOGRAM_BUCKETS
+        for bucket in self:
+            bucket.name = _('%(low)s-%(high)s%%', low=bucket.bucket * width, high=(bucket.bucket + 1) * width)
+
+
+class QuizStatsQuestion(models.Model):
+    _name = 'quiz.quiz.stats.question'
+    _description = 'Quiz Question Statistics'
+    _order = 'question_id'
+
+    stats_id = fields.Many2one('quiz.quiz.stats', string='Statistics', required=True, ondelete='cascade')
+    question_id = fields.Many2one('quiz.question', string='Question', required=True, ondelete='cascade')
+    answer_count = fields.Integer(string='Answers', readonly=True)
+    correct_count = fields.Integer(string='Correct', readonly=True)
+    correct_rate = fields.Float(string='Correct (%)', compute='_compute_correct_rate')
+
+    _sql_constraints = [
+        ('question_unique', 'UNIQUE(stats_id, question_id)', 'Each question has a single statistics line.'),
+    ]
+
+    @api.depends('answer_count', 'correct_count')
+    def _compute_correct_rate(self):
+        for line in self:
+            line.correct_rate = line.correct_count / line.answer_count * 100 if line.answer_count else 0.0
+
+
+class QuizStatsChoice(models.Model):
+    _name = 'quiz.quiz.stats.choice'
+    _description = 'Quiz Choice Statistics'
+    _order = 'question_id, choice_id'
+
+    stats_id = fields.Many2one('quiz.quiz.stats', string='Statistics', required=True, ondelete='cascade')
+    question_id = fields.Many2one('quiz.question', string='Question', required=True, ondelete='cascade')
+    choice_id = fields.Many2one('quiz.choice', string='Choice', required=True, ondelete='cascade')
+    selection_count = fields.Integer(string='Selections', readonly=True)
+
+    _sql_constraints = [
+        ('choice_unique', 'UNIQUE(stats_id, choice_id)', 'Each choice has a single statistics line.'),
+    ]
+
+
+def _selected_choice_ids(answer_data):
+    """Return the choice ids selected in a stored multiple choice answer"""
+    # Archives written before the JSONB column may hold the former text
+    answer = decode_legacy_answer(answer_data)
+    if isinstance(answer, (int, str)):
+        answer = [answer]
+    if not isinstance(answer, list):
+        return []
+    choice_ids = []
+    for value in answer:
+        try:
+            choice_ids.append(int(value))
+        except (ValueError, TypeError):
+            continue
+    return choice_ids
@@ -1,5 +1,17 @@
 from odoo import models, fields, api, _
+from odoo.tools.sql import create_index
+from collections import defaultdict
 import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Answers are stored by the submitting request and scored later by the
+# scoring cron, so the evaluator cost never lands on the student.
+SCORE_STATES = [
+    ('pending', 'Pending'),
+    ('scored', 'Scored'),
+]
 
 
 class QuizAnswer(models.Model):
@@ -8,28 +20,22 @@ class QuizAnswer(models.Model):
 
     session_id = fields.Many2one('quiz.session', string='Session', required=True, ondelete='cascade')
     question_id = fields.Many2one('quiz.question', string='Question', required=True, ondelete='cascade')
-    
+
     # Answer data stored as JSON
     answer_data = fields.Text(string='Answer Data', help='JSON containing the answer details')
     score = fields.Float(string='Score')
     max_score = fields.Float(string='Maximum Score', related='question_id.points', store=True)
-    
+    score_state = fields.Selection(SCORE_STATES, string='Scoring', default='pending', required=True, index=True)
+
     # Timing
     time_spent = fields.Float(string='Time Spent (seconds)')
     answered_at = fields.Datetime(string='Answered At', default=fields.Datetime.now)
-    
-    @api.model
-    def create(self, vals):
-        answer = super().create(vals)
-        answer._compute_score()
-        return answer
-    
+
     def write(self, vals):
-        result = super().write(vals)
         if 'answer_data' in vals:
-            self._compute_score()
-        return result
-    
+            vals = dict(vals, score_state='pending')
+        return super().write(vals)
+
     def _compute_score(self):
         for answer in self:
             if answer.answer_data and answer.question_id:
@@ -38,13 +44,21 @@ class QuizAnswer(models.Model):
                     answer.score = answer.question_id.evaluate_answer(answer_data)
                 except (json.JSONDecodeError, AttributeError):
                     answer.score = 0.0
-    
+
+    @api.model
+    def _score_pending(self, limit=2000):
+        """Score a batch of queued answers, return how many were scored"""
+        answers = self.search([('score_state', '=', 'pending')], limit=limit)
+        answers._compute_score()
+        answers.score_state = 'scored'
+        return len(answers)
+
     def get_answer_data_dict(self):
         try:
             return json.loads(self.answer_data) if self.answer_data else {}
         except json.JSONDecodeError:
             return {}
-    
+
     def set_answer_data_dict(self, data):
         self.answer_data = json.dumps(data)
 
@@ -52,86 +66,148 @@ class QuizAnswer(models.Model):
 class Response(models.Model):
     _name = 'quiz.response'
     _description = 'Quiz Response'
-    
+
     session_id = fields.Many2one('quiz.session', required=True, ondelete='cascade')
     question_id = fields.Many2one('quiz.question', required=True, ondelete='cascade')
-    answer_data = fields.Text(string='Answer Data')
-    score = fields.Float(string='Score', default=0.0)
-    is_correct = fields.Boolean(string='Is Correct', compute='_compute_is_correct', store=True)
-    
-    @api.depends('score', 'question_id.points')
-    def _compute_is_correct(self):
-        for record in self:
-            if record.question_id.points > 0:
-                record.is_correct = record.score >= record.question_id.points
-            else:
-                record.is_correct = False
-                self.write({'state': 'expired'})
-                return True
-        return False
+    # Canonical JSONB value, see answer_data.py for the shape per question type
+    answer_data = fields.Json(string='Answer Data')
+    score = fields.Float(string='Score', default=0.0, readonly=True)
+    is_correct = fields.Boolean(string='Is Correct', readonly=True)
+    score_state = fields.Selection(SCORE_STATES, string='Scoring', default='pending', required=True, readonly=True)
 
+    # The session total sums the responses and the results snapshot lists
+    # them per question: both need a single response per question
+    _sql_constraints = [
+        ('session_question_unique', 'UNIQUE(session_id, question_id)',
+         'A question is answered once per session.'),
+    ]
 
-class QuizAnswer(models.Model):
-    _name = 'quiz.answer'
-    _description = 'Quiz Answer'
+    def init(self):
+        # The scoring queue: only pending responses are ever looked up
+        create_index(self._cr, 'quiz_response_pending_index', self._table, ['id'],
+                     where="score_state = 'pending'")
+        # Containment queries on answers (e.g. who selected a given choice)
+        create_index(self._cr, 'quiz_response_answer_data_index', self._table, ['answer_data jsonb_path_ops'],
+                     method='gin')
 
-    session_id = fields.Many2one('quiz.session', string='Session', required=True, ondelete='cascade')
-    question_id = fields.Many2one('quiz.question', string='Question', required=True, ondelete='cascade')
-    
-    # Answer data stored as JSON
-    answer_data = fields.Text(string='Answer Data', help='JSON containing the answer details')
-    score = fields.Float(string='Score')
-    max_score = fields.Float(string='Maximum Score', related='question_id.points', store=True)
-    
-    # Timing
-    time_spent = fields.Float(string='Time Spent (seconds)')
-    answered_at = fields.Datetime(string='Answered At', default=fields.Datetime.now)
-    
-    @api.model
-    def create(self, vals):
-        answer = super().create(vals)
-        answer._compute_score()
-        return answer
-    
     def write(self, vals):
-        result = super().write(vals)
         if 'answer_data' in vals:
-            self._compute_score()
-        return result
-    
-    def _compute_score(self):
-        for answer in self:
-            if answer.answer_data and answer.question_id:
-                try:
-                    answer_data = json.loads(answer.answer_data)
-                    answer.score = answer.question_id.evaluate_answer(answer_data)
-                except (json.JSONDecodeError, AttributeError):
-                    answer.score = 0.0
-    
-    def get_answer_data_dict(self):
-        try:
-            return json.loads(self.answer_data) if self.answer_data else {}
-        except json.JSONDecodeError:
+            vals = dict(vals, score_state='pending')
+        return super().write(vals)
+
+    @api.model
+    def _upsert_answer(self, session_id, question_id, answer_data):
+        """Store the answer to a question of a paged session, replacing an earlier one
+
+        A question answered again (e.g. after going back) keeps its single
+        response: the new answer is queued for scoring and the scorer adds
+        the difference with the former score to the session total.
+        """
+        self.flush_model()
+        self.env.cr.execute("""
+            INSERT INTO quiz_response (session_id, question_id, answer_data, score, score_state,
+                                       create_uid, create_date, write_uid, write_date)
+                 VALUES (%(session_id)s, %(question_id)s, %(answer_data)s::jsonb, 0, 'pending',
+                         %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC')
+            ON CONFLICT (session_id, question_id)
+              DO UPDATE SET answer_data = EXCLUDED.answer_data,
+                            score_state = 'pending',
+                            write_uid = EXCLUDED.write_uid,
+                            write_date = EXCLUDED.write_date
+        """, {
+            'session_id': session_id,
+            'question_id': question_id,
+            'answer_data': json.dumps(answer_data) if answer_data is not None else None,
+            'uid': self.env.uid,
+        })
+        self.invalidate_model(['answer_data', 'score_state'])
+
+    @api.model
+    def _write_scores(self, response_ids, scores):
+        """Store scores of responses with a single UPDATE and mark them scored
+
+        Returns ``{session id: score delta}``, the change of each session
+        total, to be applied with quiz.session._apply_score_deltas.
+        """
+        if not response_ids:
             return {}
-    
-    def set_answer_data_dict(self, data):
-        self.answer_data = json.dumps(data)
+        self.flush_model()
+        # ``previous`` is the row as it was before this UPDATE
+        self.env.cr.execute("""
+            UPDATE quiz_response
+               SET score = batch.score,
+                   is_correct = question.points > 0 AND batch.score >= question.points,
+                   score_state = 'scored'
+              FROM unnest(%s::int[], %s::float8[]) AS batch(id, score),
+                   quiz_question question,
+                   quiz_response previous
+             WHERE quiz_response.id = batch.id
+               AND question.id = quiz_response.question_id
+               AND previous.id = quiz_response.id
+         RETURNING quiz_response.session_id, batch.score - COALESCE(previous.score, 0)
+        """, [list(response_ids), list(scores)])
+        deltas = defaultdict(float)
+        for session_id, delta in self.env.cr.fetchall():
+            deltas[session_id] += delta
+        self.browse(response_ids).invalidate_recordset(['score', 'is_correct', 'score_state'])
+        return deltas
 
+    @api.model
+    def _score_pending(self, limit=2000):
+        """Score a batch of queued responses grouped by question
 
-class Response(models.Model):
-    _name = 'quiz.response'
-    _description = 'Quiz Response'
-    
-    session_id = fields.Many2one('quiz.session', required=True, ondelete='cascade')
-    question_id = fields.Many2one('quiz.question', required=True, ondelete='cascade')
-    answer_data = fields.Text(string='Answer Data')
-    score = fields.Float(string='Score', default=0.0)
-    is_correct = fields.Boolean(string='Is Correct', compute='_compute_is_correct', store=True)
-    
-    @api.depends('score', 'question_id.points')
-    def _compute_is_correct(self):
-        for record in self:
-            if record.question_id.points > 0:
-                record.is_correct = record.score >= record.question_id.points
-            else:
-                record.is_correct = False
+        Returns the number of responses scored. The totals of the affected
+        sessions are adjusted by the score deltas.
+        """
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT id, question_id, session_id, answer_data
+              FROM quiz_response
+             WHERE score_state = 'pending'
+          ORDER BY id
+             LIMIT %s
+               FOR UPDATE SKIP LOCKED
+        """, [limit])
+        rows = self.env.cr.fetchall()
+        if not rows:
+            return 0
+
+        by_question = defaultdict(lambda: ([], []))
+        session_ids = set()
+        for response_id, question_id, session_id, answer_data in rows:
+            ids, answers = by_question[question_id]
+            ids.append(response_id)
+            answers.append(answer_data)
+            session_ids.add(session_id)
+
+        response_ids = []
+        scores = []
+        # One query loads the cache versions of every question
+        questions = self.env['quiz.question'].browse(list(by_question))
+        for question in questions:
+            ids, answers = by_question[question.id]
+            response_ids.extend(ids)
+            scores.extend(question._score_answers_batch(answers).tolist())
+
+        Session = self.env['quiz.session']
+        Session._apply_score_deltas(self._write_scores(response_ids, scores))
+        Session.browse(session_ids)._mark_scored()
+        return len(response_ids)
+
+    @api.model
+    def _cron_score_pending(self, batch_size=2000, max_batches=25):
+        """Drain the scoring queue, re-triggering itself when work remains"""
+        scored = 0
+        for _i in range(max_batches):
+            count = self._score_pending(batch_size)
+            scored += count
+            if count < batch_size:
+                break
+        else:
+            self.env.ref('quiz_engine_pro.ir_cron_score_pending_responses')._trigger()
+
+        self.env['quiz.session']._finalize_scoring()
+        self.env['quiz.quiz.stats']._record_session_counts()
+        self.env['quiz.answer']._score_pending(batch_size)
+        if scored:
+            _logger.info("Scored %s queued quiz responses", scored)
@@ -1,5 +1,25 @@
 from odoo import models, fields, api, _
-from datetime import datetime, timedelta
+from odoo.exceptions import UserError
+from odoo.tools.sql import create_index
+from datetime import timedelta
+import hashlib
+import json
+import logging
+import random
+
+_logger = logging.getLogger(__name__)
+
+
+def build_result_snapshot(summary, outcomes):
+    """Serialize the results of a session, return ``(snapshot, etag)``
+
+    ``summary`` holds the session totals, ``outcomes`` one dict per
+    question. The snapshot is canonical JSON, so its digest is a strong
+    ETag of the results.
+    """
+    snapshot = json.dumps(dict(summary, questions=outcomes), sort_keys=True, separators=(',', ':'))
+    return snapshot, hashlib.sha256(snapshot.encode()).hexdigest()[:32]
+
 
 class QuizSession(models.Model):
     _name = 'quiz.session'
@@ -22,48 +42,413 @@ class QuizSession(models.Model):
     start_time = fields.Datetime(string='Start Time')
     end_time = fields.Datetime(string='End Time')
     time_limit = fields.Integer(string='Time Limit (minutes)')
+    deadline = fields.Datetime(string='Deadline', compute='_compute_deadline', store=True,
+                               help='Moment the session expires, empty without time limit')
     
-    # Scoring
-    total_score = fields.Float(string='Total Score', compute='_compute_scores', store=True)
-    max_score = fields.Float(string='Maximum Score', compute='_compute_scores', store=True)
-    percentage = fields.Float(string='Percentage', compute='_compute_scores', store=True)
+    # Scoring: max_score is set when the session is created, total_score is
+    # adjusted by the scoring cron as responses are scored
+    total_score = fields.Float(string='Total Score', readonly=True)
+    max_score = fields.Float(string='Maximum Score', readonly=True)
+    percentage = fields.Float(string='Percentage', readonly=True)
     passed = fields.Boolean(string='Passed', compute='_compute_passed', store=True)
+    scoring_state = fields.Selection([
+        ('pending', 'Pending'),
+        ('scored', 'Scored'),
+    ], string='Scoring', default='pending', required=True, readonly=True, index=True)
+    # Set by the scoring cron once the session is in the attempt and
+    # completion counters of quiz.quiz.stats
+    counted_as = fields.Selection([
+        ('attempt', 'Attempt'),
+        ('completion', 'Completion'),
+    ], string='Counted As', readonly=True, copy=False)
     
+    # Questions of the session (drawn from the pools of the quiz, if any),
+    # fixed at creation and shuffled with order_seed when the quiz
+    # randomizes questions; the seed also orders the choices
+    question_order = fields.Json(string='Question Order', readonly=True, copy=False)
+    order_seed = fields.Integer(string='Order Seed', readonly=True, copy=False)
+
+    # Results frozen when scoring completes, served as is by the results page
+    result_snapshot = fields.Text(string='Results Snapshot', readonly=True, copy=False)
+    result_etag = fields.Char(string='Results ETag', readonly=True, copy=False)
+
     # Relationships
     response_ids = fields.One2many('quiz.response', 'session_id', string='Responses')
     
     # Participant info (for anonymous users)
     participant_name = fields.Char(string='Participant Name')
     participant_email = fields.Char(string='Participant Email')
-    
-    @api.depends('response_ids.score')
-    def _compute_scores(self):
+
+    _sql_constraints = [
+        ('session_token_unique', 'UNIQUE(session_token)', 'Session token must be unique.'),
+    ]
+
+    def init(self):
+        # The expiry sweeper only ever looks at running sessions with a deadline
+        create_index(self._cr, 'quiz_session_running_deadline_index', self._table, ['deadline'],
+                     where="state = 'in_progress' AND deadline IS NOT NULL")
+        # Sessions not counted yet in the statistics, or completed since
+        create_index(self._cr, 'quiz_session_uncounted_index', self._table, ['id'],
+                     where="counted_as IS NULL OR (counted_as = 'attempt' AND state = 'completed')")
+
+    @api.depends('start_time', 'time_limit')
+    def _compute_deadline(self):
         for session in self:
-            session.total_score = sum(session.response_ids.mapped('score'))
-            session.max_score = session.quiz_id.total_points
-            session.percentage = (session.total_score / session.max_score * 100) if session.max_score > 0 else 0
+            if session.start_time and session.time_limit > 0:
+                session.deadline = session.start_time + timedelta(minutes=session.time_limit)
+            else:
+                session.deadline = False
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if vals.get('quiz_id') and 'question_order' not in vals:
+                for name, value in self._draw_question_order(vals['quiz_id']).items():
+                    vals.setdefault(name, value)
+        # Counted as attempts by the scoring cron, see _record_session_counts
+        return super().create(vals_list)
     
+    @api.model
+    def _apply_score_deltas(self, deltas):
+        """Add ``{session id: score delta}`` to the session totals
+
+        Totals are adjusted in place by one UPDATE instead of re-summing
+        every response, so the cost does not grow with the number of
+        answers and the session rows stay locked only briefly.
+        """
+        if not deltas:
+            return
+        session_ids = sorted(deltas)
+        self.flush_model(['total_score', 'max_score', 'percentage', 'passed'])
+        # Lock in id order, so concurrent scorers never deadlock. NO KEY UPDATE
+        # does not conflict with the KEY SHARE lock every quiz_response insert
+        # takes on its session, so students keep answering meanwhile
+        self.env.cr.execute("SELECT id FROM quiz_session WHERE id = ANY(%s) ORDER BY id FOR NO KEY UPDATE",
+                            [session_ids])
+        self.env.cr.execute("""
+            UPDATE quiz_session session
+               SET total_score = session.total_score + batch.delta,
+                   percentage = CASE WHEN session.max_score > 0
+                                     THEN (session.total_score + batch.delta) / session.max_score * 100
+                                     ELSE 0 END,
+                   passed = CASE WHEN session.max_score > 0
+                                 THEN (session.total_score + batch.delta) / session.max_score * 100
+                                 ELSE 0 END >= COALESCE(quiz.passing_score, 0),
+                   write_date = now() at time zone 'UTC'
+              FROM unnest(%s::int[], %s::float8[]) AS batch(id, delta),
+                   quiz_quiz quiz
+             WHERE session.id = batch.id
+               AND quiz.id = session.quiz_id
+        """, [session_ids, [deltas[session_id] for session_id in session_ids]])
+        self.browse(session_ids).invalidate_recordset(['total_score', 'percentage', 'passed'])
+        # Rescoring and reconciliation change the totals of scored sessions
+        self.browse(session_ids)._refreeze_results()
+
+    def _mark_scored(self):
+        """Mark finished (completed or expired) sessions without pending responses as scored
+
+        Sessions are counted in the quiz statistics once, when their score
+        becomes final.
+        """
+        if not self:
+            return
+        self.flush_recordset(['state', 'scoring_state'])
+        self.env['quiz.response'].flush_model(['session_id', 'score_state'])
+        self.env.cr.execute("""
+            UPDATE quiz_session session
+               SET scoring_state = 'scored'
+             WHERE session.id = ANY(%s)
+               AND session.state IN ('completed', 'expired')
+               AND session.scoring_state = 'pending'
+               AND NOT EXISTS (SELECT 1
+                                 FROM quiz_response response
+                                WHERE response.session_id = session.id
+                                  AND response.score_state = 'pending')
+         RETURNING session.id
+        """, [self.ids])
+        newly_scored = self.browse([row[0] for row in self.env.cr.fetchall()])
+        newly_scored.invalidate_recordset(['scoring_state'])
+        self.env['quiz.quiz.stats']._record_scored_sessions(newly_scored)
+        newly_scored._freeze_results()
+
+    def _refreeze_results(self):
+        """Rebuild the results snapshot of scored sessions whose scores changed
+
+        The new snapshot gets a new ETag, so cached results pages are
+        refetched.
+        """
+        if not self:
+            return
+        self.env.cr.execute("""
+            UPDATE quiz_session
+               SET result_snapshot = NULL, result_etag = NULL
+             WHERE id = ANY(%s)
+               AND scoring_state = 'scored'
+               AND result_snapshot IS NOT NULL
+         RETURNING id
+        """, [self.ids])
+        refrozen = self.browse([row[0] for row in self.env.cr.fetchall()])
+        refrozen.invalidate_recordset(['result_snapshot', 'result_etag'])
+        refrozen._freeze_results()
+
+    def _freeze_results(self):
+        """Store the results snapshot of scored sessions that have none
+
+        The snapshot holds the totals, pass/fail and the outcome of every
+        question. Only a score correction rebuilds it (see
+        ``_refreeze_results``), so the results page of a session is the
+        same on every view until then.
+        """
+        sessions = self.filtered(lambda session: session.scoring_state == 'scored' and not session.result_snapshot)
+        if not sessions:
+            return
+        self.env['quiz.response'].flush_model(['session_id', 'question_id', 'score', 'is_correct'])
+        self.env.cr.execute("""
+            SELECT session_id, question_id, score, is_correct
+              FROM quiz_response
+             WHERE session_id = ANY(%s)
+        """, [sessions.ids])
+        responses = {session.id: {} for session in sessions}
+        for session_id, question_id, score, is_correct in self.env.cr.fetchall():
+            # One response per question, like the sum in total_score
+            responses[session_id][question_id] = (score or 0.0, bool(is_correct))
+
+        question_ids = {question_id for session in sessions for question_id in session._get_question_ids()}
+        questions = {
+            question.id: question for question in
+            self.env['quiz.question'].sudo().search_fetch(
+                [('id', 'in', list(question_ids))], ['name', 'points'])
+        }
+        snapshots = []
+        for session in sessions:
+            outcomes = []
+            for position, question_id in enumerate(session._get_question_ids(), start=1):
+                question = questions.get(question_id)
+                score, is_correct = responses[session.id].get(question_id, (0.0, False))
+                outcomes.append({
+                    'position': position,
+                    'name': question.name if question else '',
+                    'score': score,
+                    'points': question.points if question else 0.0,
+                    'correct': is_correct,
+                })
+            snapshots.append(build_result_snapshot({
+                'quiz_name': session.quiz_id.name,
+                'participant_name': session.participant_name or '',
+                'end_time': fields.Datetime.to_string(session.end_time) or '',
+                'total_score': session.total_score,
+                'max_score': session.max_score,
+                'percentage': session.percentage,
+                'passed': session.passed,
+            }, outcomes))
+
+        self.env.cr.execute("""
+            UPDATE quiz_session session
+               SET result_snapshot = batch.snapshot,
+                   result_etag = batch.etag
+              FROM unnest(%s::int[], %s::text[], %s::text[]) AS batch(id, snapshot, etag)
+             WHERE session.id = batch.id
+               AND session.result_snapshot IS NULL
+        """, [sessions.ids, [snapshot for snapshot, _etag in snapshots], [etag for _snapshot, etag in snapshots]])
+        sessions.invalidate_recordset(['result_snapshot', 'result_etag'])
+
+    @api.model
+    def _draw_question_order(self, quiz_id):
+        """Return the question order, seed and maximum score of a new session of a quiz
+
+        Quizzes with pool rules get a fresh draw from their pools.
+        """
+        layout = self.env['quiz.quiz']._get_question_layout(quiz_id)
+        seed = random.SystemRandom().randrange(1, 2 ** 31)
+        rng = random.Random(seed)
+        if layout.pool_rules:
+            question_ids, max_score = self.env['quiz.pool.rule']._draw(layout.pool_rules, rng)
+        else:
+            question_ids, max_score = list(layout.question_ids), layout.total_points
+        if layout.randomize_questions:
+            rng.shuffle(question_ids)
+        return {'question_order': question_ids, 'order_seed': seed, 'max_score': max_score}
+
+    def _get_question_ids(self):
+        """Question ids in the order of this session"""
+        self.ensure_one()
+        if self.question_order is not None:
+            return self.question_order
+        # Sessions started before orders were stored follow the quiz order
+        return list(self.env['quiz.quiz']._get_question_layout(self.quiz_id.id).question_ids)
+
+    def _get_question_at(self, position):
+        """Question shown at ``position`` (1-based), fetched alone by id"""
+        question_ids = self._get_question_ids()
+        if not 1 <= position <= len(question_ids):
+            return self.env['quiz.question']
+        return self.env['quiz.question'].browse(question_ids[position - 1]).exists()
+
+    def _shuffle_choice_ids(self, question_id, choice_ids):
+        """Order choice ids for this session, shuffled when the quiz asks for it"""
+        choice_ids = list(choice_ids)
+        if self.order_seed and self.env['quiz.quiz']._get_question_layout(self.quiz_id.id).randomize_choices:
+            random.Random(f'{self.order_seed}-{question_id}').shuffle(choice_ids)
+        return choice_ids
+
+    def _get_choices(self, question):
+        """Choices of a question in the order shown to this session"""
+        return question.choice_ids.browse(self._shuffle_choice_ids(question.id, question.choice_ids.ids))
+
+    def _order_payload(self, payload):
+        """Apply the questions and order of this session to a cached single page payload"""
+        layout = self.env['quiz.quiz']._get_question_layout(self.quiz_id.id)
+        if not (layout.pool_rules or layout.randomize_questions or layout.randomize_choices):
+            return payload
+        data = json.loads(payload)
+        if layout.pool_rules:
+            # Browsed together so their cache versions are read with one query
+            questions = [
+                question._get_cached_payload_data(question.id)
+                for question in self.env['quiz.question'].browse(self._get_question_ids())
+            ]
+        else:
+            by_id = {question['id']: question for question in data['questions']}
+            questions = [by_id[question_id] for question_id in self._get_question_ids() if question_id in by_id]
+        data['questions'] = []
+        for question in questions:
+            if question.get('choices'):
+                choices = {choice['id']: choice for choice in question['choices']}
+                question = dict(question, choices=[
+                    choices[choice_id] for choice_id in self._shuffle_choice_ids(question['id'], choices)])
+            data['questions'].append(question)
+        return json.dumps(data)
+
+    def _update_score_totals(self):
+        """Re-derive score totals from the responses and correct any drift
+
+        Returns the number of sessions whose total had drifted. The
+        incremental path keeps ``total_score`` equal to the sum of the
+        response scores; this is the reconciliation pass checking it.
+        """
+        if not self:
+            return 0
+        self.flush_recordset(['total_score'])
+        self.env['quiz.response'].flush_model(['session_id', 'score'])
+        self.env.cr.execute("""
+            SELECT session.id, COALESCE(SUM(response.score), 0) - session.total_score
+              FROM quiz_session session
+         LEFT JOIN quiz_response response ON response.session_id = session.id
+             WHERE session.id = ANY(%s)
+          GROUP BY session.id
+            HAVING ABS(COALESCE(SUM(response.score), 0) - session.total_score) > 1e-6
+        """, [self.ids])
+        drift = dict(self.env.cr.fetchall())
+        self._apply_score_deltas(drift)
+        self._mark_scored()
+        return len(drift)
+
+    @api.model
+    def _finalize_scoring(self, limit=1000):
+        """Mark finished sessions scored when their last responses were scored earlier
+
+        Expired sessions get here without passing through complete_session.
+        """
+        sessions = self.search([('state', 'in', ('completed', 'expired')), ('scoring_state', '=', 'pending')],
+                               limit=limit)
+        sessions._mark_scored()
+
+    @api.model
+    def _cron_reconcile_scores(self, days=2, chunk_size=5000):
+        """Check the totals of recently started sessions against their responses"""
+        session_ids = self.search([
+            ('start_time', '>=', fields.Datetime.now() - timedelta(days=days)),
+        ], order='id').ids
+        drifted = 0
+        for start in range(0, len(session_ids), chunk_size):
+            drifted += self.browse(session_ids[start:start + chunk_size])._update_score_totals()
+        if drifted:
+            # Scored sessions were already counted with their former total
+            _logger.warning("Corrected the score total of %s of %s quiz sessions; "
+                            "rebuild the statistics of their quizzes", drifted, len(session_ids))
+        return drifted
+
     @api.depends('percentage', 'quiz_id.passing_score')
     def _compute_passed(self):
         for session in self:
             session.passed = session.percentage >= session.quiz_id.passing_score
     
     def start_session(self):
+        # The maximum score was snapshotted with the question order at creation
         self.write({
             'state': 'in_progress',
             'start_time': fields.Datetime.now(),
             'time_limit': self.quiz_id.time_limit,
         })
     
+    def submit_answers(self, answers):
+        """Store every answer of a single page session at once
+
+        ``answers`` maps question ids (as strings) to the answer given in the
+        browser; all responses are created in one batch, queued for scoring,
+        and the session is completed.
+        """
+        self.ensure_one()
+        vals_list = []
+        for question in self.env['quiz.question'].browse(self._get_question_ids()):
+            vals_list.append({
+                'session_id': self.id,
+                'question_id': question.id,
+                'answer_data': question._canonicalize_answer(answers.get(str(question.id))),
+            })
+        self.env['quiz.response'].create(vals_list)
+        self.complete_session()
+
     def complete_session(self):
         self.write({
             'state': 'completed',
             'end_time': fields.Datetime.now(),
         })
+        # Autosaved form states are only needed until the answers are in
+        self.env.cr.execute("DELETE FROM quiz_autosave WHERE session_id = ANY(%s)", [self.ids])
+        # Score the queued answers as soon as a cron worker is free
+        self.env.ref('quiz_engine_pro.ir_cron_score_pending_responses').sudo()._trigger()
     
+    def action_export_results(self, export_format='csv'):
+        """Export the sessions of the quiz of the selected sessions"""
+        if len(self.quiz_id) != 1:
+            raise UserError(_("Select sessions of a single quiz to export."))
+        return self.quiz_id.action_export_results(export_format)
+
     def check_expiry(self):
-        if self.state == 'in_progress' and self.time_limit > 0:
-            if self.start_time + timedelta(minutes=self.time_limit) < datetime.now():
-                self.write({'state': 'expired'})
-                return True
+        if self.state == 'in_progress' and self.deadline and self.deadline < fields.Datetime.now():
+            self.write({'state': 'expired'})
+            self.env.cr.execute("DELETE FROM quiz_autosave WHERE session_id = %s", [self.id])
+            return True
         return False
+
+    @api.model
+    def _cron_expire_sessions(self):
+        """Expire overdue sessions and purge drafts that were never started"""
+        self.flush_model(['state', 'deadline'])
+        self.env.cr.execute("""
+            UPDATE quiz_session
+               SET state = 'expired', write_date = now() at time zone 'UTC'
+             WHERE state = 'in_progress'
+               AND deadline < now() at time zone 'UTC'
+         RETURNING id
+        """)
+        expired_ids = [row[0] for row in self.env.cr.fetchall()]
+        expired = len(expired_ids)
+        if expired_ids:
+            # Expired sessions are never submitted; autosaves of purged
+            # drafts go with them through the cascade of session_id
+            self.env.cr.execute("DELETE FROM quiz_autosave WHERE session_id = ANY(%s)", [expired_ids])
+
+        ttl_hours = int(self.env['ir.config_parameter'].sudo().get_param(
+            'quiz_engine_pro.draft_session_ttl_hours', 24))
+        self.env.cr.execute("""
+            DELETE FROM quiz_session
+             WHERE state = 'draft'
+               AND create_date < now() at time zone 'UTC' - make_interval(hours => %s)
+        """, [ttl_hours])
+        purged = self.env.cr.rowcount
+
+        if expired or purged:
+            self.invalidate_model()
+            _logger.info("Expired %s overdue quiz sessions, purged %s stale drafts", expired, purged)
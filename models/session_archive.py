@@ -0,0 +1,183 @@
+from odoo import models, fields, api, _
+from psycopg2.extras import execute_values
+import base64
+import json
+import logging
+import zlib
+
+_logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT_VERSION = 1
+SESSION_SUMMARY_FIELDS = [
+    'quiz_id', 'user_id', 'session_token', 'state', 'start_time', 'end_time', 'time_limit',
+    'total_score', 'max_score', 'percentage', 'passed', 'participant_name', 'participant_email',
+    'result_snapshot', 'result_etag',
+]
+
+
+class QuizSessionArchive(models.Model):
+    """Completed session moved out of the hot tables
+
+    The summary columns stay queryable; the responses are kept as one
+    zlib compressed JSON document per session.
+    """
+    _name = 'quiz.session.archive'
+    _description = 'Archived Quiz Session'
+    _order = 'end_time desc'
+
+    origin_id = fields.Integer(string='Original Session ID', required=True, readonly=True)
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', required=True, ondelete='cascade', index=True)
+    user_id = fields.Many2one('res.users', string='User', readonly=True)
+    session_token = fields.Char(string='Session Token', required=True, readonly=True)
+    state = fields.Char(string='State', readonly=True)
+    start_time = fields.Datetime(string='Start Time', readonly=True)
+    end_time = fields.Datetime(string='End Time', readonly=True)
+    time_limit = fields.Integer(string='Time Limit (minutes)', readonly=True)
+    total_score = fields.Float(string='Total Score', readonly=True)
+    max_score = fields.Float(string='Maximum Score', readonly=True)
+    percentage = fields.Float(string='Percentage', readonly=True)
+    passed = fields.Boolean(string='Passed', readonly=True)
+    participant_name = fields.Char(string='Participant Name', readonly=True)
+    participant_email = fields.Char(string='Participant Email', readonly=True)
+    result_snapshot = fields.Text(string='Results Snapshot', readonly=True)
+    result_etag = fields.Char(string='Results ETag', readonly=True)
+    archived_at = fields.Datetime(string='Archived At', readonly=True)
+    payload = fields.Binary(string='Compressed Responses', attachment=False, readonly=True)
+    payload_text = fields.Text(string='Responses', compute='_compute_payload_text')
+
+    _sql_constraints = [
+        ('session_token_unique', 'UNIQUE(session_token)', 'Session token must be unique.'),
+        ('origin_unique', 'UNIQUE(origin_id)', 'A session can only be archived once.'),
+    ]
+
+    def _compute_payload_text(self):
+        for archive in self:
+            archive.payload_text = json.dumps(archive._get_document(), indent=2)
+
+    def _get_document(self):
+        """Return the decompressed archive document"""
+        self.ensure_one()
+        if not self.payload:
+            return {}
+        return json.loads(zlib.decompress(base64.b64decode(self.payload)))
+
+    def _as_session(self):
+        """Rebuild an in-memory quiz.session (with its responses) from the archive"""
+        self.ensure_one()
+        document = self._get_document()
+        vals = {name: self[name] for name in SESSION_SUMMARY_FIELDS}
+        vals['quiz_id'] = self.quiz_id.id
+        vals['user_id'] = self.user_id.id
+        vals['scoring_state'] = 'scored'
+        vals['response_ids'] = [
+            (0, 0, {
+                'question_id': response['question_id'],
+                'answer_data': response['answer_data'],
+                'score': response['score'],
+                'is_correct': response['is_correct'],
+                'score_state': 'scored',
+            })
+            for response in document.get('responses', [])
+        ]
+        return self.env['quiz.session'].new(vals)
+
+    @api.model
+    def _find_session(self, token):
+        """Return the session of a token, from the hot table or the archive"""
+        session = self.env['quiz.session'].search([('session_token', '=', token)], limit=1)
+        if session or not token:
+            return session
+        archive = self.search([('session_token', '=', token)], limit=1)
+        return archive._as_session() if archive else session
+
+    @api.model
+    def _archive_chunk(self, chunk_size):
+        """Archive one chunk of sessions past their quiz retention window
+
+        Returns the number of sessions archived. Locked rows are skipped,
+        so a chunk never waits on sessions being scored or read.
+        """
+        cr = self.env.cr
+        self.env['quiz.session'].flush_model()
+        self.env['quiz.response'].flush_model()
+        cr.execute("""
+            SELECT session.id
+              FROM quiz_session session
+              JOIN quiz_quiz quiz ON quiz.id = session.quiz_id
+             WHERE session.state = 'completed'
+               AND session.scoring_state = 'scored'
+               AND session.counted_as = 'completion'
+               AND quiz.archive_after_days > 0
+               AND session.end_time < now() at time zone 'UTC' - make_interval(days => quiz.archive_after_days)
+          ORDER BY session.id
+             LIMIT %s
+               FOR UPDATE OF session SKIP LOCKED
+        """, [chunk_size])
+        session_ids = [row[0] for row in cr.fetchall()]
+        if not session_ids:
+            return 0
+
+        cr.execute(f"""
+            SELECT id, {', '.join(SESSION_SUMMARY_FIELDS)}
+              FROM quiz_session
+             WHERE id = ANY(%s)
+        """, [session_ids])
+        sessions = cr.dictfetchall()
+
+        responses = {session_id: [] for session_id in session_ids}
+        cr.execute("""
+            SELECT session_id, question_id, answer_data, score, is_correct, create_date
+              FROM quiz_response
+             WHERE session_id = ANY(%s)
+          ORDER BY id
+        """, [session_ids])
+        for session_id, question_id, answer_data, score, is_correct, create_date in cr.fetchall():
+            responses[session_id].append({
+                'question_id': question_id,
+                'answer_data': answer_data,
+                'score': score,
+                'is_correct': is_correct,
+                'create_date': create_date and fields.Datetime.to_string(create_date),
+            })
+
+        now = fields.Datetime.now()
+        rows = []
+        for session in sessions:
+            document = {
+                'version': ARCHIVE_FORMAT_VERSION,
+                'responses': responses[session['id']],
+            }
+            payload = base64.b64encode(zlib.compress(json.dumps(document, separators=(',', ':')).encode()))
+            rows.append((session['id'],) + tuple(session[name] for name in SESSION_SUMMARY_FIELDS)
+                        + (now, payload, now, now))
+
+        columns = ['origin_id'] + SESSION_SUMMARY_FIELDS + ['archived_at', 'payload', 'create_date', 'write_date']
+        execute_values(cr._obj, f"""
+            INSERT INTO quiz_session_archive ({', '.join(columns)})
+                 VALUES %s
+            ON CONFLICT (origin_id) DO NOTHING
+        """, rows)
+        # Responses and answers follow through their ON DELETE CASCADE keys
+        cr.execute("DELETE FROM quiz_session WHERE id = ANY(%s)", [session_ids])
+        return len(session_ids)
+
+    @api.model
+    def _cron_archive_sessions(self, chunk_size=500, max_chunks=40):
+        """Move old completed sessions to the archive, committing after each chunk"""
+        archived = 0
+        for _i in range(max_chunks):
+            count = self._archive_chunk(chunk_size)
+            archived += count
+            # Short transactions: locks are released and progress kept
+            # even if the cron is interrupted
+            self.env.cr.commit()  # pylint: disable=invalid-commit
+            if count < chunk_size:
+                break
+        else:
+            self.env.ref('quiz_engine_pro.ir_cron_archive_sessions')._trigger()
+
+        if archived:
+            self.env['quiz.session'].invalidate_model()
+            self.env['quiz.response'].invalidate_model()
+            _logger.info("Archived %s completed quiz sessions", archived)
+        return archived
@@ -0,0 +1,81 @@
+# Run this script from Odoo shell against a running local server:
+#   exec(open('scripts/frontend_assets_benchmark.py').read())
+#   run_frontend_assets_benchmark(env, ['/quiz/my-quiz/question/1?session=...', ...])
+# Pass page paths of a test quiz, one per question type. Save the figures
+# before a front-end change, then compare the figures after it:
+#   run_frontend_assets_benchmark(env, pages, save_baseline='/tmp/assets_before.json')
+#   run_frontend_assets_benchmark(env, pages, baseline='/tmp/assets_before.json')
+# Without a browser, time to interactive is approximated by the time to
+# download the page and every script and stylesheet it references.
+import json
+import time
+from urllib.parse import urljoin
+
+import requests
+from lxml import html
+
+
+def _transferred(response):
+    """Bytes sent over the wire: the compressed length when there is one"""
+    length = response.headers.get('Content-Length')
+    return int(length) if length else len(response.content)
+
+
+def _is_long_term_cached(response):
+    cache_control = response.headers.get('Cache-Control', '')
+    return 'immutable' in cache_control or 'max-age=31536000' in cache_control
+
+
+def _measure_page(http, base_url, path):
+    start = time.perf_counter()
+    page = http.get(urljoin(base_url, path), headers={'Accept-Encoding': 'gzip'})
+    page.raise_for_status()
+    tree = html.fromstring(page.content)
+    urls = tree.xpath('//script/@src') + tree.xpath('//link[@rel="stylesheet"]/@href')
+
+    stats = {
+        'html_bytes': _transferred(page),
+        'inline_script_bytes': sum(len(script.text or '') for script in tree.xpath('//script[not(@src)]')),
+        'asset_count': len(urls),
+        'asset_bytes': 0,
+        'uncached_asset_bytes': 0,
+    }
+    for url in urls:
+        asset = http.get(urljoin(page.url, url), headers={'Accept-Encoding': 'gzip'})
+        stats['asset_bytes'] += _transferred(asset)
+        if not _is_long_term_cached(asset):
+            # Downloaded again on every visit
+            stats['uncached_asset_bytes'] += _transferred(asset)
+    stats['seconds'] = time.perf_counter() - start
+    stats['total_bytes'] = stats['html_bytes'] + stats['asset_bytes']
+    return stats
+
+
+def run_frontend_assets_benchmark(env, pages, base_url=None, repeat=3, baseline=None, save_baseline=None):
+    """Measure the bytes and load time of ``pages``, the best of ``repeat`` runs"""
+    base_url = base_url or env['ir.config_parameter'].sudo().get_param('web.base.url')
+    http = requests.Session()
+    results = {}
+    for path in pages:
+        runs = [_measure_page(http, base_url, path) for _run in range(repeat)]
+        results[path] = min(runs, key=lambda stats: stats['seconds'])
+
+    previous = {}
+    if baseline:
+        with open(baseline, encoding='utf-8') as file:
+            previous = json.load(file)
+    print(f"{'page':<50}{'total KB':>10}{'assets':>8}{'uncached KB':>13}{'inline KB':>11}{'ms':>8}")
+    for path, stats in results.items():
+        print(f"{path[:49]:<50}{stats['total_bytes'] / 1024:>10.1f}{stats['asset_count']:>8}"
+              f"{stats['uncached_asset_bytes'] / 1024:>13.1f}{stats['inline_script_bytes'] / 1024:>11.1f}"
+              f"{stats['seconds'] * 1000:>8.0f}")
+        before = previous.get(path)
+        if before:
+            print(f"{'  before':<50}{before['total_bytes'] / 1024:>10.1f}{before['asset_count']:>8}"
+                  f"{before['uncached_asset_bytes'] / 1024:>13.1f}{before['inline_script_bytes'] / 1024:>11.1f}"
+                  f"{before['seconds'] * 1000:>8.0f}")
+
+    if save_baseline:
+        with open(save_baseline, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    return results
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""Simulate concurrent quiz takers against a local Odoo instance
+
+Standard library only, so it runs offline. Each simulated participant
+opens the quiz page, starts a session, answers every question (GET then
+POST) or submits the single page payload, and opens the results.
+
+Example, 2000 participants starting at once with 200 in flight::
+
+    python scripts/load_test.py --base-url http://localhost:8069 --slug demo-quiz \\
+        --participants 2000 --arrival herd --concurrency 200 --output run.json
+
+Latency percentiles and errors are reported per route. Database query
+counts come from the Odoo server log (``--server-log``): the werkzeug
+access lines end with the query count and time of each request. Seed a
+database with ``scripts/load_test_seed.py``. Compare runs with
+``--compare previous.json``. With ``--autosaves N``, every paged answer
+is preceded by N autosave calls, as a student typing would send; the
+autosave metrics of the server then show how many row writes they cost.
+"""
+import argparse
+import http.cookiejar
+import json
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Route templates, in the order they are matched against request paths
+ROUTES = [
+    ('results', re.compile(r'^/quiz/session/[^/]+/results$')),
+    ('payload', re.compile(r'^/quiz/session/[^/]+/payload$')),
+    ('submit', re.compile(r'^/quiz/session/[^/]+/submit$')),
+    ('autosave', re.compile(r'^/quiz/session/[^/]+/autosave$')),
+    ('start', re.compile(r'^/quiz/[^/]+/start$')),
+    ('play', re.compile(r'^/quiz/[^/]+/play$')),
+    ('question', re.compile(r'^/quiz/[^/]+/question/\d+$')),
+    ('detail', re.compile(r'^/quiz/[^/]+$')),
+    ('list', re.compile(r'^/quiz$')),
+]
+ACCESS_LOG = re.compile(r'"(GET|POST) (\S+) HTTP/[\d.]+" (\d{3}) - (\d+) ([\d.]+) ([\d.]+)')
+QUESTION_ID = re.compile(r'data-question-id="(\d+)"')
+RADIO_VALUE = re.compile(r'name="answer_data"[^>]*value="([^"]*)"|value="([^"]*)"[^>]*name="answer_data"')
+
+
+def route_name(method, path):
+    path = urllib.parse.urlsplit(path).path
+    for name, pattern in ROUTES:
+        if pattern.match(path):
+            return f'{method} {name}'
+    return f'{method} other'
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class Recorder:
+    """Thread-safe collection of request timings"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.participants_done = 0
+        self.participants_failed = 0
+
+    def record(self, route, seconds, ok):
+        with self.lock:
+            self.latencies[route].append(seconds)
+            if not ok:
+                self.errors[route] += 1
+
+    def finish(self, ok):
+        with self.lock:
+            if ok:
+                self.participants_done += 1
+            else:
+                self.participants_failed += 1
+
+
+class Participant:
+
+    def __init__(self, args, recorder, number):
+        self.args = args
+        self.recorder = recorder
+        self.number = number
+        self.random = random.Random(args.seed + number)
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), NoRedirect)
+
+    def request(self, method, path, data=None, json_body=None):
+        """Send a request, return ``(status, location, body)``"""
+        url = self.args.base_url.rstrip('/') + path
+        headers = {}
+        if json_body is not None:
+            data = json.dumps(json_body).encode()
+            headers['Content-Type'] = 'application/json'
+        elif data is not None:
+            data = urllib.parse.urlencode(data, doseq=True).encode()
+        request = urllib.request.Request(url, data=data, method=method, headers=headers)
+        route = route_name(method, path)
+        start = time.perf_counter()
+        try:
+            with self.opener.open(request, timeout=self.args.timeout) as response:
+                body = response.read()
+                status, location = response.status, response.headers.get('Location')
+        except urllib.error.HTTPError as error:
+            body = error.read()
+            status, location = error.code, error.headers.get('Location')
+        except OSError:
+            self.recorder.record(route, time.perf_counter() - start, False)
+            raise
+        self.recorder.record(route, time.perf_counter() - start, status < 400)
+        if status >= 400:
+            raise RuntimeError(f'{method} {path} returned {status}')
+        return status, location and urllib.parse.urlsplit(location), body.decode('utf-8', 'replace')
+
+    def run(self):
+        slug = self.args.slug
+        self.request('GET', f'/quiz/{slug}')
+        _status, location, _body = self.request('POST', f'/quiz/{slug}/start', {
+            'participant_name': f'Load Test {self.number}',
+            'participant_email': f'load{self.number}@example.com',
+        })
+        if not location:
+            raise RuntimeError('start did not redirect')
+        token = urllib.parse.parse_qs(location.query).get('session', [''])[0]
+        if location.path.endswith('/play'):
+            self.run_single_page(location, token)
+        else:
+            self.run_paged(location, token)
+        self.request('GET', f'/quiz/session/{token}/results')
+
+    def run_paged(self, location, token):
+        path = location.path
+        for _i in range(self.args.max_questions):
+            _status, _location, body = self.request('GET', f'{path}?session={token}')
+            self.think()
+            answer = self.pick_answer(body)
+            question_id = QUESTION_ID.search(body)
+            for number in range(self.args.autosaves if question_id else 0):
+                self.request('POST', f'/quiz/session/{token}/autosave', json_body={
+                    'jsonrpc': '2.0', 'method': 'call', 'params': {
+                        'question_id': int(question_id.group(1)),
+                        'form_data': {'answer_data': answer[:number + 1]},
+                    }})
+            _status, location, _body = self.request('POST', f'{path}?session={token}', {
+                'answer_data': answer,
+            })
+            if not location or '/results' in location.path:
+                return
+            path = location.path
+        raise RuntimeError('too many questions, is the quiz looping?')
+
+    def run_single_page(self, location, token):
+        self.request('GET', f'{location.path}?session={token}')
+        _status, _location, body = self.request('GET', f'/quiz/session/{token}/payload')
+        answers = {}
+        for question in json.loads(body).get('questions', []):
+            choices = question.get('choices') or []
+            if choices:
+                answers[str(question['id'])] = self.random.choice(choices)['id']
+        self.think()
+        self.request('POST', f'/quiz/session/{token}/submit',
+                     json_body={'jsonrpc': '2.0', 'method': 'call', 'params': {'answers': answers}})
+
+    def pick_answer(self, body):
+        values = [first or second for first, second in RADIO_VALUE.findall(body) if first or second]
+        return self.random.choice(values) if values else 'load test answer'
+
+    def think(self):
+        if self.args.think_time:
+            time.sleep(self.random.uniform(0, self.args.think_time))
+
+
+def arrival_offsets(args):
+    """Start offset in seconds of every participant for the arrival curve"""
+    count = args.participants
+    if args.arrival == 'herd':
+        # Everyone within the herd window, e.g. the exam start time
+        return [args.herd_window * index / count for index in range(count)]
+    if args.arrival == 'trickle':
+        return [index / args.rate for index in range(count)]
+    # ramp: the arrival rate grows linearly to reach every participant by --duration
+    return [args.duration * (index / count) ** 0.5 for index in range(count)]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def parse_server_log(path, since):
+    """Aggregate query counts and times per route from Odoo werkzeug access lines"""
+    queries = defaultdict(list)
+    query_times = defaultdict(list)
+    with open(path, encoding='utf-8', errors='replace') as log:
+        log.seek(since)
+        for line in log:
+            match = ACCESS_LOG.search(line)
+            if not match:
+                continue
+            method, path, _status, count, query_time, _other_time = match.groups()
+            route = route_name(method, path)
+            queries[route].append(int(count))
+            query_times[route].append(float(query_time))
+    return {
+        route: {
+            'queries_mean': statistics.mean(counts),
+            'queries_max': max(counts),
+            'query_time_mean': statistics.mean(query_times[route]),
+        }
+        for route, counts in queries.items()
+    }
+
+
+def build_report(args, recorder, elapsed, sql):
+    routes = {}
+    for route, latencies in sorted(recorder.latencies.items()):
+        routes[route] = {
+            'requests': len(latencies),
+            'errors': recorder.errors.get(route, 0),
+            'p50': percentile(latencies, 0.50),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99),
+            'max': max(latencies),
+            **sql.get(route, {}),
+        }
+    total = sum(len(latencies) for latencies in recorder.latencies.values())
+    return {
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'elapsed': elapsed,
+        'requests': total,
+        'requests_per_second': total / elapsed if elapsed else 0.0,
+        'participants_done': recorder.participants_done,
+        'participants_failed': recorder.participants_failed,
+        'routes': routes,
+    }
+
+
+def print_report(report, previous=None):
+    print(f"{report['participants_done']} participants done, {report['participants_failed']} failed, "
+          f"{report['requests']} requests in {report['elapsed']:.1f}s "
+          f"({report['requests_per_second']:.1f} req/s)")
+    header = f"{'route':<18}{'requests':>9}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    if any('queries_mean' in stats for stats in report['routes'].values()):
+        header += f"{'queries':>9}"
+    print(header)
+    for route, stats in report['routes'].items():
+        line = (f"{route:<18}{stats['requests']:>9}{stats['errors']:>8}{stats['p50'] * 1000:>9.1f}"
+                f"{stats['p95'] * 1000:>9.1f}{stats['p99'] * 1000:>9.1f}")
+        if 'queries_mean' in stats:
+            line += f"{stats['queries_mean']:>9.1f}"
+        previous_stats = previous and previous['routes'].get(route)
+        if previous_stats and previous_stats['p95']:
+            line += f"   p95 {(stats['p95'] / previous_stats['p95'] - 1) * 100:+.0f}%"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n', 1)[0])
+    parser.add_argument('--base-url', default='http://localhost:8069')
+    parser.add_argument('--slug', required=True, help='Slug of a published quiz')
+    parser.add_argument('--participants', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=50, help='Participants in flight at most')
+    parser.add_argument('--arrival', choices=['herd', 'trickle', 'ramp'], default='herd')
+    parser.add_argument('--herd-window', type=float, default=0.0, help='Seconds over which the herd arrives')
+    parser.add_argument('--rate', type=float, default=10.0, help='Arrivals per second for trickle')
+    parser.add_argument('--duration', type=float, default=60.0, help='Seconds to reach everyone for ramp')
+    parser.add_argument('--think-time', type=float, default=0.0, help='Max seconds spent on a question')
+    parser.add_argument('--max-questions', type=int, default=500)
+    parser.add_argument('--autosaves', type=int, default=0, help='Autosave calls before each paged answer')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--server-log', help='Odoo log file to read query counts from')
+    parser.add_argument('--output', help='Write the report as JSON to this file')
+    parser.add_argument('--compare', help='Previous JSON report to compare p95 latencies with')
+    args = parser.parse_args(argv)
+
+    log_offset = 0
+    if args.server_log:
+        with open(args.server_log, 'rb') as log:
+            log_offset = log.seek(0, 2)
+
+    recorder = Recorder()
+    offsets = arrival_offsets(args)
+    start = time.perf_counter()
+
+    def simulate(number):
+        delay = start + offsets[number] - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            Participant(args, recorder, number).run()
+        except (OSError, RuntimeError, ValueError) as error:
+            recorder.finish(False)
+            if args.participants <= 10:
+                print(f'participant {number}: {error}', file=sys.stderr)
+        else:
+            recorder.finish(True)
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(simulate, range(args.participants)))
+    elapsed = time.perf_counter() - start
+
+    sql = parse_server_log(args.server_log, log_offset) if args.server_log else {}
+    report = build_report(args, recorder, elapsed, sql)
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            previous = json.load(file)
+    print_report(report, previous)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+    return 0 if not report['participants_failed'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,25 @@
+# Run this script from Odoo shell to seed a quiz for scripts/load_test.py:
+#   exec(open('scripts/load_test_seed.py').read()); seed_load_test_quiz(env); env.cr.commit()
+def seed_load_test_quiz(env, slug='load-test', question_count=20, choice_count=4, delivery_mode='paged'):
+    """Create (or replace) a published multiple choice quiz to load test against"""
+    Quiz = env['quiz.quiz']
+    Quiz.search([('slug', '=', slug)]).unlink()
+    quiz = Quiz.create({
+        'name': 'Load Test Quiz',
+        'slug': slug,
+        'published': True,
+        'delivery_mode': delivery_mode,
+    })
+    env['quiz.question'].create([{
+        'quiz_id': quiz.id,
+        'sequence': number,
+        'type': 'mcq_single',
+        'question_html': f'<p>Load test question {number}</p>',
+        'points': 1.0,
+        'choice_ids': [(0, 0, {
+            'sequence': choice,
+            'text': f'Choice {choice}',
+            'is_correct': choice == 0,
+        }) for choice in range(choice_count)],
+    } for number in range(question_count)])
+    return quiz
@@ -0,0 +1,42 @@
+# Run this script from Odoo shell to measure the cost of the quiz instrumentation:
+#   exec(open('scripts/metrics_overhead.py').read()); measure_metrics_overhead(env)
+import time
+
+
+def measure_metrics_overhead(env, iterations=20000, rounds=5):
+    """Compare evaluate_answer with instrumentation off and on, per question type
+
+    Returns ``{question_type: overhead in percent}`` using the best of
+    ``rounds`` runs of each mode; the budget is 2%.
+    """
+    Param = env['ir.config_parameter'].sudo()
+    previous = Param.get_param('quiz_engine_pro.metrics_enabled', 'False')
+    questions = {}
+    for question in env['quiz.question'].search([]):
+        questions.setdefault(question.type, question)
+    responses = env['quiz.response'].search([('answer_data', '!=', False)], limit=1000)
+    answers = {response.question_id.type: response.answer_data for response in responses}
+
+    def best_time(question, answer):
+        timings = []
+        for _round in range(rounds):
+            start = time.perf_counter()
+            for _i in range(iterations):
+                question.evaluate_answer(answer)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    overhead = {}
+    try:
+        for question_type, question in questions.items():
+            answer = answers.get(question_type)
+            Param.set_param('quiz_engine_pro.metrics_enabled', 'False')
+            disabled = best_time(question, answer)
+            Param.set_param('quiz_engine_pro.metrics_enabled', 'True')
+            enabled = best_time(question, answer)
+            overhead[question_type] = (enabled / disabled - 1) * 100
+            print(f"{question_type:<16} off {disabled / iterations * 1e6:8.2f} us  "
+                  f"on {enabled / iterations * 1e6:8.2f} us  overhead {overhead[question_type]:+.1f}%")
+    finally:
+        Param.set_param('quiz_engine_pro.metrics_enabled', previous)
+    return overhead
@@ -0,0 +1,115 @@
+# Run this script from Odoo shell on a local database:
+#   exec(open('scripts/score_totals_benchmark.py').read()); run_score_totals_benchmark(env)
+# Compares the incremental session totals with the former full re-sum,
+# on sessions answering a 200 question quiz one question at a time.
+# Everything is created in a savepoint that is rolled back.
+import time
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _legacy_update_score_totals(sessions):
+    """Session totals as they were computed before score deltas: re-sum every response"""
+    env = sessions.env
+    env['quiz.response'].flush_model(['session_id', 'score', 'score_state'])
+    env.cr.execute("""
+        SELECT session_id, SUM(score), BOOL_OR(score_state = 'pending')
+          FROM quiz_response
+         WHERE session_id IN %s
+      GROUP BY session_id
+    """, [tuple(sessions.ids)])
+    totals = {session_id: (total, pending) for session_id, total, pending in env.cr.fetchall()}
+    for session in sessions:
+        total_score, pending = totals.get(session.id, (0.0, False))
+        max_score = session.quiz_id.total_points
+        session.write({
+            'total_score': total_score,
+            'max_score': max_score,
+            'percentage': (total_score / max_score * 100) if max_score > 0 else 0,
+            'scoring_state': 'scored' if session.state == 'completed' and not pending else 'pending',
+        })
+    env.flush_all()
+
+
+def _incremental_update_score_totals(sessions, deltas):
+    sessions.env['quiz.session']._apply_score_deltas(deltas)
+    sessions._mark_scored()
+    sessions.env.flush_all()
+
+
+def _run(env, mode, question_count, session_count):
+    quiz = env['quiz.quiz'].create({'name': f'Score Totals Benchmark {mode}', 'slug': f'score-totals-benchmark-{mode}'})
+    questions = env['quiz.question'].create([{
+        'quiz_id': quiz.id,
+        'sequence': number,
+        'type': 'mcq_single',
+        'question_html': f'<p>Question {number}</p>',
+        'choice_ids': [(0, 0, {'text': 'Right', 'is_correct': True}), (0, 0, {'text': 'Wrong'})],
+    } for number in range(question_count)])
+    sessions = env['quiz.session'].create([{
+        'quiz_id': quiz.id,
+        'session_token': f'score-totals-benchmark-{mode}-{number}',
+    } for number in range(session_count)])
+    for session in sessions:
+        session.start_session()
+    env.flush_all()
+
+    Response = env['quiz.response']
+    seconds = 0.0
+    queries = 0
+    for question in questions:
+        # Every session answers the next question, the scoring cron then runs
+        correct = question.choice_ids.filtered('is_correct').id
+        responses = Response.create([{
+            'session_id': session.id,
+            'question_id': question.id,
+            'answer_data': correct,
+        } for session in sessions])
+        env.flush_all()
+        scores = question._score_answers_batch(responses.mapped('answer_data')).tolist()
+        deltas = Response._write_scores(responses.ids, scores)
+        env.invalidate_all()
+
+        start_queries = env.cr.sql_log_count
+        start = time.perf_counter()
+        if mode == 'legacy':
+            _legacy_update_score_totals(sessions)
+        else:
+            _incremental_update_score_totals(sessions, deltas)
+        seconds += time.perf_counter() - start
+        queries += env.cr.sql_log_count - start_queries
+
+    sessions.invalidate_recordset()
+    totals = sorted(set(sessions.mapped('total_score')))
+    return {
+        'seconds': seconds,
+        'queries': queries,
+        'updates': question_count,
+        'ms_per_update': seconds / question_count * 1000,
+        'queries_per_update': queries / question_count,
+        'totals': totals,
+    }
+
+
+def run_score_totals_benchmark(env, question_count=200, session_count=50):
+    """Time the session total maintenance of both strategies, return their figures"""
+    results = {}
+    for mode in ('legacy', 'incremental'):
+        try:
+            with env.cr.savepoint():
+                results[mode] = _run(env, mode, question_count, session_count)
+                raise _Rollback()
+        except _Rollback:
+            pass
+        finally:
+            env.invalidate_all()
+            env['quiz.question']._invalidate_question_caches()
+
+    for mode, stats in results.items():
+        print(f"{mode:<12}{stats['ms_per_update']:>10.2f} ms/update{stats['queries_per_update']:>10.1f} queries/update"
+              f"   totals {stats['totals']}")
+    if results['legacy']['totals'] != results['incremental']['totals']:
+        raise AssertionError('Both strategies must end with the same session totals')
+    return results
@@ -0,0 +1,91 @@
+// Autosave: restore the last saved state of the question form, then send
+// its fields, debounced, while the student answers
+(function() {
+    "use strict";
+
+    var DEBOUNCE_DELAY = 1500;
+
+    document.addEventListener('DOMContentLoaded', function() {
+        var form = document.querySelector('.question-form[data-autosave-url]');
+        if (!form) return;
+
+        restore(form, JSON.parse(form.getAttribute('data-autosave') || '{}'));
+
+        var timer = null;
+        var lastSent = JSON.stringify(collect(form));
+
+        function save(keepalive) {
+            clearTimeout(timer);
+            timer = null;
+            var formData = collect(form);
+            var serialized = JSON.stringify(formData);
+            if (serialized === lastSent) return;
+            lastSent = serialized;
+            fetch(form.getAttribute('data-autosave-url'), {
+                method: 'POST',
+                credentials: 'same-origin',
+                keepalive: keepalive,
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({
+                    jsonrpc: '2.0',
+                    method: 'call',
+                    params: {
+                        question_id: parseInt(form.getAttribute('data-question-id')),
+                        form_data: formData
+                    }
+                })
+            }).catch(function() {
+                // Sent again with the next change
+                lastSent = null;
+            });
+        }
+
+        function schedule() {
+            clearTimeout(timer);
+            timer = setTimeout(save, DEBOUNCE_DELAY);
+        }
+
+        form.addEventListener('input', schedule);
+        form.addEventListener('change', schedule);
+        // Hidden fields filled by the question scripts change without events
+        form.addEventListener('click', schedule);
+        form.addEventListener('drop', schedule);
+        document.addEventListener('visibilitychange', function() {
+            if (document.visibilityState === 'hidden' && timer) save(true);
+        });
+        form.addEventListener('submit', function() {
+            clearTimeout(timer);
+        });
+    });
+
+    function collect(form) {
+        var data = {};
+        for (var i = 0; i < form.elements.length; i++) {
+            var field = form.elements[i];
+            if (!field.name || field.name === 'session' || field.disabled) continue;
+            if (field.type === 'checkbox' && field.name === 'answer_data') {
+                data[field.name] = data[field.name] || [];
+                if (field.checked) data[field.name].push(field.value);
+            } else if (field.type === 'radio' || field.type === 'checkbox') {
+                if (field.checked) data[field.name] = field.value;
+            } else if (field.type !== 'submit' && field.type !== 'button') {
+                data[field.name] = field.value;
+            }
+        }
+        return data;
+    }
+
+    function restore(form, data) {
+        // Hidden fields mirror widgets that rebuild their own state
+        for (var i = 0; i < form.elements.length; i++) {
+            var field = form.elements[i];
+            if (!(field.name in data) || field.type === 'hidden') continue;
+            var value = data[field.name];
+            if (field.type === 'radio' || field.type === 'checkbox') {
+                field.checked = Array.isArray(value) ? value.indexOf(field.value) !== -1 : value === field.value;
+            } else if (typeof value === 'string') {
+                field.value = value;
+            }
+        }
+    }
+})();
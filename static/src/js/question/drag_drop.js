@@ -0,0 +1,76 @@
+// Drag and drop into zones, into text and match pairs: move the tokens
+// into the drop zones and store the placements in drag_drop_data
+(function() {
+    "use strict";
+
+    document.addEventListener('DOMContentLoaded', function() {
+        var questions = document.querySelectorAll('.quiz-drag-drop');
+        for (var i = 0; i < questions.length; i++) {
+            setupDragDrop(questions[i]);
+        }
+    });
+
+    function setupDragDrop(question) {
+        var tokens = question.querySelectorAll('.draggable-token');
+        var dropZones = question.querySelectorAll('.drop-zone');
+        var tokensContainer = question.querySelector('.tokens-container');
+        var hiddenField = question.querySelector('input[name="drag_drop_data"]');
+
+        for (var i = 0; i < tokens.length; i++) {
+            tokens[i].setAttribute('draggable', 'true');
+            tokens[i].addEventListener('dragstart', function(e) {
+                e.dataTransfer.setData('text/plain', this.getAttribute('data-token-id'));
+                this.classList.add('dragging');
+            });
+            tokens[i].addEventListener('dragend', function() {
+                this.classList.remove('dragging');
+            });
+        }
+
+        for (var j = 0; j < dropZones.length; j++) {
+            dropZones[j].addEventListener('dragover', function(e) {
+                e.preventDefault();
+                this.classList.add('drag-over');
+            });
+            dropZones[j].addEventListener('dragleave', function() {
+                this.classList.remove('drag-over');
+            });
+            dropZones[j].addEventListener('drop', function(e) {
+                e.preventDefault();
+                this.classList.remove('drag-over');
+                var tokenId = e.dataTransfer.getData('text/plain');
+                var token = question.querySelector('.draggable-token[data-token-id="' + tokenId + '"]');
+                if (token) {
+                    this.appendChild(token);
+                    updateFormData();
+                }
+            });
+        }
+
+        var resetButton = question.querySelector('.reset-tokens');
+        if (resetButton && tokensContainer) {
+            resetButton.addEventListener('click', function() {
+                for (var i = 0; i < tokens.length; i++) {
+                    tokensContainer.appendChild(tokens[i]);
+                }
+                updateFormData();
+            });
+        }
+
+        function updateFormData() {
+            var data = [];
+            for (var i = 0; i < dropZones.length; i++) {
+                var zoneTokens = dropZones[i].querySelectorAll('.draggable-token');
+                for (var j = 0; j < zoneTokens.length; j++) {
+                    data.push({
+                        token_id: zoneTokens[j].getAttribute('data-token-id'),
+                        zone_id: dropZones[i].getAttribute('data-zone-id')
+                    });
+                }
+            }
+            if (hiddenField) {
+                hiddenField.value = JSON.stringify(data);
+            }
+        }
+    }
+})();
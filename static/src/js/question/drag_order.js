@@ -0,0 +1,67 @@
+// Drag and drop ordering: reorder the items with HTML5 drag and drop and
+// store the item ids in order in sequence_order_data
+(function() {
+    "use strict";
+
+    document.addEventListener('DOMContentLoaded', function() {
+        var questions = document.querySelectorAll('.drag-order-question');
+        for (var i = 0; i < questions.length; i++) {
+            setupDragOrder(questions[i]);
+        }
+    });
+
+    function setupDragOrder(question) {
+        var list = question.querySelector('.list-group');
+        var hiddenInput = question.querySelector('input[name="sequence_order_data"]');
+        if (!list || !hiddenInput) return;
+
+        var dragged = null;
+        var items = list.querySelectorAll('.sequence-item');
+        for (var i = 0; i < items.length; i++) {
+            var item = items[i];
+            item.addEventListener('dragstart', function(e) {
+                dragged = this;
+                e.dataTransfer.effectAllowed = 'move';
+                e.dataTransfer.setData('text/plain', this.getAttribute('data-item-id'));
+                this.classList.add('dragging');
+            });
+            item.addEventListener('dragend', function() {
+                this.classList.remove('dragging');
+                dragged = null;
+            });
+            item.addEventListener('dragover', function(e) {
+                e.preventDefault();
+            });
+            item.addEventListener('dragenter', function() {
+                this.classList.add('sortable-ghost');
+            });
+            item.addEventListener('dragleave', function() {
+                this.classList.remove('sortable-ghost');
+            });
+            item.addEventListener('drop', function(e) {
+                e.preventDefault();
+                e.stopPropagation();
+                this.classList.remove('sortable-ghost');
+                if (!dragged || dragged === this) return;
+
+                var siblings = Array.prototype.slice.call(list.querySelectorAll('.sequence-item'));
+                if (siblings.indexOf(dragged) < siblings.indexOf(this)) {
+                    list.insertBefore(dragged, this.nextSibling);
+                } else {
+                    list.insertBefore(dragged, this);
+                }
+                updateOrder(list, hiddenInput);
+            });
+        }
+        updateOrder(list, hiddenInput);
+    }
+
+    function updateOrder(list, hiddenInput) {
+        var items = list.querySelectorAll('.sequence-item');
+        var order = [];
+        for (var i = 0; i < items.length; i++) {
+            order.push(items[i].getAttribute('data-item-id'));
+        }
+        hiddenInput.value = JSON.stringify(order);
+    }
+})();
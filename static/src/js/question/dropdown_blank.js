@@ -0,0 +1,34 @@
+// Dropdowns in text: store the selected option of every blank in
+// dropdown_blank_data
+(function() {
+    "use strict";
+
+    document.addEventListener('DOMContentLoaded', function() {
+        var questions = document.querySelectorAll('.dropdown-blank-question');
+        for (var i = 0; i < questions.length; i++) {
+            setupDropdowns(questions[i]);
+        }
+    });
+
+    function setupDropdowns(question) {
+        var selects = question.querySelectorAll('.dropdown-blank-select');
+        var hiddenField = question.querySelector('input[name="dropdown_blank_data"]');
+
+        for (var i = 0; i < selects.length; i++) {
+            selects[i].addEventListener('change', function() {
+                var data = [];
+                for (var j = 0; j < selects.length; j++) {
+                    if (selects[j].value) {
+                        data.push({
+                            blank_id: parseInt(selects[j].getAttribute('data-blank-id')),
+                            option_id: selects[j].value
+                        });
+                    }
+                }
+                if (hiddenField) {
+                    hiddenField.value = JSON.stringify(data);
+                }
+            });
+        }
+    }
+})();
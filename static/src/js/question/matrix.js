@@ -0,0 +1,31 @@
+// Matrix questions: keep the answer_data field in sync with the ticked cells
+(function() {
+    "use strict";
+
+    document.addEventListener('DOMContentLoaded', function() {
+        var questions = document.querySelectorAll('.matrix-question');
+        for (var i = 0; i < questions.length; i++) {
+            setupMatrix(questions[i]);
+        }
+    });
+
+    function setupMatrix(question) {
+        var hiddenField = question.querySelector('input[name="answer_data"]');
+        if (!hiddenField) {
+            hiddenField = document.createElement('input');
+            hiddenField.type = 'hidden';
+            hiddenField.name = 'answer_data';
+            question.appendChild(hiddenField);
+        }
+
+        var matrixData = {};
+        var cells = question.querySelectorAll('.matrix-cell');
+        for (var i = 0; i < cells.length; i++) {
+            cells[i].addEventListener('change', function() {
+                var cellKey = 'cell_' + this.getAttribute('data-row-id') + '_' + this.getAttribute('data-col-id');
+                matrixData[cellKey] = this.checked;
+                hiddenField.value = JSON.stringify(matrixData);
+            });
+        }
+    }
+})();
@@ -1,11 +1,10 @@
-// Very simple sequence button handlers
+// Step sequencing: move the steps with the arrow buttons and store the
+// positions in sequence_data
 (function() {
     "use strict";
 
     // Run when DOM is loaded
     document.addEventListener('DOMContentLoaded', function() {
-        console.log('Sequence buttons initialized');
-        
         // Setup the buttons
         setupButtons();
         
@@ -126,7 +125,6 @@
         var input = container.querySelector('input[name="sequence_data"]');
         if (input) {
             input.value = JSON.stringify(data);
-            console.log("Updated sequence data:", input.value);
         }
     }
 })();
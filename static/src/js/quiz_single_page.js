@@ -0,0 +1,296 @@
+// Single page quiz: load the whole quiz once, render it locally and
+// submit every answer in one request
+(function() {
+    "use strict";
+
+    document.addEventListener('DOMContentLoaded', function() {
+        var root = document.querySelector('.quiz-single-page');
+        if (!root) return;
+
+        var container = root.querySelector('.quiz-single-page-questions');
+        var submitButton = root.querySelector('.quiz-single-page-submit');
+        var questions = [];
+
+        fetch(root.getAttribute('data-payload-url'), {credentials: 'same-origin'})
+            .then(function(response) {
+                if (!response.ok) throw new Error('Could not load the quiz');
+                return response.json();
+            })
+            .then(function(payload) {
+                questions = payload.questions;
+                container.innerHTML = '';
+                for (var i = 0; i < questions.length; i++) {
+                    container.appendChild(renderQuestion(questions[i], i));
+                }
+                submitButton.disabled = false;
+            })
+            .catch(showError);
+
+        submitButton.addEventListener('click', function() {
+            submitButton.disabled = true;
+            var answers = {};
+            for (var i = 0; i < questions.length; i++) {
+                var answer = collectAnswer(questions[i]);
+                if (answer !== null) {
+                    answers[questions[i].id] = answer;
+                }
+            }
+
+            fetch(root.getAttribute('data-submit-url'), {
+                method: 'POST',
+                credentials: 'same-origin',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({jsonrpc: '2.0', method: 'call', params: {answers: answers}})
+            })
+                .then(function(response) { return response.json(); })
+                .then(function(data) {
+                    var result = data.result || {};
+                    if (result.redirect) {
+                        window.location.href = result.redirect;
+                    } else if (result.error === 'expired') {
+                        throw new Error('The time limit of this quiz has passed');
+                    } else {
+                        throw new Error('Your answers could not be submitted');
+                    }
+                })
+                .catch(function(error) {
+                    submitButton.disabled = false;
+                    showError(error);
+                });
+        });
+
+        function showError(error) {
+            var alert = root.querySelector('.quiz-single-page-error');
+            alert.textContent = error.message;
+            alert.classList.remove('d-none');
+        }
+    });
+
+    function el(tag, className, text) {
+        var node = document.createElement(tag);
+        if (className) node.className = className;
+        if (text !== undefined) node.textContent = text;
+        return node;
+    }
+
+    function select(name, options, placeholder) {
+        var node = el('select', 'form-select d-inline w-auto mx-1');
+        node.name = name;
+        node.appendChild(new Option(placeholder || 'Select...', ''));
+        for (var i = 0; i < options.length; i++) {
+            node.appendChild(new Option(options[i].label, options[i].value));
+        }
+        return node;
+    }
+
+    function labels(values) {
+        return values.map(function(value) { return {label: value, value: value}; });
+    }
+
+    function renderQuestion(question, index) {
+        var card = el('div', 'card mb-4 quiz-single-page-question');
+        card.setAttribute('data-question-id', question.id);
+        var body = el('div', 'card-body');
+        card.appendChild(body);
+
+        body.appendChild(el('h4', '', 'Question ' + (index + 1)));
+        var text = el('div', 'question-text mb-3');
+        text.innerHTML = question.question_html;
+        body.appendChild(text);
+        body.appendChild(el('small', 'text-muted d-block mb-3', 'Points: ' + question.points));
+
+        var name = 'q_' + question.id;
+        var i;
+        switch (question.type) {
+            case 'mcq_single':
+            case 'mcq_multiple':
+                for (i = 0; i < question.choices.length; i++) {
+                    var choice = question.choices[i];
+                    var row = el('div', 'form-check mb-2');
+                    var input = el('input', 'form-check-input');
+                    input.type = question.type === 'mcq_single' ? 'radio' : 'checkbox';
+                    input.name = name;
+                    input.value = choice.id;
+                    input.id = name + '_' + choice.id;
+                    var label = el('label', 'form-check-label', choice.text);
+                    label.htmlFor = input.id;
+                    row.appendChild(input);
+                    row.appendChild(label);
+                    body.appendChild(row);
+                }
+                break;
+            case 'fill_blank':
+                for (i = 0; i < question.blanks.length; i++) {
+                    var group = el('div', 'form-group mb-3');
+                    group.appendChild(el('label', '', 'Blank ' + question.blanks[i] + ':'));
+                    var blank = el('input', 'form-control');
+                    blank.type = 'text';
+                    blank.name = name + '_' + question.blanks[i];
+                    blank.setAttribute('data-blank', question.blanks[i]);
+                    group.appendChild(blank);
+                    body.appendChild(group);
+                }
+                break;
+            case 'match':
+                for (i = 0; i < question.left_items.length; i++) {
+                    var pair = el('div', 'mb-2');
+                    pair.appendChild(el('span', 'me-2', question.left_items[i].text));
+                    var right = select(name + '_' + question.left_items[i].id, labels(question.right_items));
+                    right.setAttribute('data-pair-id', question.left_items[i].id);
+                    pair.appendChild(right);
+                    body.appendChild(pair);
+                }
+                break;
+            case 'drag_zone':
+            case 'drag_text':
+            case 'drag_into_text':
+                for (i = 0; i < question.zones.length; i++) {
+                    var zone = el('div', 'mb-2');
+                    zone.appendChild(el('span', 'me-2', 'Zone ' + question.zones[i]));
+                    var token = select(name + '_' + question.zones[i], labels(question.tokens));
+                    token.setAttribute('data-zone', question.zones[i]);
+                    zone.appendChild(token);
+                    body.appendChild(zone);
+                }
+                break;
+            case 'dropdown_blank':
+                var paragraph = el('div', 'inline-dropdowns-text');
+                for (i = 0; i < question.segments.length; i++) {
+                    var segment = question.segments[i];
+                    if (segment[0] === 'text') {
+                        paragraph.appendChild(el('span', '', segment[1]));
+                    } else if (segment[0] === 'blank') {
+                        var options = segment[3].map(function(option) {
+                            return {label: option[1], value: option[0]};
+                        });
+                        var dropdown = select(name + '_' + segment[1], options);
+                        dropdown.setAttribute('data-blank-id', segment[2]);
+                        paragraph.appendChild(dropdown);
+                    } else {
+                        paragraph.appendChild(el('span', 'badge bg-warning', 'Blank {{' + segment[1] + '}}'));
+                    }
+                }
+                body.appendChild(paragraph);
+                break;
+            case 'matrix':
+                var table = el('table', 'table table-bordered');
+                var head = table.createTHead().insertRow();
+                head.appendChild(el('th'));
+                for (i = 0; i < question.columns.length; i++) {
+                    head.appendChild(el('th', 'text-center', question.columns[i].name));
+                }
+                var tbody = table.createTBody();
+                for (i = 0; i < question.rows.length; i++) {
+                    var tr = tbody.insertRow();
+                    tr.appendChild(el('th', '', question.rows[i].name));
+                    for (var j = 0; j < question.columns.length; j++) {
+                        var cell = el('input', 'form-check-input matrix-cell');
+                        cell.type = 'checkbox';
+                        cell.setAttribute('data-cell', 'cell_' + question.rows[i].id + '_' + question.columns[j].id);
+                        var td = tr.insertCell();
+                        td.className = 'text-center';
+                        td.appendChild(cell);
+                    }
+                }
+                body.appendChild(table);
+                break;
+            case 'step_sequence':
+                var steps = question.steps.slice();
+                for (i = steps.length - 1; i > 0; i--) {
+                    var k = Math.floor(Math.random() * (i + 1));
+                    var swap = steps[i];
+                    steps[i] = steps[k];
+                    steps[k] = swap;
+                }
+                for (i = 0; i < steps.length; i++) {
+                    var step = el('div', 'mb-2');
+                    step.appendChild(el('span', 'me-2', steps[i].label));
+                    var positions = [];
+                    for (var p = 1; p <= steps.length; p++) {
+                        positions.push({label: String(p), value: p});
+                    }
+                    var position = select(name + '_' + steps[i].id, positions, 'Position');
+                    position.setAttribute('data-step-id', steps[i].id);
+                    step.appendChild(position);
+                    body.appendChild(step);
+                }
+                break;
+            default:
+                var answer = el('input', 'form-control');
+                answer.type = question.type === 'numerical' ? 'number' : 'text';
+                answer.step = 'any';
+                answer.name = name;
+                body.appendChild(answer);
+        }
+        return card;
+    }
+
+    function collectAnswer(question) {
+        var card = document.querySelector('.quiz-single-page-question[data-question-id="' + question.id + '"]');
+        var answer, inputs, i;
+        switch (question.type) {
+            case 'mcq_single':
+                var checked = card.querySelector('input:checked');
+                return checked ? parseInt(checked.value) : null;
+            case 'mcq_multiple':
+                inputs = card.querySelectorAll('input:checked');
+                answer = [];
+                for (i = 0; i < inputs.length; i++) answer.push(parseInt(inputs[i].value));
+                return answer.length ? answer : null;
+            case 'fill_blank':
+                return collectMap(card.querySelectorAll('input[data-blank]'), 'data-blank');
+            case 'match':
+                return collectMap(card.querySelectorAll('select[data-pair-id]'), 'data-pair-id');
+            case 'drag_zone':
+            case 'drag_text':
+            case 'drag_into_text':
+                return collectMap(card.querySelectorAll('select[data-zone]'), 'data-zone');
+            case 'dropdown_blank':
+                inputs = card.querySelectorAll('select[data-blank-id]');
+                answer = [];
+                for (i = 0; i < inputs.length; i++) {
+                    if (inputs[i].value) {
+                        answer.push({
+                            blank_id: parseInt(inputs[i].getAttribute('data-blank-id')),
+                            option_id: parseInt(inputs[i].value)
+                        });
+                    }
+                }
+                return answer.length ? answer : null;
+            case 'matrix':
+                inputs = card.querySelectorAll('input[data-cell]');
+                answer = {};
+                for (i = 0; i < inputs.length; i++) {
+                    answer[inputs[i].getAttribute('data-cell')] = inputs[i].checked;
+                }
+                return answer;
+            case 'step_sequence':
+                inputs = card.querySelectorAll('select[data-step-id]');
+                answer = [];
+                for (i = 0; i < inputs.length; i++) {
+                    if (inputs[i].value) {
+                        answer.push({
+                            step_id: parseInt(inputs[i].getAttribute('data-step-id')),
+                            position: parseInt(inputs[i].value)
+                        });
+                    }
+                }
+                return answer.length ? answer : null;
+            default:
+                var input = card.querySelector('input');
+                return input && input.value ? input.value : null;
+        }
+    }
+
+    function collectMap(inputs, attribute) {
+        var answer = {};
+        var found = false;
+        for (var i = 0; i < inputs.length; i++) {
+            if (inputs[i].value) {
+                answer[inputs[i].getAttribute(attribute)] = inputs[i].value;
+                found = true;
+            }
+        }
+        return found ? answer : null;
+    }
+})();
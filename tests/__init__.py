@@ -0,0 +1,2 @@
+from . import test_evaluator_benchmark
+from . import test_result_snapshot
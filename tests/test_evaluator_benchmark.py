@@ -0,0 +1,231 @@
+"""Evaluator micro-benchmark across question types and sizes
+
+Not part of the standard test run; run it with::
+
+    odoo-bin -d <db> -i quiz_engine_pro --test-tags /quiz_engine_pro:benchmark
+
+It compares every case with ``evaluator_benchmark_baseline.json`` next to
+this file. The committed baseline holds the query counts, which do not
+depend on the machine; throughput and cold query counts are only checked
+once recorded on the target machine with QUIZ_BENCHMARK_SAVE_BASELINE=1,
+which (re)writes the baseline from the current run.
+"""
+import json
+import logging
+import os
+import time
+
+from odoo.tests import TransactionCase, tagged
+
+_logger = logging.getLogger(__name__)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'evaluator_benchmark_baseline.json')
+# Throughput may drop by this fraction before it counts; query counts may not grow at all
+TOLERANCE = 0.3
+MIN_SECONDS = 0.2
+BATCH_SIZE = 1000
+
+# Synthetic question sizes per type (choices, blanks, pairs, tokens, steps, matrix side, words)
+BENCHMARK_SIZES = {
+    'mcq_single': (4, 20, 50, 200),
+    'mcq_multiple': (4, 20, 50, 200),
+    'fill_blank': (1, 5, 20, 50),
+    'dropdown_blank': (1, 5, 20, 50),
+    'match': (2, 10, 50),
+    'drag_zone': (2, 10, 50),
+    'step_sequence': (2, 10, 50),
+    'matrix': (2, 5, 10, 30),
+    'text_box': (5, 50),
+    'numerical': (1,),
+}
+# Evaluated by question_evaluation.py but missing from the question type selection
+UNLISTED_TYPES = ('matrix', 'text_box', 'numerical')
+
+
+def _create_question(env, quiz, question_type, size):
+    """Create a synthetic question, return it with a correct and a wrong answer"""
+    Question = env['quiz.question']
+    vals = {
+        'quiz_id': quiz.id,
+        'type': question_type if question_type not in UNLISTED_TYPES else 'fill_blank',
+        'question_html': f'<p>Benchmark {question_type} {size}</p>',
+        'points': 1.0,
+    }
+    if question_type in ('mcq_single', 'mcq_multiple'):
+        vals['choice_ids'] = [(0, 0, {
+            'sequence': index,
+            'text': f'Choice {index}',
+            # One correct choice for single, every other one for multiple
+            'is_correct': index == 0 if question_type == 'mcq_single' else index % 2 == 0,
+        }) for index in range(size)]
+    elif question_type == 'fill_blank' or question_type in UNLISTED_TYPES:
+        vals['fill_blank_answer_ids'] = [(0, 0, {
+            'blank_number': number, 'answer_text': f'Answer {number}',
+        }) for number in range(1, (size if question_type == 'fill_blank' else 1) + 1)]
+    elif question_type == 'dropdown_blank':
+        vals['text_template'] = '<p>' + ' '.join(f'{{{{{number}}}}}' for number in range(1, size + 1)) + '</p>'
+        vals['blank_ids'] = [(0, 0, {
+            'blank_number': number,
+            'option_ids': [(0, 0, {
+                'sequence': index, 'label': f'Option {index}', 'is_correct': index == 0,
+            }) for index in range(4)],
+        }) for number in range(1, size + 1)]
+    elif question_type == 'match':
+        vals['match_pair_ids'] = [(0, 0, {
+            'sequence': index, 'left_text': f'Left {index}', 'right_text': f'Right {index}',
+        }) for index in range(size)]
+    elif question_type == 'drag_zone':
+        vals['drag_token_ids'] = [(0, 0, {
+            'sequence': index, 'text': f'Token {index}', 'is_correct': True, 'correct_position': index,
+        }) for index in range(size)]
+    elif question_type == 'step_sequence':
+        vals['sequence_item_ids'] = [(0, 0, {
+            'sequence': index, 'label': f'Step {index}', 'correct_position': index,
+        }) for index in range(size)]
+    question = Question.create(vals)
+
+    if question_type in UNLISTED_TYPES:
+        # The ORM refuses values outside the selection, so the type is set in SQL
+        question.flush_recordset()
+        env.cr.execute("UPDATE quiz_question SET type = %s WHERE id = %s", [question_type, question.id])
+        question.invalidate_recordset(['type'])
+    if question_type == 'matrix':
+        rows = env['quiz.matrix.row'].create([
+            {'question_id': question.id, 'name': f'Row {index}', 'sequence': index} for index in range(size)])
+        columns = env['quiz.matrix.column'].create([
+            {'question_id': question.id, 'name': f'Column {index}', 'sequence': index} for index in range(size)])
+        env['quiz.matrix.cell'].create([{
+            'question_id': question.id, 'row_id': row.id, 'column_id': column.id,
+            'is_correct': (row_index + column_index) % 2 == 0,
+        } for row_index, row in enumerate(rows) for column_index, column in enumerate(columns)])
+    elif question_type == 'text_box':
+        words = [f'word{index}' for index in range(size)]
+        question.write({
+            'correct_text_answer': ' '.join(words),
+            'allow_partial_match': True,
+        })
+    elif question_type == 'numerical':
+        question.write({'numerical_exact_value': 3.14, 'numerical_tolerance': 0.01})
+    env.flush_all()
+    question.invalidate_recordset()
+    return question, _answers(question, question_type, size)
+
+
+def _answers(question, question_type, size):
+    """Return ``(correct, wrong)`` answers in the canonical stored shape"""
+    if question_type == 'mcq_single':
+        correct = question.choice_ids.filtered('is_correct')[0].id
+        return correct, question.choice_ids[-1].id
+    if question_type == 'mcq_multiple':
+        correct = question.choice_ids.filtered('is_correct').ids
+        return sorted(correct), sorted(question.choice_ids[-2:].ids)
+    if question_type == 'fill_blank':
+        correct = {str(number): f'Answer {number}' for number in range(1, size + 1)}
+        return correct, {key: 'wrong' for key in correct}
+    if question_type == 'dropdown_blank':
+        correct = [{'blank_id': blank.id, 'option_id': blank.option_ids[0].id} for blank in question.blank_ids]
+        wrong = [{'blank_id': blank.id, 'option_id': blank.option_ids[-1].id} for blank in question.blank_ids]
+        return correct, wrong
+    if question_type == 'match':
+        correct = {}
+        wrong = {}
+        for pair in question.match_pair_ids:
+            correct.update({f'left_{pair.id}': pair.right_text, f'right_{pair.id}': pair.right_text})
+            wrong.update({f'left_{pair.id}': 'wrong', f'right_{pair.id}': pair.right_text})
+        return correct, wrong
+    if question_type == 'drag_zone':
+        correct = {str(token.correct_position): token.text for token in question.drag_token_ids}
+        return correct, {key: 'wrong' for key in correct}
+    if question_type == 'step_sequence':
+        correct = [{'step_id': item.id, 'position': item.correct_position} for item in question.sequence_item_ids]
+        return correct, list(reversed(correct))
+    if question_type == 'matrix':
+        cells = question.env['quiz.matrix.cell'].search([('question_id', '=', question.id)])
+        correct = {f'cell_{cell.row_id.id}_{cell.column_id.id}': cell.is_correct for cell in cells}
+        return correct, {key: not value for key, value in correct.items()}
+    if question_type == 'text_box':
+        words = [f'word{index}' for index in range(size)]
+        return ' '.join(words), ' '.join(words[:size // 2] + ['other'] * (size - size // 2))
+    return 3.14, 42.0
+
+
+def _measure(env, call, min_seconds):
+    """Run ``call`` until ``min_seconds`` elapsed, return ``(calls per second, queries per call)``"""
+    cr = env.cr
+    calls = 0
+    queries = cr.sql_log_count
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_seconds:
+        call()
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return calls / elapsed, (cr.sql_log_count - queries) / calls
+
+
+@tagged('-standard', 'benchmark')
+class TestEvaluatorBenchmark(TransactionCase):
+
+    def _benchmark_question(self, question, answers):
+        Question = self.env['quiz.question']
+        # Cold: compiling the answer key is the only part expected to query
+        Question._invalidate_question_caches()
+        queries = self.env.cr.sql_log_count
+        question.evaluate_answer(answers[0])
+        cold_queries = self.env.cr.sql_log_count - queries
+
+        cycle = [0]
+
+        def evaluate_one():
+            cycle[0] += 1
+            question.evaluate_answer(answers[cycle[0] % 2])
+
+        evals_per_second, queries_per_eval = _measure(self.env, evaluate_one, MIN_SECONDS)
+        batch = [answers[index % 2] for index in range(BATCH_SIZE)]
+        batches_per_second, queries_per_batch = _measure(
+            self.env, lambda: question._score_answers_batch(batch), MIN_SECONDS)
+        return {
+            'evals_per_second': evals_per_second,
+            'queries_per_eval': queries_per_eval,
+            'cold_queries': cold_queries,
+            'batch_answers_per_second': batches_per_second * BATCH_SIZE,
+            'queries_per_batch': queries_per_batch,
+        }
+
+    def test_evaluator_benchmark(self):
+        with open(BASELINE_PATH, encoding='utf-8') as file:
+            baseline = json.load(file)
+        saving = bool(os.environ.get('QUIZ_BENCHMARK_SAVE_BASELINE'))
+
+        quiz = self.env['quiz.quiz'].create({'name': 'Evaluator Benchmark', 'slug': 'evaluator-benchmark-tmp'})
+        results = {}
+        for question_type, type_sizes in BENCHMARK_SIZES.items():
+            for size in type_sizes:
+                case = f'{question_type}:{size}'
+                question, answers = _create_question(self.env, quiz, question_type, size)
+                stats = results[case] = self._benchmark_question(question, answers)
+                # Warm evaluations read the cached answer key only
+                with self.subTest(case=case), self.assertQueryCount(0):
+                    question.evaluate_answer(answers[1])
+                _logger.info("%-22s %10.0f evals/s %6.2f q/eval %4d cold q %12.0f batch ans/s %6.2f q/batch",
+                             case, stats['evals_per_second'], stats['queries_per_eval'], stats['cold_queries'],
+                             stats['batch_answers_per_second'], stats['queries_per_batch'])
+                if saving:
+                    continue
+                previous = baseline.get(case)
+                with self.subTest(case=case):
+                    self.assertIsNotNone(previous, f'{case}: missing from the baseline')
+                    previous = previous or {}
+                    for metric in ('evals_per_second', 'batch_answers_per_second'):
+                        if metric in previous:
+                            self.assertGreaterEqual(stats[metric], previous[metric] * (1 - TOLERANCE),
+                                                    f'{case}: {metric} regressed')
+                    for metric in ('queries_per_eval', 'cold_queries', 'queries_per_batch'):
+                        # Query counts are deterministic: any increase is a regression
+                        if metric in previous:
+                            self.assertLessEqual(stats[metric], previous[metric] + 1e-9,
+                                                 f'{case}: {metric} grew')
+
+        if saving:
+            with open(BASELINE_PATH, 'w', encoding='utf-8') as file:
+                json.dump(results, file, indent=2, sort_keys=True)
@@ -0,0 +1,85 @@
+import json
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestResultSnapshot(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.quiz = cls.env['quiz.quiz'].create({'name': 'Snapshot Quiz', 'slug': 'snapshot-quiz'})
+        cls.question = cls.env['quiz.question'].create({
+            'quiz_id': cls.quiz.id,
+            'type': 'mcq_single',
+            'question_html': '<p>Capital of France?</p>',
+            'points': 1.0,
+            'choice_ids': [(0, 0, {'text': 'Paris', 'is_correct': True}), (0, 0, {'text': 'Rome'})],
+        })
+        cls.right = cls.question.choice_ids.filtered('is_correct')
+
+    def _scored_session(self):
+        session = self.env['quiz.session'].create({'quiz_id': self.quiz.id, 'session_token': 'snapshot-token'})
+        session.start_session()
+        self.env['quiz.response'].create({
+            'session_id': session.id,
+            'question_id': self.question.id,
+            'answer_data': self.right.id,
+        })
+        session.complete_session()
+        self.env['quiz.response']._cron_score_pending()
+        return session
+
+    def test_snapshot_frozen_when_scored(self):
+        session = self._scored_session()
+        self.assertEqual(session.scoring_state, 'scored')
+        result = json.loads(session.result_snapshot)
+        self.assertEqual(result['total_score'], 1.0)
+        self.assertTrue(result['passed'])
+        self.assertEqual([outcome['score'] for outcome in result['questions']], [1.0])
+
+    def test_rescoring_refreezes_snapshot(self):
+        session = self._scored_session()
+        etag = session.result_etag
+
+        self.question.points = 2.0
+        self.quiz.action_rescore_responses()
+
+        self.assertNotEqual(session.result_etag, etag)
+        result = json.loads(session.result_snapshot)
+        self.assertEqual(result['total_score'], session.total_score)
+        self.assertEqual(result['questions'][0]['score'], 2.0)
+        self.assertEqual(result['questions'][0]['points'], 2.0)
+
+    def test_reconciliation_refreezes_snapshot(self):
+        session = self._scored_session()
+        etag = session.result_etag
+
+        # A response score changed behind the total: the cron corrects the drift
+        self.env.cr.execute("UPDATE quiz_response SET score = 0.5 WHERE session_id = %s", [session.id])
+        self.env.invalidate_all()
+        self.assertEqual(session._update_score_totals(), 1)
+
+        self.assertNotEqual(session.result_etag, etag)
+        result = json.loads(session.result_snapshot)
+        self.assertEqual(result['total_score'], 0.5)
+        self.assertEqual(result['questions'][0]['score'], 0.5)
+
+    def test_answering_again_replaces_response(self):
+        session = self.env['quiz.session'].create({'quiz_id': self.quiz.id, 'session_token': 'again-token'})
+        session.start_session()
+        Response = self.env['quiz.response']
+        wrong = self.question.choice_ids - self.right
+        Response._upsert_answer(session.id, self.question.id, self.right.id)
+        Response._score_pending()
+        # Back to the question, the student changes their answer
+        Response._upsert_answer(session.id, self.question.id, wrong.id)
+        session.complete_session()
+        Response._cron_score_pending()
+
+        self.assertEqual(Response.search_count([('session_id', '=', session.id)]), 1)
+        self.assertEqual(session.total_score, 0.0)
+        result = json.loads(session.result_snapshot)
+        self.assertEqual(result['total_score'], 0.0)
+        self.assertEqual([outcome['score'] for outcome in result['questions']], [0.0])
@@ -0,0 +1,42 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from ..models.question_import import IMPORT_CHUNK_SIZE, parse_question_bank
+import base64
+
+
+class QuestionImportWizard(models.TransientModel):
+    _name = 'quiz.question.import'
+    _description = 'Import Question Bank'
+
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', required=True, ondelete='cascade')
+    bank_file = fields.Binary(string='Question Bank', required=True)
+    bank_filename = fields.Char(string='File Name')
+    file_format = fields.Selection([
+        ('json', 'JSON'),
+        ('csv', 'CSV'),
+    ], string='Format', required=True, default='json')
+    chunk_size = fields.Integer(string='Questions per Batch', default=IMPORT_CHUNK_SIZE)
+
+    @api.onchange('bank_filename')
+    def _onchange_bank_filename(self):
+        if self.bank_filename and self.bank_filename.lower().endswith('.csv'):
+            self.file_format = 'csv'
+        elif self.bank_filename and self.bank_filename.lower().endswith('.json'):
+            self.file_format = 'json'
+
+    def action_import(self):
+        self.ensure_one()
+        if self.chunk_size <= 0:
+            raise UserError(_("The batch size must be positive."))
+        questions = parse_question_bank(base64.b64decode(self.bank_file), self.file_format)
+        if not questions:
+            raise UserError(_("The question bank is empty."))
+        self.quiz_id._import_question_bank(questions, chunk_size=self.chunk_size)
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Quiz Questions'),
+            'res_model': 'quiz.question',
+            'view_mode': 'tree,form',
+            'domain': [('quiz_id', '=', self.quiz_id.id)],
+            'context': {'default_quiz_id': self.quiz_id.id},
+        }